@@ -0,0 +1,207 @@
+"""
+Contrôle d'admission des réservations (salle d'attente virtuelle).
+
+À l'ouverture d'une compétition très demandée, tous les clubs se connectent
+et réservent en même temps. Plutôt que d'empiler les requêtes dans les
+threads du serveur, au plus `max_active` requêtes de réservation sont
+traitées simultanément ; les suivantes reçoivent aussitôt une réponse 503
+légère avec un ticket, leur position dans la file et un délai `Retry-After`.
+Le client renvoie sa requête avec le ticket et est admis à son tour, dans
+l'ordre d'arrivée.
+
+Équité : un club n'occupe qu'une place dans la file, quel que soit le
+nombre de requêtes (onglets, rafraîchissements) qu'il envoie. Un ticket non
+réclamé pendant `ticket_ttl` secondes est abandonné quand il arrive en tête
+de file. Au-delà de `max_queue` tickets, les nouvelles requêtes sont refusées
+sans ticket.
+
+L'état est propre à chaque processus : avec plusieurs workers (voir
+wsgi.py), la limite s'applique par worker.
+"""
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# En-tête (API) et champ de formulaire (pages HTML) portant le ticket
+TICKET_HEADER = 'X-Admission-Ticket'
+TICKET_FIELD = 'admission_ticket'
+
+ADMITTED = 'admitted'
+QUEUED = 'queued'
+REJECTED = 'rejected'
+
+
+class Ticket:
+    """
+    Place dans la file d'attente.
+
+    Attributes:
+        id (str): Identifiant renvoyé au client
+        club (str): Club (ou client) titulaire
+        issued (float): Instant d'émission
+        seen (float): Dernière présentation par le client
+    """
+
+    __slots__ = ('id', 'club', 'issued', 'seen')
+
+    def __init__(self, club, now):
+        self.id = uuid.uuid4().hex
+        self.club = club
+        self.issued = now
+        self.seen = now
+
+
+class Admission:
+    """
+    Décision d'admission d'une requête.
+
+    Attributes:
+        status (str): `admitted`, `queued` ou `rejected`
+        ticket (str): Ticket à présenter au prochain essai (file uniquement)
+        position (int): Requêtes admises avant celle-ci, à partir de 0
+        retry_after (int): Délai conseillé avant le prochain essai (secondes)
+    """
+
+    __slots__ = ('status', 'ticket', 'position', 'retry_after')
+
+    def __init__(self, status, ticket=None, position=None, retry_after=0):
+        self.status = status
+        self.ticket = ticket
+        self.position = position
+        self.retry_after = retry_after
+
+    @property
+    def admitted(self):
+        return self.status == ADMITTED
+
+    def to_json(self):
+        """Corps JSON de la réponse 503 (API)."""
+        message = ('Too many bookings in progress, you are in the queue.'
+                   if self.status == QUEUED else 'Too many bookings in progress, retry later.')
+        return {'error': self.status, 'message': message, 'ticket': self.ticket,
+                'position': self.position, 'retry_after': self.retry_after}
+
+
+class AdmissionController:
+    """
+    Sémaphore des réservations en cours et file d'attente FIFO à tickets.
+
+    Args:
+        max_active (int): Requêtes traitées simultanément
+        max_queue (int): Tickets en attente au maximum
+        ticket_ttl (float): Délai au-delà duquel un ticket non représenté est
+            abandonné (secondes)
+        clock (callable): Horloge monotone (injectable pour les tests)
+    """
+
+    def __init__(self, max_active=64, max_queue=1000, ticket_ttl=30.0, clock=time.monotonic):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.ticket_ttl = ticket_ttl
+        self.clock = clock
+        self.active = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.expired = 0
+        # Durée moyenne (mobile exponentielle) d'une requête admise
+        self.service_time = 0.05
+        self._queue = OrderedDict()
+        self._by_club = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def try_admit(self, club, ticket=None):
+        """
+        Admet une requête ou lui attribue une place dans la file.
+
+        Une requête admise doit être suivie d'un appel à `release`.
+
+        Args:
+            club (str): Club à l'origine de la requête (adresse du client à défaut)
+            ticket (str): Ticket présenté par le client, ou None
+
+        Returns:
+            Admission: Décision (admise, en file avec ticket ou refusée)
+        """
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            held = self._queue.get(ticket) if ticket else None
+            if held is None or held.club != club:
+                held = self._by_club.get(club)
+            if held is not None:
+                held.seen = now
+                position = self._position(held)
+                if position < self.max_active - self.active:
+                    self._dequeue(held)
+                    return self._admit()
+                return self._waiting(held, position)
+            if self.active + len(self._queue) < self.max_active:
+                return self._admit()
+            if len(self._queue) >= self.max_queue:
+                self.rejected += 1
+                return Admission(REJECTED, retry_after=self._retry_after(len(self._queue)))
+            held = Ticket(club, now)
+            self._queue[held.id] = held
+            self._by_club[club] = held
+            self.queued += 1
+            return self._waiting(held, len(self._queue) - 1)
+
+    def release(self, duration=None):
+        """
+        Libère la place d'une requête admise.
+
+        Args:
+            duration (float): Durée de traitement, pour estimer les délais d'attente
+        """
+        with self._lock:
+            self.active -= 1
+            if duration is not None:
+                self.service_time += 0.1 * (duration - self.service_time)
+
+    def stats(self):
+        """Compteurs et jauges de la file (pour /metrics et les tests)."""
+        with self._lock:
+            return {'active': self.active, 'queue': len(self._queue),
+                    'admitted': self.admitted, 'queued': self.queued,
+                    'rejected': self.rejected, 'expired': self.expired}
+
+    def _admit(self):
+        self.active += 1
+        self.admitted += 1
+        return Admission(ADMITTED)
+
+    def _waiting(self, ticket, position):
+        return Admission(QUEUED, ticket.id, position, self._retry_after(position))
+
+    def _retry_after(self, position):
+        # Temps estimé pour écouler les requêtes en cours et celles qui précèdent
+        ahead = self.active + position + 1
+        return max(1, math.ceil(ahead * self.service_time / max(1, self.max_active)))
+
+    def _position(self, ticket):
+        # File bornée par max_queue : parcours jusqu'au ticket
+        for position, queued in enumerate(self._queue.values()):
+            if queued is ticket:
+                return position
+        return len(self._queue)
+
+    def _dequeue(self, ticket):
+        del self._queue[ticket.id]
+        if self._by_club.get(ticket.club) is ticket:
+            del self._by_club[ticket.club]
+
+    def _expire(self, now):
+        # Seuls les tickets de tête sont examinés : un ticket abandonné au
+        # milieu de la file est retiré quand il y arrive
+        while self._queue:
+            head = next(iter(self._queue.values()))
+            if now - head.seen <= self.ticket_ttl:
+                return
+            self._dequeue(head)
+            self.expired += 1
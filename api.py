@@ -0,0 +1,409 @@
+"""
+API JSON versionnée (`/api/v1/...`, alias `/api/...`).
+
+Les routes partagent le dépôt et le moteur de réservation des routes HTML
+(voir state.py). Les corps des lectures sont sérialisés une seule fois puis
+servis depuis le cache de pages, avec ETag et réponses 304 ; la sérialisation
+utilise orjson s'il est installé, sinon le module json en mode compact.
+"""
+from datetime import datetime
+import json
+
+from flask import Blueprint, current_app, make_response, request
+
+from booking import BookingError
+from idempotency import (HEADER, MAX_KEY_LENGTH, IdempotencyConflict, IdempotencyTimeout,
+                         fingerprint)
+from models import DATE_FORMAT
+from state import booking_engine, idempotency, ranking, render_cache, schedule, store, versions
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+API_VERSION = 'v1'
+
+# Nombre maximum de lignes d'une réservation groupée
+MAX_BATCH_SIZE = 100
+
+api = Blueprint('api', __name__)
+
+
+def dumps(payload):
+    """
+    Sérialise un document JSON en bytes.
+
+    Args:
+        payload (dict): Document composé de types JSON natifs
+
+    Returns:
+        bytes: Corps encodé en UTF-8
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def club_to_json(club):
+    """Représentation publique d'un club (sans email)."""
+    return {'name': club.name, 'points': club.points}
+
+
+def competition_to_json(competition):
+    """Représentation d'une compétition, date au format des fichiers de données."""
+    return {
+        'name': competition.name,
+        'date': competition.date.strftime(DATE_FORMAT),
+        'number_of_places': competition.number_of_places,
+    }
+
+
+def error(status, code, message):
+    """
+    Document d'erreur JSON.
+
+    Args:
+        status (int): Statut HTTP
+        code (str): Code stable de l'erreur (ex. `not_found`, `insufficient_points`)
+        message (str): Message lisible
+
+    Returns:
+        tuple: Document `(statut, None, construction)` non mis en cache
+    """
+    return status, None, lambda: {'error': code, 'message': message}
+
+
+def cached_body(key, build):
+    """
+    Retourne le corps sérialisé d'un document, depuis le cache de pages.
+
+    Args:
+        key (tuple): Clé de cache incluant les versions des données exposées
+        build (callable): Construit le document (appelé seulement en cas
+            d'absence dans le cache)
+
+    Returns:
+        cache.CachedPage: Corps et ETag
+    """
+    return render_cache.get_or_render(('api',) + key, lambda: dumps(build()))
+
+
+def page_bounds(args, total, default_per_page, max_per_page):
+    """
+    Lit `page` et `per_page` dans les paramètres de requête et les borne.
+
+    Args:
+        args (MultiDict): Paramètres de la requête
+        total (int): Nombre d'éléments paginés
+        default_per_page (int): Taille de page par défaut
+        max_per_page (int): Taille de page maximale
+
+    Returns:
+        tuple: (page, per_page, nombre de pages)
+    """
+    per_page = args.get('per_page', default_per_page, type=int)
+    per_page = max(1, min(per_page, max_per_page))
+    pages = max(1, -(-total // per_page))
+    page = max(1, min(args.get('page', 1, type=int), pages))
+    return page, per_page, pages
+
+
+# Documents : chaque fonction retourne `(statut, clé de cache ou None,
+# construction)`. Ils sont indépendants de Flask et servis aussi bien par les
+# routes ci-dessous que par le point d'entrée ASGI (voir asgi.py).
+
+def club_document(name):
+    """Club et ses points, ou 404."""
+    club = store.get_club_by_name(name)
+    if club is None:
+        return error(404, 'not_found', f'Unknown club: {name}')
+    return 200, ('club', name, versions.club(name)), lambda: club_to_json(club)
+
+
+def competition_document(name):
+    """Compétition et ses places restantes (même passée ou complète), ou 404."""
+    competition = store.get_competition_by_name(name)
+    if competition is None:
+        return error(404, 'not_found', f'Unknown competition: {name}')
+    return (200, ('competition', name, versions.competitions),
+            lambda: competition_to_json(competition))
+
+
+def competitions_document(args, config):
+    """Page des compétitions à venir disposant encore de places."""
+    now = datetime.now()
+    total = schedule.count_upcoming(now)
+    page, per_page, pages = page_bounds(
+        args, total, config['WELCOME_PER_PAGE'], config['COMPETITIONS_MAX_PER_PAGE'])
+    offset = (page - 1) * per_page
+
+    def build():
+        return {
+            'competitions': [competition_to_json(competition) for competition
+                             in schedule.upcoming(now, per_page, offset)],
+            'page': page, 'pages': pages, 'total': total,
+        }
+
+    return 200, ('competitions', versions.competitions, total, page, per_page), build
+
+
+def leaderboard_document(args, config):
+    """Page du classement des clubs par points décroissants."""
+    total = len(ranking)
+    page, per_page, pages = page_bounds(
+        args, total, config['LEADERBOARD_PER_PAGE'], config['LEADERBOARD_MAX_PER_PAGE'])
+    offset = (page - 1) * per_page
+
+    def build():
+        return {
+            'clubs': [dict(club_to_json(club), rank=offset + position)
+                      for position, club in enumerate(ranking.top(per_page, offset), start=1)],
+            'page': page, 'pages': pages, 'total': total,
+        }
+
+    return 200, ('leaderboard', versions.clubs, page, per_page), build
+
+
+def booking_document(data):
+    """Applique une réservation décrite par un corps JSON déjà décodé."""
+    if not isinstance(data, dict):
+        return error(400, 'invalid_request', 'Expected a JSON object.')
+    club_name, competition_name = data.get('club'), data.get('competition')
+    if not isinstance(club_name, str) or not isinstance(competition_name, str):
+        return error(400, 'invalid_request', 'club and competition must be strings.')
+    places = data.get('places')
+    if not isinstance(places, int) or isinstance(places, bool):
+        return error(400, 'invalid_request', 'places must be an integer.')
+
+    club = store.get_club_by_name(club_name)
+    competition = store.get_competition_by_name(competition_name)
+    if club is None or competition is None:
+        return error(404, 'not_found', 'Unknown club or competition.')
+
+    try:
+        points_spent = booking_engine.book(club, competition, places)
+    except BookingError as refused:
+        return error(422, refused.reason, refused.message)
+
+    result = {
+        'club': club_to_json(club),
+        'competition': competition_to_json(competition),
+        'places': places,
+        'points_spent': points_spent,
+    }
+    return 201, None, lambda: result
+
+
+def _parse_batch_line(line):
+    # Retourne (Competition, places) ou un message d'erreur
+    if not isinstance(line, dict) or not isinstance(line.get('competition'), str):
+        return 'Each booking must be an object with a competition name.'
+    places = line.get('places')
+    if not isinstance(places, int) or isinstance(places, bool):
+        return 'places must be an integer.'
+    competition = store.get_competition_by_name(line['competition'])
+    if competition is None:
+        return f"Unknown competition: {line['competition']}"
+    return competition, places
+
+
+def batch_document(data):
+    """Applique une réservation groupée décrite par un corps JSON déjà décodé."""
+    if not isinstance(data, dict) or not isinstance(data.get('bookings'), list):
+        return error(400, 'invalid_request', 'Expected {"club", "bookings": [...]}.')
+    if len(data['bookings']) > MAX_BATCH_SIZE:
+        return error(400, 'invalid_request', f'At most {MAX_BATCH_SIZE} bookings per request.')
+    club = store.get_club_by_name(data.get('club')) if isinstance(data.get('club'), str) else None
+    if club is None:
+        return error(404, 'not_found', 'Unknown club.')
+
+    bookings = []
+    for line in data['bookings']:
+        parsed = _parse_batch_line(line)
+        if isinstance(parsed, str):
+            return error(400, 'invalid_request', parsed)
+        bookings.append(parsed)
+
+    atomic = data.get('atomic', True) is not False
+    outcomes = booking_engine.book_many(club, bookings, atomic=atomic)
+    results = []
+    for outcome in outcomes:
+        result = {'competition': outcome.competition.name, 'places': outcome.places,
+                  'points_spent': outcome.points_cost}
+        if not outcome.ok:
+            result.update(error=outcome.error.reason, message=outcome.error.message)
+        results.append(result)
+
+    booked = all(outcome.ok for outcome in outcomes)
+    body = {'club': club_to_json(club), 'booked': booked, 'results': results}
+    return 422 if atomic and not booked else 200, None, lambda: body
+
+
+def idempotent_document(scope, key, data, document):
+    """
+    Applique un document de réservation une seule fois par clé d'idempotence.
+
+    La première requête portant la clé est exécutée et son résultat (statut
+    et corps) conservé ; une nouvelle tentative avec la même clé et le même
+    corps reçoit ce résultat sans être revalidée ni réappliquée.
+
+    Args:
+        scope (str): Route concernée (`booking`, `batch`)
+        key (str): Valeur de l'en-tête `Idempotency-Key`, ou None
+        data (object): Corps JSON déjà décodé
+        document (callable): `booking_document` ou `batch_document`
+
+    Returns:
+        tuple: Document `(statut, None, construction)` ; 400 si la clé est
+        trop longue, 422 si elle a servi pour un autre corps, 409 si la
+        requête d'origine est toujours en cours
+    """
+    if key is None:
+        return document(data)
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return error(400, 'invalid_request',
+                     f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters long.')
+
+    def run():
+        status, _, build = document(data)
+        return status, build()
+
+    try:
+        status, payload = idempotency.execute(('api', scope, key),
+                                              fingerprint(scope, dumps(data)), run)
+    except IdempotencyConflict:
+        return error(422, 'idempotency_conflict',
+                     f'{HEADER} was already used for a different request.')
+    except IdempotencyTimeout:
+        return error(409, 'idempotency_in_progress',
+                     'The original request is still being processed.')
+    return status, None, lambda: payload
+
+
+def respond(document):
+    """
+    Convertit un document en réponse Flask.
+
+    Les documents avec une clé de cache sont servis depuis le cache de pages,
+    avec ETag et réponse 304 si l'ETag du client correspond.
+
+    Args:
+        document (tuple): `(statut, clé de cache ou None, construction)`
+
+    Returns:
+        flask.Response: Réponse JSON
+    """
+    status, key, build = document
+    if key is None:
+        response = make_response(dumps(build()), status)
+        response.mimetype = 'application/json'
+        return response
+    page = cached_body(key, build)
+    response = make_response(page.body, status)
+    response.mimetype = 'application/json'
+    response.set_etag(page.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+@api.route('/clubs/<name>')
+def get_club(name):
+    """
+    Retourne un club et ses points.
+
+    Returns:
+        flask.Response: `{"name", "points"}` ou 404
+    """
+    return respond(club_document(name))
+
+
+@api.route('/competitions')
+def list_competitions():
+    """
+    Retourne une page des compétitions à venir disposant encore de places.
+
+    Query Parameters:
+        page (int): Numéro de page, à partir de 1 (défaut : 1)
+        per_page (int): Compétitions par page (défaut : WELCOME_PER_PAGE)
+
+    Returns:
+        flask.Response: `{"competitions": [...], "page", "pages", "total"}`
+    """
+    return respond(competitions_document(request.args, current_app.config))
+
+
+@api.route('/competitions/<name>')
+def get_competition(name):
+    """
+    Retourne une compétition et ses places restantes.
+
+    Contrairement à la liste, les compétitions passées ou complètes sont
+    exposées : c'est la lecture qui permet de vérifier qu'aucune n'a été
+    survendue.
+
+    Returns:
+        flask.Response: `{"name", "date", "number_of_places"}` ou 404
+    """
+    return respond(competition_document(name))
+
+
+@api.route('/leaderboard')
+def get_leaderboard():
+    """
+    Retourne le classement des clubs par points décroissants.
+
+    Query Parameters:
+        page (int): Numéro de page, à partir de 1 (défaut : 1)
+        per_page (int): Clubs par page (défaut : LEADERBOARD_PER_PAGE)
+
+    Returns:
+        flask.Response: `{"clubs": [{"rank", "name", "points"}, ...], "page", "pages", "total"}`
+    """
+    return respond(leaderboard_document(request.args, current_app.config))
+
+
+@api.route('/bookings', methods=['POST'])
+def create_booking():
+    """
+    Réserve des places avec les mêmes règles que `/purchasePlaces`.
+
+    Headers:
+        Idempotency-Key (str): Optionnel ; une nouvelle tentative portant la
+            même clé reçoit la réponse d'origine sans réserver à nouveau
+
+    JSON Body:
+        club (str): Nom du club
+        competition (str): Nom de la compétition
+        places (int): Nombre de places à réserver
+
+    Returns:
+        flask.Response: 201 avec le club et la compétition mis à jour, 400 si
+        le corps est invalide, 404 si le club ou la compétition est inconnu,
+        422 si une règle de réservation est enfreinte (`error` = motif)
+    """
+    return respond(idempotent_document('booking', request.headers.get(HEADER),
+                                       request.get_json(silent=True), booking_document))
+
+
+@api.route('/bookings/batch', methods=['POST'])
+def create_bookings():
+    """
+    Réserve des places pour plusieurs compétitions en une requête.
+
+    Headers:
+        Idempotency-Key (str): Optionnel, comme pour `/bookings`
+
+    JSON Body:
+        club (str): Nom du club
+        bookings (list): Lignes `{"competition": str, "places": int}`
+        atomic (bool): Tout ou rien (défaut : true) ; sinon chaque ligne
+            valide est appliquée indépendamment
+
+    Returns:
+        flask.Response: 200 avec le résultat de chaque ligne ; 422 si une
+        réservation atomique est refusée (aucune ligne appliquée) ; 400 ou
+        404 si le corps est invalide
+    """
+    return respond(idempotent_document('batch', request.headers.get(HEADER),
+                                       request.get_json(silent=True), batch_document))
@@ -0,0 +1,339 @@
+"""
+Point d'entrée ASGI de l'application.
+
+Sous un serveur asynchrone (uvicorn, hypercorn...), les connexions ouvertes
+sont tenues par la boucle d'événements et non par un thread chacune : des
+milliers de clients keep-alive inactifs ne coûtent presque rien. Les routes
+les plus sollicitées (sondes, flux `/events` et API JSON) ont des
+gestionnaires asynchrones natifs qui partagent le dépôt et le cache de la
+version WSGI (voir api.py) ; les routes HTML sont déléguées à l'application
+Flask dans un pool de threads borné, qui n'est occupé que pendant le
+traitement effectif d'une requête.
+
+Usage:
+    uvicorn asgi:application --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+import api
+from admission import TICKET_HEADER
+from events import KEEPALIVE, format_event
+from server import app as flask_app, health, ready
+from state import admission, events, loader, rate_limiter
+
+
+def _json_body(payload):
+    return api.dumps(payload), [(b'content-type', b'application/json')]
+
+
+def _etag_matches(header, etag):
+    # If-None-Match peut lister plusieurs ETags, éventuellement faibles (W/)
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or any(
+        value.removeprefix('W/') == f'"{etag}"' for value in candidates)
+
+
+class AsgiApp:
+    """
+    Application ASGI 3 : gestionnaires natifs et pont vers l'application WSGI.
+
+    Args:
+        wsgi_app (flask.Flask): Application servie pour les routes non natives
+        threads (int): Taille du pool de threads du pont WSGI
+    """
+
+    def __init__(self, wsgi_app, threads=32):
+        self.wsgi_app = wsgi_app
+        self.config = wsgi_app.config
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='asgi-wsgi')
+        prefix = r'/api(?:/%s)?' % api.API_VERSION
+        self.routes = [
+            ('GET', re.compile(r'/health'), self.get_health),
+            ('GET', re.compile(r'/ready'), self.get_ready),
+            ('GET', re.compile(r'/events'), self.get_events),
+            ('GET', re.compile(prefix + r'/clubs/(?P<name>[^/]+)'), self.get_club),
+            ('GET', re.compile(prefix + r'/competitions'), self.get_competitions),
+            ('GET', re.compile(prefix + r'/competitions/(?P<name>[^/]+)'), self.get_competition),
+            ('GET', re.compile(prefix + r'/leaderboard'), self.get_leaderboard),
+            ('POST', re.compile(prefix + r'/bookings'), self.post_booking),
+            ('POST', re.compile(prefix + r'/bookings/batch'), self.post_batch),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] == 'websocket':
+            await self._refuse_websocket(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']!r}")
+
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(scope['path'])
+            if match and scope['method'] == method:
+                await handler(scope, receive, send, **match.groupdict())
+                return
+        await self._call_wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _refuse_websocket(receive, send):
+        # Aucune route WebSocket : la connexion est refusée à l'ouverture
+        message = await receive()
+        if message['type'] == 'websocket.connect':
+            await send({'type': 'websocket.close'})
+
+    async def _run(self, function, *args):
+        # Code bloquant (verrous, SQLite, chargement) hors de la boucle
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def _ensure_loaded(self):
+        if not loader.ready:
+            await self._run(loader.ensure_loaded)
+
+    @staticmethod
+    async def _respond(send, status, body, headers):
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def _send_document(self, scope, send, document):
+        status, key, build = document
+        if key is None:
+            await self._respond(send, status, *_json_body(build()))
+            return
+        page = api.cached_body(key, build)
+        headers = [(b'content-type', b'application/json'),
+                   (b'etag', f'"{page.etag}"'.encode()),
+                   (b'cache-control', b'no-cache')]
+        if_none_match = dict(scope['headers']).get(b'if-none-match')
+        if if_none_match and _etag_matches(if_none_match.decode('latin-1'), page.etag):
+            await self._respond(send, 304, b'', headers[1:])
+            return
+        await self._respond(send, status, page.body, headers)
+
+    async def _read_json(self, receive):
+        try:
+            return json.loads(await self._read_body(receive))
+        except ValueError:
+            return None
+
+    # Gestionnaires natifs
+
+    async def get_health(self, scope, receive, send):
+        payload, status = health()
+        await self._respond(send, status, *_json_body(payload))
+
+    async def get_ready(self, scope, receive, send):
+        payload, status = ready()
+        await self._respond(send, status, *_json_body(payload))
+
+    async def get_events(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        subscription = events.subscribe(lambda: loop.call_soon_threadsafe(wakeup.set))
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no')]})
+            while not disconnected.done():
+                woken = asyncio.ensure_future(wakeup.wait())
+                await asyncio.wait({woken, disconnected}, timeout=self.config['EVENTS_HEARTBEAT'],
+                                   return_when=asyncio.FIRST_COMPLETED)
+                woken.cancel()
+                if disconnected.done():
+                    break
+                body = KEEPALIVE
+                if wakeup.is_set():
+                    wakeup.clear()
+                    batch = subscription.take()
+                    if batch is None:
+                        continue
+                    body = format_event(batch)
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        finally:
+            events.unsubscribe(subscription)
+            disconnected.cancel()
+
+    async def get_club(self, scope, receive, send, name):
+        await self._ensure_loaded()
+        await self._send_document(scope, send, api.club_document(name))
+
+    async def get_competitions(self, scope, receive, send):
+        await self._ensure_loaded()
+        args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+        await self._send_document(scope, send, api.competitions_document(args, self.config))
+
+    async def get_competition(self, scope, receive, send, name):
+        await self._ensure_loaded()
+        await self._send_document(scope, send, api.competition_document(name))
+
+    async def get_leaderboard(self, scope, receive, send):
+        await self._ensure_loaded()
+        args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+        await self._send_document(scope, send, api.leaderboard_document(args, self.config))
+
+    @staticmethod
+    def _idempotency_key(scope):
+        key = dict(scope['headers']).get(b'idempotency-key')
+        return key.decode('latin-1') if key is not None else None
+
+    async def _limit_rate(self, scope, send, data):
+        # Limitation de débit (voir ratelimit.py) : True si la requête est
+        # acceptée, sinon la réponse 429 est envoyée
+        if rate_limiter.rate <= 0:
+            return True
+        club = data.get('club') if isinstance(data, dict) else None
+        retry_after = rate_limiter.hit((
+            ('ip', (scope.get('client') or ('',))[0]),
+            ('club', club) if isinstance(club, str) and club else None))
+        if not retry_after:
+            return True
+        body, headers = _json_body({'error': 'rate_limited',
+                                    'message': 'Too many requests, please retry later.'})
+        headers.append((b'retry-after', str(retry_after).encode()))
+        await self._respond(send, 429, body, headers)
+        return False
+
+    async def _admit(self, scope, send, data):
+        # Contrôle d'admission (voir admission.py) : True si la requête est
+        # admise, sinon la réponse 503 est envoyée
+        if self.config['ADMISSION_MAX_ACTIVE'] <= 0:
+            return True
+        club = data.get('club') if isinstance(data, dict) else None
+        if not isinstance(club, str) or not club:
+            club = (scope.get('client') or ('',))[0]
+        ticket = dict(scope['headers']).get(TICKET_HEADER.lower().encode())
+        decision = admission.try_admit(club, ticket.decode('latin-1') if ticket else None)
+        if decision.admitted:
+            return True
+        body, headers = _json_body(decision.to_json())
+        headers.append((b'retry-after', str(decision.retry_after).encode()))
+        if decision.ticket:
+            headers.append((TICKET_HEADER.lower().encode(), decision.ticket.encode()))
+        await self._respond(send, 503, body, headers)
+        return False
+
+    async def _book(self, scope, receive, send, name, document):
+        data = await self._read_json(receive)
+        if not (await self._limit_rate(scope, send, data)
+                and await self._admit(scope, send, data)):
+            return
+        started = time.perf_counter()
+        try:
+            await self._ensure_loaded()
+            # La réservation prend des verrous et peut écrire en base
+            result = await self._run(api.idempotent_document, name,
+                                     self._idempotency_key(scope), data, document)
+            await self._send_document(scope, send, result)
+        finally:
+            if self.config['ADMISSION_MAX_ACTIVE'] > 0:
+                admission.release(time.perf_counter() - started)
+
+    async def post_booking(self, scope, receive, send):
+        await self._book(scope, receive, send, 'booking', api.booking_document)
+
+    async def post_batch(self, scope, receive, send):
+        await self._book(scope, receive, send, 'batch', api.batch_document)
+
+    # Pont WSGI
+
+    async def _call_wsgi(self, scope, receive, send):
+        environ = self._environ(scope, await self._read_body(receive))
+        status, headers, body = await self._run(self._run_wsgi, environ)
+        await self._respond(send, status, body, headers)
+
+    def _run_wsgi(self, environ):
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                  for name, value in headers]
+
+        result = self.wsgi_app(environ, start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return started['status'], started['headers'], body
+
+    @staticmethod
+    def _environ(scope, body):
+        server_name, server_port = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_NAME': server_name,
+            'SERVER_PORT': str(server_port),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif name != 'CONTENT_LENGTH':
+                key = f'HTTP_{name}'
+                environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+
+
+application = AsgiApp(flask_app, threads=flask_app.config['ASGI_THREADS'])
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit('uvicorn is required: pip install uvicorn')
+    uvicorn.run(application, host='127.0.0.1', port=8000)
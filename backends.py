@@ -0,0 +1,469 @@
+"""
+Backends de stockage des clubs et des compétitions.
+
+Le backend est choisi par la configuration (`STORAGE_BACKEND`) :
+
+- `json` (défaut) : fichiers clubs.json / competitions.json, avec le journal
+  des réservations optionnel de persistence.py ;
+- `sqlite` : base SQLite en mode WAL, partageable entre plusieurs processus
+  (workers gunicorn). Chaque réservation y est une transaction dont les
+  UPDATE portent une condition de garde, si bien que deux workers ne peuvent
+  pas survendre une compétition.
+
+Un backend expose `load_clubs()`, `load_competitions()`, `load_bookings()`
+(totaux du registre des réservations, voir ledger.py), `attach(store,
+ledger)`, `commit_booking(...)`, `journal_bookings(...)`, `refresh(...)` et
+`close()` ; un backend partagé (`shared = True`) expose aussi `changes()`, les
+clubs, compétitions et couples réservés par les autres processus depuis le
+dernier appel, et `booked_places(...)`.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from loaders import load_records
+from models import DATE_FORMAT, Club, Competition
+from persistence import JsonPersistence
+
+
+class JsonBackend:
+    """
+    Backend historique basé sur les fichiers JSON (ou NDJSON, voir loaders.py).
+
+    Args:
+        clubs_path (str): Chemin de clubs.json
+        competitions_path (str): Chemin de competitions.json
+        persistence (JsonPersistence): Journal des réservations optionnel
+        progress (callable): Suivi du chargement (voir loaders.load_records)
+    """
+
+    # L'état n'est pas partagé entre processus
+    shared = False
+
+    def __init__(self, clubs_path, competitions_path, persistence=None, progress=None):
+        self.clubs_path = clubs_path
+        self.competitions_path = competitions_path
+        self.persistence = persistence
+        self.ledger = None
+        self.progress = progress
+
+    def load_clubs(self):
+        """Charge les clubs (journal rejoué si la persistance est activée)."""
+        if self.persistence is not None:
+            return self.persistence.load_clubs()
+        return load_records(self.clubs_path, 'clubs', Club.from_dict, self.progress)
+
+    def load_competitions(self):
+        """Charge les compétitions (journal rejoué si la persistance est activée)."""
+        if self.persistence is not None:
+            return self.persistence.load_competitions()
+        return load_records(
+            self.competitions_path, 'competitions', Competition.from_dict, self.progress)
+
+    def attach(self, store, ledger=None):
+        """
+        Associe le dépôt et le registre des réservations en mémoire (totaux
+        journalisés et compactés avec le reste de l'état).
+        """
+        self.ledger = ledger
+        if self.persistence is not None:
+            self.persistence.attach(store, ledger)
+
+    def load_bookings(self):
+        """
+        Totaux des places réservées par couple (journal rejoué si la
+        persistance est activée, aucun sinon).
+
+        Returns:
+            dict: `{(club, compétition): places}`
+        """
+        if self.persistence is not None:
+            return self.persistence.load_bookings()
+        return {}
+
+    def commit_booking(self, club, competition, places, points_cost):
+        """
+        Calcule les nouvelles valeurs d'une réservation validée.
+
+        Appelé par le moteur de réservation sous les verrous du club et de la
+        compétition. La réservation n'est journalisée qu'une fois appliquée
+        au dépôt (voir `journal_bookings`).
+
+        Returns:
+            tuple: (nouveaux points du club, places restantes)
+        """
+        return club.points - points_cost, competition.number_of_places - places
+
+    def commit_bookings(self, club, bookings):
+        """
+        Calcule les nouvelles valeurs d'une réservation groupée validée.
+
+        Args:
+            club (Club): Club qui réserve
+            bookings (list): Triplets `(Competition, places, points_cost)`
+
+        Returns:
+            tuple: (nouveaux points du club, {nom de compétition: places restantes})
+        """
+        points = club.points
+        places_left = {}
+        for competition, places, points_cost in bookings:
+            points -= points_cost
+            places_left[competition.name] = places_left.get(
+                competition.name, competition.number_of_places) - places
+        return points, places_left
+
+    def journal_bookings(self, club, bookings):
+        """
+        Journalise des réservations déjà appliquées au dépôt et au registre,
+        en un seul enregistrement (une réservation groupée est rejouée en
+        entier ou pas du tout).
+
+        Journaliser après l'application garantit qu'un enregistrement basculé
+        dans un segment compacté est déjà visible dans le snapshot qui le
+        remplace (voir JsonPersistence.compact). Les valeurs journalisées sont
+        les valeurs absolues courantes, lues sous les verrous du moteur.
+
+        Args:
+            club (Club): Club qui a réservé
+            bookings (list): Couples `(Competition, places)`
+        """
+        if self.persistence is None:
+            return
+        self.persistence.record_bookings(club.name, club.points, [
+            (competition.name, places, competition.number_of_places,
+             self.ledger.places_booked(club.name, competition.name)
+             if self.ledger is not None else None)
+            for competition, places in bookings])
+
+    def refresh(self, store, club, competition):
+        """Rien à resynchroniser : la mémoire fait foi."""
+
+    def close(self):
+        """Vide le journal sur disque."""
+        if self.persistence is not None:
+            self.persistence.close()
+
+
+class SqliteBackend:
+    """
+    Backend SQLite partageable entre processus.
+
+    Chaque opération emprunte une connexion à un pool borné partagé par les
+    threads et les greenlets, puis la rend ; les requêtes sont des
+    constantes, donc préparées une seule fois par connexion grâce au cache
+    d'instructions de sqlite3.
+
+    Args:
+        path (str): Chemin de la base
+        seed_clubs (callable): Retourne les clubs à importer si la base est vide
+        seed_competitions (callable): Retourne les compétitions à importer
+        timeout (float): Attente maximale d'un verrou d'écriture, en secondes
+        pool_size (int): Nombre maximum de connexions libres conservées
+    """
+
+    # L'état est partagé entre processus : la base fait foi
+    shared = True
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS clubs ('
+        ' name TEXT PRIMARY KEY,'
+        ' email TEXT NOT NULL UNIQUE,'
+        ' points INTEGER NOT NULL CHECK (points >= 0))',
+        'CREATE TABLE IF NOT EXISTS competitions ('
+        ' name TEXT PRIMARY KEY,'
+        ' date TEXT NOT NULL,'
+        ' number_of_places INTEGER NOT NULL CHECK (number_of_places >= 0))',
+        'CREATE INDEX IF NOT EXISTS idx_competitions_date ON competitions (date)',
+        # Flux des modifications, lu par les autres processus (voir changes())
+        'CREATE TABLE IF NOT EXISTS changes ('
+        ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+        ' club TEXT NOT NULL,'
+        ' competition TEXT NOT NULL)',
+        # Registre des réservations, en ajout seul (voir ledger.py)
+        'CREATE TABLE IF NOT EXISTS bookings ('
+        ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+        ' club TEXT NOT NULL,'
+        ' competition TEXT NOT NULL,'
+        ' places INTEGER NOT NULL,'
+        ' points_cost INTEGER NOT NULL,'
+        ' booked_at TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_bookings_pair ON bookings (club, competition)',
+    )
+    SELECT_CLUBS = 'SELECT name, email, points FROM clubs ORDER BY rowid'
+    SELECT_COMPETITIONS = 'SELECT name, date, number_of_places FROM competitions ORDER BY rowid'
+    SELECT_CLUB_POINTS = 'SELECT points FROM clubs WHERE name = ?'
+    SELECT_COMPETITION_PLACES = 'SELECT number_of_places FROM competitions WHERE name = ?'
+    INSERT_CLUB = 'INSERT INTO clubs (name, email, points) VALUES (?, ?, ?)'
+    INSERT_COMPETITION = ('INSERT INTO competitions (name, date, number_of_places) '
+                          'VALUES (?, ?, ?)')
+    # Conditions de garde : la déduction n'a lieu que s'il reste de quoi déduire
+    BOOK_PLACES = ('UPDATE competitions SET number_of_places = number_of_places - ? '
+                   'WHERE name = ? AND number_of_places >= ?')
+    SPEND_POINTS = 'UPDATE clubs SET points = points - ? WHERE name = ? AND points >= ?'
+    INSERT_CHANGE = 'INSERT INTO changes (club, competition) VALUES (?, ?)'
+    SELECT_CHANGES = 'SELECT id, club, competition FROM changes WHERE id > ? ORDER BY id'
+    SELECT_LAST_CHANGE = 'SELECT COALESCE(MAX(id), 0) FROM changes'
+    SELECT_FIRST_CHANGE = 'SELECT MIN(id) FROM changes'
+    PRUNE_CHANGES = 'DELETE FROM changes WHERE id <= ?'
+    INSERT_BOOKING = ('INSERT INTO bookings (club, competition, places, points_cost, booked_at) '
+                      'VALUES (?, ?, ?, ?, ?)')
+    SELECT_BOOKED = ('SELECT COALESCE(SUM(places), 0) FROM bookings '
+                     'WHERE club = ? AND competition = ?')
+    SELECT_BOOKING_TOTALS = ('SELECT club, competition, SUM(places) FROM bookings '
+                             'GROUP BY club, competition')
+
+    # Nombre de modifications conservées dans le flux ; un processus plus en
+    # retard que cela recharge tous les compteurs
+    CHANGES_KEPT = 10000
+
+    def __init__(self, path, seed_clubs=None, seed_competitions=None, timeout=5.0,
+                 pool_size=8):
+        self.path = path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        # Connexions libres, réutilisées de la plus récente à la plus ancienne
+        self._idle = []
+        self._idle_lock = threading.Lock()
+        self._create_schema(seed_clubs, seed_competitions)
+        with self._connection() as connection:
+            self._last_change = connection.execute(self.SELECT_LAST_CHANGE).fetchone()[0]
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.timeout,
+                                     isolation_level=None, check_same_thread=False,
+                                     cached_statements=64)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    @contextmanager
+    def _connection(self):
+        # Emprunte une connexion libre (ou en ouvre une) le temps d'une
+        # opération ; au-delà de `pool_size` connexions libres, elle est
+        # fermée au retour : les greenlets éphémères (une par requête sous
+        # gevent) ne laissent aucune connexion derrière elles
+        with self._idle_lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            with self._idle_lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def _create_schema(self, seed_clubs, seed_competitions):
+        with self._connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+                if seed_clubs and connection.execute(
+                        'SELECT 1 FROM clubs LIMIT 1').fetchone() is None:
+                    connection.executemany(self.INSERT_CLUB, [
+                        (c.name, c.email, c.points) for c in seed_clubs()])
+                if seed_competitions and connection.execute(
+                        'SELECT 1 FROM competitions LIMIT 1').fetchone() is None:
+                    connection.executemany(self.INSERT_COMPETITION, [
+                        (c.name, c.date.strftime(DATE_FORMAT), c.number_of_places)
+                        for c in seed_competitions()])
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    def load_clubs(self):
+        """Charge les clubs depuis la base."""
+        with self._connection() as connection:
+            return [Club(name, email, points)
+                    for name, email, points in connection.execute(self.SELECT_CLUBS)]
+
+    def load_competitions(self):
+        """Charge les compétitions depuis la base."""
+        with self._connection() as connection:
+            return [Competition(name, datetime.strptime(date, DATE_FORMAT), places)
+                    for name, date, places in connection.execute(self.SELECT_COMPETITIONS)]
+
+    def attach(self, store, ledger=None):
+        """Aucun état en mémoire à persister : chaque réservation est déjà en base."""
+
+    def commit_booking(self, club, competition, places, points_cost):
+        """
+        Applique la réservation en une transaction aux UPDATE gardés.
+
+        Returns:
+            tuple: (nouveaux points du club, places restantes), ou None si une
+            condition de garde a échoué (état modifié par un autre processus)
+        """
+        with self._connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                if not self._book(connection, club.name, competition.name, places, points_cost):
+                    connection.execute('ROLLBACK')
+                    return None
+                points = connection.execute(self.SELECT_CLUB_POINTS, (club.name,)).fetchone()[0]
+                number_of_places = connection.execute(
+                    self.SELECT_COMPETITION_PLACES, (competition.name,)).fetchone()[0]
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+            return points, number_of_places
+
+    def commit_bookings(self, club, bookings):
+        """
+        Applique une réservation groupée en une seule transaction.
+
+        Args:
+            club (Club): Club qui réserve
+            bookings (list): Triplets `(Competition, places, points_cost)`
+
+        Returns:
+            tuple: (nouveaux points du club, {nom de compétition: places
+            restantes}), ou None si une condition de garde a échoué
+        """
+        with self._connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                for competition, places, points_cost in bookings:
+                    if not self._book(connection, club.name, competition.name, places,
+                                      points_cost):
+                        connection.execute('ROLLBACK')
+                        return None
+                points = connection.execute(self.SELECT_CLUB_POINTS, (club.name,)).fetchone()[0]
+                places_left = {
+                    competition.name: connection.execute(
+                        self.SELECT_COMPETITION_PLACES, (competition.name,)).fetchone()[0]
+                    for competition, _, _ in bookings}
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+            return points, places_left
+
+    def journal_bookings(self, club, bookings):
+        """Rien à journaliser : la transaction de `commit_booking(s)` fait foi."""
+
+    def _book(self, connection, club_name, competition_name, places, points_cost):
+        # Écritures gardées d'une ligne de réservation, dans la transaction
+        # ouverte ; False si une garde échoue (la transaction est à annuler)
+        if connection.execute(
+                self.BOOK_PLACES, (places, competition_name, places)).rowcount == 0 \
+                or connection.execute(
+                    self.SPEND_POINTS, (points_cost, club_name, points_cost)).rowcount == 0:
+            return False
+        connection.execute(self.INSERT_BOOKING, (
+            club_name, competition_name, places, points_cost,
+            datetime.now().strftime(DATE_FORMAT)))
+        self._record_change(connection, club_name, competition_name)
+        return True
+
+    def _record_change(self, connection, club_name, competition_name):
+        change = connection.execute(self.INSERT_CHANGE, (club_name, competition_name)).lastrowid
+        if change % 1000 == 0:
+            connection.execute(self.PRUNE_CHANGES, (change - self.CHANGES_KEPT,))
+
+    def changes(self):
+        """
+        Retourne les clubs et compétitions modifiés depuis le dernier appel.
+
+        Returns:
+            tuple: (noms de clubs, noms de compétitions, couples (club,
+            compétition) réservés), ou (None, None, None) si le flux a été
+            élagué au-delà du dernier appel : tout est à recharger
+        """
+        with self._connection() as connection:
+            rows = connection.execute(self.SELECT_CHANGES, (self._last_change,)).fetchall()
+            if not rows:
+                return set(), set(), set()
+            first = connection.execute(self.SELECT_FIRST_CHANGE).fetchone()[0]
+            missed = first > self._last_change + 1
+            self._last_change = rows[-1][0]
+            if missed:
+                return None, None, None
+            pairs = {(club, competition) for _, club, competition in rows}
+            return ({club for club, _ in pairs}, {competition for _, competition in pairs},
+                    pairs)
+
+    def load_bookings(self):
+        """
+        Totaux des places réservées par couple, depuis le registre en base.
+
+        Returns:
+            dict: `{(club, compétition): places}`
+        """
+        with self._connection() as connection:
+            return {(club, competition): places for club, competition, places
+                    in connection.execute(self.SELECT_BOOKING_TOTALS)}
+
+    def booked_places(self, club_name, competition_name):
+        """Places réservées en base par un club pour une compétition."""
+        with self._connection() as connection:
+            return connection.execute(
+                self.SELECT_BOOKED, (club_name, competition_name)).fetchone()[0]
+
+    def refresh(self, store, club, competition):
+        """
+        Recharge depuis la base les compteurs d'un club et d'une compétition.
+
+        Args:
+            store (Store): Dépôt à mettre à jour
+            club (Club): Club à recharger (ou None)
+            competition (Competition): Compétition à recharger (ou None)
+        """
+        with self._connection() as connection:
+            if club is not None:
+                points = connection.execute(self.SELECT_CLUB_POINTS, (club.name,)).fetchone()
+                if points is not None and points[0] != club.points:
+                    store.update_club(club, points=points[0])
+            if competition is not None:
+                places = connection.execute(
+                    self.SELECT_COMPETITION_PLACES, (competition.name,)).fetchone()
+                if places is not None and places[0] != competition.number_of_places:
+                    store.update_competition(competition, number_of_places=places[0])
+
+    def close(self):
+        """Ferme les connexions libres du pool."""
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+def create_backend(config, progress=None):
+    """
+    Instancie le backend de stockage décrit par la configuration.
+
+    Args:
+        config (dict): Configuration Flask (`app.config`)
+        progress (callable): Suivi du chargement des fichiers JSON
+
+    Returns:
+        JsonBackend | SqliteBackend: Backend prêt à l'emploi
+
+    Raises:
+        ValueError: Si `STORAGE_BACKEND` est inconnu
+    """
+    name = config['STORAGE_BACKEND']
+    if name == 'json':
+        persistence = None
+        if config['WAL_DIR']:
+            persistence = JsonPersistence(
+                config['CLUBS_FILE'], config['COMPETITIONS_FILE'], config['WAL_DIR'],
+                flush_interval=config['WAL_FLUSH_INTERVAL'],
+                compact_every=config['WAL_COMPACT_EVERY'], progress=progress)
+        return JsonBackend(config['CLUBS_FILE'], config['COMPETITIONS_FILE'], persistence,
+                           progress=progress)
+    if name == 'sqlite':
+        json_seed = JsonBackend(config['CLUBS_FILE'], config['COMPETITIONS_FILE'],
+                                progress=progress)
+        return SqliteBackend(config['SQLITE_PATH'],
+                             seed_clubs=json_seed.load_clubs,
+                             seed_competitions=json_seed.load_competitions)
+    raise ValueError(f"Unknown storage backend: {name}")
@@ -0,0 +1,115 @@
+"""
+Stockage des résultats de benchmarks et détection des régressions.
+
+Un fichier de résultats est un document JSON :
+
+    {"suite": "micro", "meta": {...}, "results": {"<nom>": {"p50": ..., "p95": ...}}}
+
+Les latences (`p50`, `p95`, `p99`) sont meilleures quand elles baissent, le
+débit (`rps`) quand il augmente. Une mesure est une régression quand elle
+s'écarte de la référence de plus de la tolérance dans le mauvais sens.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/micro.json benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+LOWER_IS_BETTER = ('p50', 'p95', 'p99')
+HIGHER_IS_BETTER = ('rps',)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path, suite, results):
+    """
+    Écrit des résultats accompagnés de leur contexte d'exécution.
+
+    Args:
+        path (str): Fichier JSON de sortie (répertoires créés au besoin)
+        suite (str): Nom de la suite (`micro`, `load`)
+        results (dict): Mesures par nom
+    """
+    document = {
+        'suite': suite,
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+        },
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(document, output, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Lit les mesures d'un fichier de résultats."""
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)['results']
+
+
+def compare(current, baseline, tolerance=0.2):
+    """
+    Compare des mesures à une référence.
+
+    Seules les mesures présentes des deux côtés sont comparées.
+
+    Args:
+        current (dict): Mesures courantes par nom
+        baseline (dict): Mesures de référence par nom
+        tolerance (float): Écart relatif toléré (0.2 = 20 %)
+
+    Returns:
+        list: `(nom, métrique, référence, valeur)` pour chaque régression
+    """
+    regressions = []
+    for name in sorted(current.keys() & baseline.keys()):
+        measured, reference = current[name], baseline[name]
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if measured.get(metric) is None or not reference.get(metric):
+                continue
+            ratio = measured[metric] / reference[metric]
+            if metric in LOWER_IS_BETTER and ratio > 1 + tolerance \
+                    or metric in HIGHER_IS_BETTER and ratio < 1 - tolerance:
+                regressions.append((name, metric, reference[metric], measured[metric]))
+    return regressions
+
+
+def print_report(regressions, stream=sys.stdout):
+    """Affiche les régressions détectées (ou l'absence de régression)."""
+    if not regressions:
+        print('No regression.', file=stream)
+        return
+    for name, metric, reference, measured in regressions:
+        print(f'REGRESSION {name} {metric}: {reference} -> {measured} '
+              f'({(measured / reference - 1) * 100:+.0f}%)', file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare benchmark results to a baseline')
+    parser.add_argument('current')
+    parser.add_argument('baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    regressions = compare(load_results(args.current), load_results(args.baseline),
+                          args.tolerance)
+    print_report(regressions)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
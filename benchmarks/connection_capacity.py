@@ -0,0 +1,111 @@
+"""
+Mesure de la capacité en connexions simultanées d'un serveur GUDLFT.
+
+Ouvre N connexions HTTP/1.1 keep-alive qui envoient chacune une requête puis
+restent inactives, comme des tableaux de bord ouverts pendant une ouverture
+des inscriptions. Pendant qu'elles sont tenues, des requêtes de sonde sur une
+nouvelle connexion mesurent la latence perçue par un nouveau client.
+
+En WSGI synchrone, chaque connexion keep-alive immobilise un thread : au-delà
+de la taille du pool, les nouveaux clients attendent ou échouent. En ASGI, les
+connexions inactives ne coûtent qu'un descripteur et un peu de mémoire.
+
+Usage:
+    # WSGI (un worker, 32 threads)
+    gunicorn -w 1 --threads 32 -b 127.0.0.1:5000 server:app
+    python benchmarks/connection_capacity.py --url http://127.0.0.1:5000 -c 2000
+
+    # ASGI
+    uvicorn asgi:application --port 8000
+    python benchmarks/connection_capacity.py --url http://127.0.0.1:8000 -c 2000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def request(reader, writer, host, path):
+    """Envoie un GET keep-alive et lit la réponse complète (Content-Length)."""
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n'
+                 .encode())
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def hold_connection(host, port, path, timeout, held, release):
+    """Ouvre une connexion, fait une requête puis la garde ouverte."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        await asyncio.wait_for(request(reader, writer, host, path), timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        return False
+    held.append(writer)
+    await release.wait()
+    writer.close()
+    return True
+
+
+async def probe(host, port, path, timeout):
+    """Latence d'une requête sur une nouvelle connexion (None en cas d'échec)."""
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        await asyncio.wait_for(request(reader, writer, host, path), timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        return None
+    writer.close()
+    return time.perf_counter() - started
+
+
+async def run(url, connections, path, probes, timeout):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    held, release = [], asyncio.Event()
+
+    holders = [asyncio.create_task(hold_connection(host, port, path, timeout, held, release))
+               for _ in range(connections)]
+    # Laisser le temps aux connexions de s'établir (ou d'échouer)
+    deadline = time.perf_counter() + timeout
+    while len(held) < connections and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+    latencies = [await probe(host, port, path, timeout) for _ in range(probes)]
+    release.set()
+    succeeded = sum(await asyncio.gather(*holders))
+
+    served = [latency for latency in latencies if latency is not None]
+    return {
+        'url': url,
+        'connections': connections,
+        'held': succeeded,
+        'probe_failures': probes - len(served),
+        'probe_p50_ms': round(statistics.median(served) * 1000, 2) if served else None,
+        'probe_max_ms': round(max(served) * 1000, 2) if served else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('-c', '--connections', type=int, default=1000)
+    parser.add_argument('--path', default='/health')
+    parser.add_argument('--probes', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args()
+    result = asyncio.run(run(args.url, args.connections, args.path, args.probes, args.timeout))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Générateur de jeux de données synthétiques pour les tests de charge.
+
+Produit des fichiers de clubs et de compétitions au format de clubs.json /
+competitions.json (ou NDJSON, voir loaders.py), à l'échelle et selon les
+distributions demandées :
+
+- points des clubs et places des compétitions : `uniform` (équiprobable),
+  `normal` (centrée sur la moitié du maximum) ou `skewed` (la plupart des
+  valeurs sont faibles, quelques-unes proches du maximum) ;
+- dates : une fraction `past_ratio` de compétitions passées, les autres à
+  venir, réparties sur `days` jours de part et d'autre de la date courante.
+
+Les enregistrements sont écrits au fil de l'eau : un million de clubs ne
+sont jamais tous en mémoire. Le même `seed` produit les mêmes fichiers.
+
+Usage:
+    python -m benchmarks.dataset --clubs 100000 --competitions 500 --output-dir data/
+    GUDLFT_CLUBS_FILE=data/clubs.json GUDLFT_COMPETITIONS_FILE=data/competitions.json \\
+        python -m benchmarks.load
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+from loaders import NDJSON_EXTENSIONS
+from models import DATE_FORMAT
+
+DISTRIBUTIONS = ('uniform', 'normal', 'skewed')
+
+
+def draw(rng, distribution, maximum):
+    """
+    Tire un entier entre 0 et `maximum` selon une distribution.
+
+    Args:
+        rng (random.Random): Générateur pseudo-aléatoire
+        distribution (str): Une des `DISTRIBUTIONS`
+        maximum (int): Borne supérieure incluse
+
+    Returns:
+        int: Valeur tirée
+    """
+    if distribution == 'uniform':
+        value = rng.uniform(0, maximum)
+    elif distribution == 'normal':
+        value = rng.gauss(maximum / 2, maximum / 6)
+    elif distribution == 'skewed':
+        value = maximum * rng.random() ** 3
+    else:
+        raise ValueError(f'Unknown distribution: {distribution!r}')
+    return max(0, min(maximum, round(value)))
+
+
+def generate_clubs(count, seed=0, points='uniform', max_points=30):
+    """
+    Génère des clubs au format JSON (noms et emails uniques).
+
+    Yields:
+        dict: `{"name", "email", "points"}`
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        yield {'name': f'Club {index}', 'email': f'club{index}@example.com',
+               'points': str(draw(rng, points, max_points))}
+
+
+def generate_competitions(count, seed=0, places='uniform', max_places=50, past_ratio=0.3,
+                          days=365, now=None):
+    """
+    Génère des compétitions au format JSON, passées ou à venir.
+
+    Yields:
+        dict: `{"name", "date", "numberOfPlaces"}`
+    """
+    rng = random.Random(seed + 1)
+    now = now or datetime.now()
+    for index in range(count):
+        offset = timedelta(days=rng.uniform(1, days))
+        date = now - offset if rng.random() < past_ratio else now + offset
+        yield {'name': f'Competition {index}',
+               'date': date.replace(microsecond=0).strftime(DATE_FORMAT),
+               'numberOfPlaces': str(draw(rng, places, max_places))}
+
+
+def write_records(path, key, records):
+    """
+    Écrit des enregistrements au format `{"<key>": [...]}` ou NDJSON.
+
+    Returns:
+        int: Nombre d'enregistrements écrits
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as output:
+        if path.endswith(NDJSON_EXTENSIONS):
+            for count, record in enumerate(records, start=1):
+                output.write(json.dumps(record) + '\n')
+            return count
+        output.write(f'{{"{key}": [\n')
+        for count, record in enumerate(records, start=1):
+            output.write((',\n' if count > 1 else '') + json.dumps(record))
+        output.write('\n]}\n')
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate GUDLFT load-test datasets')
+    parser.add_argument('--clubs', type=int, default=10000)
+    parser.add_argument('--competitions', type=int, default=200)
+    parser.add_argument('--output-dir', default='benchmarks/data')
+    parser.add_argument('--format', choices=('json', 'ndjson'), default='json')
+    parser.add_argument('--points', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--max-points', type=int, default=30)
+    parser.add_argument('--places', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--max-places', type=int, default=50)
+    parser.add_argument('--past-ratio', type=float, default=0.3,
+                        help='fraction de compétitions passées')
+    parser.add_argument('--days', type=int, default=365,
+                        help='étendue des dates autour de la date courante (jours)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    clubs_path = os.path.join(args.output_dir, f'clubs.{args.format}')
+    competitions_path = os.path.join(args.output_dir, f'competitions.{args.format}')
+    clubs = write_records(clubs_path, 'clubs', generate_clubs(
+        args.clubs, args.seed, args.points, args.max_points))
+    competitions = write_records(competitions_path, 'competitions', generate_competitions(
+        args.competitions, args.seed, args.places, args.max_places, args.past_ratio, args.days))
+    print(f'{clubs} clubs -> {clubs_path}\n{competitions} competitions -> {competitions_path}',
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
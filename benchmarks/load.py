@@ -0,0 +1,154 @@
+"""
+Test de charge scripté : serveur local + Locust en mode headless.
+
+Démarre le lanceur de production (wsgi.py) sur un port local, attend que
+`/ready` réponde, exécute `locustfile.py` sans interface pendant la durée
+demandée, arrête le serveur puis convertit les statistiques CSV de Locust en
+résultats JSON par route (latences p50/p95/p99 en millisecondes, débit,
+échecs), comparables à une référence (voir compare.py).
+
+Usage:
+    python -m benchmarks.load --users 50 --run-time 30s
+    python -m benchmarks.load --clubs-file benchmarks/data/clubs.json \
+        --competitions-file benchmarks/data/competitions.json
+    python -m benchmarks.load --baseline benchmarks/results/load-baseline.json
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.compare import compare, load_results, print_report, save_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_ready(url, timeout):
+    """Attend que `/ready` réponde 200 ; lève RuntimeError après `timeout` secondes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{url}/ready', timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (OSError, urllib.error.URLError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'server at {url} not ready after {timeout}s')
+
+
+def start_server(port, workers, workdir):
+    """
+    Démarre wsgi.py en arrière-plan.
+
+    Avec plusieurs workers, la base SQLite partagée est créée dans `workdir`
+    pour ne pas toucher à celle du projet.
+
+    Returns:
+        subprocess.Popen: Processus maître du serveur
+    """
+    env = dict(os.environ, GUDLFT_DATA_LOADING='eager')
+    if workers > 1:
+        env.setdefault('GUDLFT_SQLITE_PATH', os.path.join(workdir, 'gudlft.db'))
+    return subprocess.Popen(
+        [sys.executable, 'wsgi.py', '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_locust(url, locustfile, users, spawn_rate, run_time, csv_prefix, user_classes=()):
+    """Exécute Locust sans interface ; les statistiques sont écrites en CSV."""
+    command = [sys.executable, '-m', 'locust', '-f', locustfile, '--headless', '--host', url,
+               '--users', str(users), '--spawn-rate', str(spawn_rate),
+               '--run-time', run_time, '--csv', csv_prefix, '--only-summary']
+    command.extend(user_classes)
+    # Locust sort en erreur dès qu'une requête a échoué : les échecs sont
+    # reportés dans les résultats, pas traités comme un échec du benchmark
+    subprocess.run(command, cwd=ROOT, check=False)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_stats(path):
+    """
+    Convertit le fichier `<préfixe>_stats.csv` de Locust en résultats.
+
+    Returns:
+        dict: Mesures par route, nommées `load.<méthode> <nom>`
+    """
+    results = {}
+    with open(path, newline='', encoding='utf-8') as source:
+        for row in csv.DictReader(source):
+            name = 'load.total' if row['Name'] == 'Aggregated' \
+                else f"load.{row['Type']} {row['Name']}"
+            results[name] = {
+                'p50': _number(row['50%']),
+                'p95': _number(row['95%']),
+                'p99': _number(row['99%']),
+                'rps': _number(row['Requests/s']),
+                'requests': int(row['Request Count']),
+                'failures': int(row['Failure Count']),
+                'unit': 'ms',
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='GUDLFT headless load test')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--locustfile', default='locustfile.py')
+    parser.add_argument('--clubs-file', help='clubs servis et utilisés par Locust (voir dataset.py)')
+    parser.add_argument('--competitions-file', help='compétitions servies et utilisées par Locust')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--spawn-rate', type=float, default=10)
+    parser.add_argument('--run-time', default='30s')
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    parser.add_argument('--output', default='benchmarks/results/load.json')
+    parser.add_argument('--baseline', help='résultats de référence à comparer')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('user_classes', nargs='*', help='classes Locust à lancer (toutes par défaut)')
+    args = parser.parse_args(argv)
+
+    # Serveur et Locust lisent les mêmes fichiers de données
+    if args.clubs_file:
+        os.environ['GUDLFT_CLUBS_FILE'] = os.path.abspath(args.clubs_file)
+    if args.competitions_file:
+        os.environ['GUDLFT_COMPETITIONS_FILE'] = os.path.abspath(args.competitions_file)
+    url = f'http://127.0.0.1:{args.port}'
+    with tempfile.TemporaryDirectory(prefix='gudlft-load-') as workdir:
+        server = start_server(args.port, args.workers, workdir)
+        try:
+            wait_ready(url, args.startup_timeout)
+            csv_prefix = os.path.join(workdir, 'locust')
+            run_locust(url, args.locustfile, args.users, args.spawn_rate, args.run_time,
+                       csv_prefix, args.user_classes)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        results = parse_stats(f'{csv_prefix}_stats.csv')
+
+    save_results(args.output, 'load', results)
+    total = results.get('load.total', {})
+    print(f"{total.get('requests', 0)} requests, {total.get('failures', 0)} failures, "
+          f"p95 {total.get('p95')} ms, {total.get('rps')} req/s -> {args.output}",
+          file=sys.stderr)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        print_report(regressions)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Micro-benchmarks des chemins critiques à différentes tailles de registre.
+
+Pour chaque taille (10 à 1 000 000 clubs par défaut), un jeu de données
+synthétique est chargé dans le dépôt partagé de l'application puis on mesure :
+
+- `lookup.*` : recherches d'un club (email, nom) et d'une compétition ;
+- `login.unknown_email` : rejet d'un email inconnu par le filtre de Bloom ;
+- `leaderboard.build` : construction complète du classement ;
+- `leaderboard.update` : repositionnement d'un club après une réservation ;
+- `leaderboard.page` : extraction d'une page du classement ;
+- `render.leaderboard`, `render.welcome` : rendu Jinja d'une page, sans cache.
+
+Les résultats (médiane et 95e centile par opération, en microsecondes) sont
+écrits en JSON et peuvent être comparés à une référence (voir compare.py).
+
+Usage:
+    python -m benchmarks.micro --output benchmarks/results/micro.json
+    python -m benchmarks.micro --sizes 10 1000 --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Le chargement des fichiers de données ne doit pas écraser le jeu synthétique
+os.environ.setdefault('GUDLFT_DATA_LOADING', 'lazy')
+
+from flask import render_template  # noqa: E402
+
+from benchmarks.compare import compare, load_results, print_report, save_results  # noqa: E402
+from benchmarks.dataset import generate_clubs, generate_competitions  # noqa: E402
+from models import Club, Competition  # noqa: E402
+from server import app, welcome_context  # noqa: E402
+from state import email_filter, ranking, store  # noqa: E402
+
+DEFAULT_SIZES = (10, 1000, 100000, 1000000)
+# Nombre de compétitions du jeu synthétique (indépendant du nombre de clubs)
+COMPETITIONS = 200
+# Durée visée de chaque échantillon (secondes)
+SAMPLE_TARGET = 0.01
+
+
+def make_dataset(clubs, competitions=COMPETITIONS, seed=0):
+    """
+    Jeu de données synthétique reproductible (voir dataset.py).
+
+    Returns:
+        tuple: (liste de Club, liste de Competition)
+    """
+    return ([Club.from_dict(record) for record in generate_clubs(clubs, seed)],
+            [Competition.from_dict(record) for record in generate_competitions(competitions, seed)])
+
+
+def measure(operation, samples=20):
+    """
+    Chronomètre une opération.
+
+    Chaque échantillon répète l'opération assez de fois pour durer environ
+    `SAMPLE_TARGET` ; le coût retenu est le temps moyen d'un appel.
+
+    Args:
+        operation (callable): Opération sans argument
+        samples (int): Nombre d'échantillons
+
+    Returns:
+        dict: `p50` et `p95` en microsecondes, nombre d'appels mesurés
+    """
+    started = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - started
+    number = max(1, int(SAMPLE_TARGET / elapsed)) if elapsed > 0 else 1000
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        for _ in range(number):
+            operation()
+        timings.append((time.perf_counter() - started) / number * 1e6)
+    timings.sort()
+    return {'p50': round(timings[len(timings) // 2], 3),
+            'p95': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'unit': 'us', 'calls': number * samples}
+
+
+def cycle(values):
+    """Opération qui parcourt des clés précalculées (évite de mesurer `random`)."""
+    iterator = iter(())
+
+    def next_value():
+        nonlocal iterator
+        try:
+            return next(iterator)
+        except StopIteration:
+            iterator = iter(values)
+            return next(iterator)
+    return next_value
+
+
+def bench_size(size, samples):
+    """
+    Mesure toutes les opérations pour un registre de `size` clubs.
+
+    Returns:
+        dict: Résultats nommés `<opération>[n=<size>]`
+    """
+    clubs, competitions = make_dataset(size)
+    store.load(clubs, competitions)
+    rng = random.Random(size)
+    picked = [rng.choice(clubs) for _ in range(1000)]
+    emails, names = cycle([c.email for c in picked]), cycle([c.name for c in picked])
+    competition_names = cycle([c.name for c in rng.sample(competitions, 100)])
+    unknown_emails = cycle([f'unknown{i}@example.org' for i in range(1000)])
+    updated = cycle(picked)
+    # Les grandes tailles coûtent cher à reconstruire : moins d'échantillons
+    build_samples = max(3, min(samples, 1000000 // size))
+
+    def update_points():
+        club = updated()
+        store.update_club(club, points=(club.points + 1) % 31)
+
+    results = {
+        'lookup.club_by_email': measure(lambda: store.get_club_by_email(emails()), samples),
+        'lookup.club_by_name': measure(lambda: store.get_club_by_name(names()), samples),
+        'lookup.competition_by_name': measure(
+            lambda: store.get_competition_by_name(competition_names()), samples),
+        'login.unknown_email': measure(
+            lambda: email_filter.might_contain(unknown_emails()), samples),
+        'leaderboard.build': measure(lambda: ranking.reset(store), build_samples),
+        'leaderboard.update': measure(update_points, samples),
+        'leaderboard.page': measure(lambda: ranking.top(50, len(ranking) // 2), samples),
+    }
+    with app.test_request_context():
+        pages = max(1, -(-len(ranking) // 50))
+        results['render.leaderboard'] = measure(lambda: render_template(
+            'leaderboard.html', clubs=ranking.top(50), offset=0, page=1, pages=pages,
+            per_page=50), samples)
+        results['render.welcome'] = measure(lambda: render_template(
+            'welcome.html', **welcome_context(picked[0])), samples)
+    return {f'{name}[n={size}]': result for name, result in results.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='GUDLFT micro-benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--output', default='benchmarks/results/micro.json')
+    parser.add_argument('--baseline', help='résultats de référence à comparer')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='ralentissement toléré avant de signaler une régression')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        print(f'Benchmarking {size} clubs...', file=sys.stderr)
+        results.update(bench_size(size, args.samples))
+    save_results(args.output, 'micro', results)
+    print(f'Results written to {args.output}', file=sys.stderr)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        print_report(regressions)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Filtre de Bloom des emails de clubs (connexions échouées).
+
+Une connexion avec un email inconnu (faute de frappe, énumération) est
+écartée par le filtre sans consulter le dépôt : un filtre de Bloom répond
+« absent » sans erreur possible, et « peut-être présent » avec une faible
+probabilité d'erreur, auquel cas l'index du dépôt tranche.
+
+Le filtre contient les emails tels que le dépôt les indexe (comparaison
+exacte, comme `Store.get_club_by_email`) : un email absent du filtre est
+certainement inconnu, et un email accepté par le filtre mais absent du dépôt
+est un vrai faux positif. Le filtre est reconstruit quand le contenu du dépôt
+est remplacé ou quand le nombre de clubs dépasse sa capacité ; un email
+retiré ou modifié y reste jusqu'à la reconstruction suivante (faux positif
+sans conséquence).
+"""
+import math
+import threading
+
+from store import StoreListener
+
+# Capacité minimale d'un filtre (évite les filtres minuscules pour un dépôt vide)
+MIN_CAPACITY = 1024
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom sur un tableau de bits.
+
+    Les `hashes` positions d'une valeur sont dérivées des deux moitiés de
+    son hash natif (double hachage).
+
+    Args:
+        capacity (int): Nombre de valeurs prévu
+        error_rate (float): Taux de faux positifs visé à pleine capacité
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __len__(self):
+        return self.count
+
+    def _hashes(self, value):
+        # Double hachage à partir du hash natif : le filtre est propre au
+        # processus, la graine aléatoire de `hash` ne pose donc pas de problème
+        value_hash = hash(value)
+        return value_hash & 0xFFFFFFFF, (value_hash >> 32 & 0xFFFFFFFF) | 1
+
+    def add(self, value):
+        """Ajoute une valeur."""
+        first, second = self._hashes(value)
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        first, second = self._hashes(value)
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            # Un seul bit à zéro suffit : les valeurs absentes sortent tôt
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def memory_bytes(self):
+        """Taille du tableau de bits."""
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self):
+        """Taux de faux positifs estimé pour le nombre de valeurs ajoutées."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+class EmailFilter(StoreListener):
+    """
+    Filtre de Bloom des emails du dépôt, tenu à jour par ses notifications.
+
+    Args:
+        store (Store): Dépôt observé
+        error_rate (float): Taux de faux positifs visé
+    """
+
+    def __init__(self, store, error_rate=0.01):
+        self.error_rate = error_rate
+        self.rejected = 0
+        self.false_positives = 0
+        self._store = store
+        self._lock = threading.Lock()
+        self._filter = BloomFilter(MIN_CAPACITY, error_rate)
+        store.add_listener(self)
+
+    def might_contain(self, email):
+        """
+        Indique si un email peut appartenir à un club.
+
+        Args:
+            email (str): Email soumis
+
+        Returns:
+            bool: False si l'email est certainement inconnu
+        """
+        if email in self._filter:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_false_positive(self):
+        """Un email accepté par le filtre n'a pas été trouvé dans le dépôt."""
+        self.false_positives += 1
+
+    def stats(self):
+        """Taille, taux de faux positifs estimé et compteurs du filtre."""
+        bloom = self._filter
+        return {'emails': len(bloom), 'memory_bytes': bloom.memory_bytes,
+                'hashes': bloom.hashes,
+                'false_positive_rate': bloom.false_positive_rate,
+                'rejected': self.rejected, 'false_positives': self.false_positives}
+
+    def reset(self, store):
+        self._rebuild(store)
+
+    def club_added(self, club):
+        with self._lock:
+            if len(self._filter) >= self._filter.capacity:
+                # Capacité atteinte : reconstruit plus grand (le club y est déjà)
+                self._rebuild_locked(self._store)
+            else:
+                self._filter.add(club.email)
+
+    def club_updated(self, club, previous):
+        if 'email' in previous:
+            with self._lock:
+                self._filter.add(club.email)
+
+    def _rebuild(self, store):
+        with self._lock:
+            self._rebuild_locked(store)
+
+    def _rebuild_locked(self, store):
+        # Le nouveau filtre est rempli à part puis publié d'un coup : les
+        # lectures sans verrou voient l'ancien ou le nouveau, jamais un filtre partiel
+        clubs = store.clubs
+        bloom = BloomFilter(max(MIN_CAPACITY, 2 * len(clubs)), self.error_rate)
+        for club in clubs:
+            bloom.add(club.email)
+        self._filter = bloom
@@ -0,0 +1,348 @@
+"""
+Moteur de réservation atomique.
+
+La vérification des règles métier et la déduction des points et des places
+sont effectuées sous des verrous fins (un par club, un par compétition) : deux
+réservations concurrentes ne peuvent plus passer toutes les deux les
+validations puis survendre une compétition ou rendre négatif le solde d'un
+club, sans pour autant sérialiser les réservations indépendantes.
+"""
+import threading
+from contextlib import ExitStack
+from datetime import datetime
+
+from ledger import BookingLedger
+
+# Coût d'une place en points
+POINTS_PER_PLACE = 3
+
+# Nombre maximum de places par réservation
+MAX_PLACES_PER_BOOKING = 12
+
+# Motifs de refus d'une réservation
+PAST_COMPETITION = 'past_competition'
+TOO_MANY_PLACES = 'too_many_places'
+INSUFFICIENT_POINTS = 'insufficient_points'
+NOT_ENOUGH_PLACES = 'not_enough_places'
+INVALID_PLACES = 'invalid_places'
+# Réservation groupée atomique annulée à cause d'une autre ligne refusée
+BATCH_ABORTED = 'batch_aborted'
+
+
+class BookingError(Exception):
+    """
+    Réservation refusée par une règle métier.
+
+    Attributes:
+        reason (str): Motif du refus (ex. `PAST_COMPETITION`)
+        message (str): Message destiné à l'utilisateur
+    """
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+
+
+def too_many_places():
+    """Refus d'une réservation au-delà de `MAX_PLACES_PER_BOOKING` places."""
+    return BookingError(
+        TOO_MANY_PLACES,
+        f'You cannot book more than {MAX_PLACES_PER_BOOKING} places per competition.')
+
+
+class BookingOutcome:
+    """
+    Résultat d'une ligne de réservation groupée.
+
+    Attributes:
+        competition (Competition): Compétition demandée
+        places (int): Nombre de places demandées
+        points_cost (int): Points déduits (0 si la ligne est refusée)
+        error (BookingError): Motif du refus, None si la ligne est appliquée
+    """
+
+    __slots__ = ('competition', 'places', 'points_cost', 'error')
+
+    def __init__(self, competition, places, points_cost=0, error=None):
+        self.competition = competition
+        self.places = places
+        self.points_cost = points_cost
+        self.error = error
+
+    @property
+    def ok(self):
+        """True si la ligne a été appliquée."""
+        return self.error is None
+
+
+class BookingEngine:
+    """
+    Effectue les réservations de manière atomique sur un `Store`.
+
+    Les verrous sont toujours acquis dans le même ordre (club puis
+    compétition) afin d'exclure tout interblocage.
+
+    Args:
+        store (Store): Dépôt des clubs et compétitions
+        clock (callable): Retourne l'instant courant (injectable pour les tests)
+        backend: Backend de stockage optionnel (voir backends.py) qui
+            enregistre chaque réservation ; sans backend, seule la mémoire
+            est modifiée
+        ledger (BookingLedger): Registre des réservations (un nouveau,
+            abonné au dépôt, par défaut)
+    """
+
+    # Nombre de tentatives quand l'état partagé a changé entre la validation
+    # et l'écriture (backend partagé entre processus)
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, store, clock=datetime.now, backend=None, ledger=None):
+        self.store = store
+        self.clock = clock
+        self.backend = backend
+        self.ledger = ledger if ledger is not None else BookingLedger(store)
+        self._club_locks = {}
+        self._competition_locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, locks, name):
+        lock = locks.get(name)
+        if lock is None:
+            with self._locks_guard:
+                lock = locks.setdefault(name, threading.Lock())
+        return lock
+
+    def book(self, club, competition, places):
+        """
+        Valide puis applique une réservation en une seule opération atomique.
+
+        Args:
+            club (Club): Club présent dans le dépôt
+            competition (Competition): Compétition présente dans le dépôt
+            places (int): Nombre de places demandées
+
+        Returns:
+            int: Nombre de points déduits
+
+        Raises:
+            BookingError: Si une règle métier refuse la réservation
+        """
+        with self._lock_for(self._club_locks, club.name), \
+                self._lock_for(self._competition_locks, competition.name):
+            for _ in range(self.MAX_ATTEMPTS):
+                points_cost = self.validate(club, competition, places)
+                committed = self._commit(club, competition, places, points_cost)
+                if committed is not None:
+                    points, number_of_places = committed
+                    self.store.update_competition(competition, number_of_places=number_of_places)
+                    self.store.update_club(club, points=points)
+                    self.ledger.record(club.name, competition.name, places, points_cost,
+                                       self.clock())
+                    self._journal(club, [(competition, places)])
+                    return points_cost
+                # Un autre processus a modifié l'état partagé : resynchroniser
+                # puis revalider pour renvoyer le motif exact du refus
+                self._refresh(club, competition)
+            raise BookingError(NOT_ENOUGH_PLACES, 'Not enough places available.')
+
+    def book_many(self, club, requests, atomic=True):
+        """
+        Valide puis applique plusieurs réservations d'un même club.
+
+        Les verrous sont acquis une seule fois : club puis compétitions triées
+        par nom. Les règles sont vérifiées en une passe sur des compteurs
+        cumulés (deux lignes pour une même compétition consomment les mêmes
+        places et les mêmes points, et ensemble au plus
+        `MAX_PLACES_PER_BOOKING` places), dans les deux modes.
+
+        Args:
+            club (Club): Club présent dans le dépôt
+            requests (list): Couples `(Competition, places)`
+            atomic (bool): Tout ou rien si True ; sinon chaque ligne valide
+                est appliquée et les autres sont refusées individuellement
+
+        Returns:
+            list: Un `BookingOutcome` par ligne, dans l'ordre de `requests`
+        """
+        if not atomic:
+            return self._book_partial(club, requests)
+
+        competitions = {competition.name: competition for competition, _ in requests}
+        with ExitStack() as stack:
+            stack.enter_context(self._lock_for(self._club_locks, club.name))
+            for name in sorted(competitions):
+                stack.enter_context(self._lock_for(self._competition_locks, name))
+
+            for _ in range(self.MAX_ATTEMPTS):
+                outcomes = self._validate_many(club, requests)
+                if not all(outcome.ok for outcome in outcomes):
+                    return outcomes
+                committed = self._commit_many(club, outcomes)
+                if committed is not None:
+                    points, places_left = committed
+                    for name, number_of_places in places_left.items():
+                        self.store.update_competition(
+                            competitions[name], number_of_places=number_of_places)
+                    self.store.update_club(club, points=points)
+                    booked_at = self.clock()
+                    for outcome in outcomes:
+                        self.ledger.record(club.name, outcome.competition.name, outcome.places,
+                                           outcome.points_cost, booked_at)
+                    self._journal(club, [(o.competition, o.places) for o in outcomes])
+                    return outcomes
+                for competition in competitions.values():
+                    self._refresh(club, competition)
+            error = BookingError(NOT_ENOUGH_PLACES, 'Not enough places available.')
+            return [BookingOutcome(competition, places, error=error)
+                    for competition, places in requests]
+
+    def _book_partial(self, club, requests):
+        # Places déjà réservées par les lignes précédentes, par compétition
+        requested = {}
+        outcomes = []
+        for competition, places in requests:
+            already = requested.get(competition.name, 0)
+            if places > 0 and already + places > MAX_PLACES_PER_BOOKING:
+                outcome = BookingOutcome(competition, places, error=too_many_places())
+            else:
+                outcome = self._book_one(club, competition, places)
+            if outcome.ok:
+                requested[competition.name] = already + places
+            outcomes.append(outcome)
+        return outcomes
+
+    def _book_one(self, club, competition, places):
+        try:
+            return BookingOutcome(competition, places, self.book(club, competition, places))
+        except BookingError as error:
+            return BookingOutcome(competition, places, error=error)
+
+    def _validate_many(self, club, requests):
+        club_points = club.points
+        available = {}
+        requested = {}
+        outcomes = []
+        for competition, places in requests:
+            places_left = available.get(competition.name, competition.number_of_places)
+            already = requested.get(competition.name, 0)
+            try:
+                points_cost = self._check(competition, places, club_points, places_left, already)
+            except BookingError as error:
+                outcomes.append(BookingOutcome(competition, places, error=error))
+                continue
+            club_points -= points_cost
+            available[competition.name] = places_left - places
+            requested[competition.name] = already + places
+            outcomes.append(BookingOutcome(competition, places, points_cost))
+
+        if not all(outcome.ok for outcome in outcomes):
+            aborted = BookingError(
+                BATCH_ABORTED, 'Not booked: another booking in the request was refused.')
+            for outcome in outcomes:
+                if outcome.ok:
+                    outcome.points_cost, outcome.error = 0, aborted
+        return outcomes
+
+    def _commit_many(self, club, outcomes):
+        if self.backend is None:
+            places_left = {}
+            for outcome in outcomes:
+                name = outcome.competition.name
+                places_left[name] = places_left.get(
+                    name, outcome.competition.number_of_places) - outcome.places
+            return club.points - sum(o.points_cost for o in outcomes), places_left
+        return self.backend.commit_bookings(
+            club, [(o.competition, o.places, o.points_cost) for o in outcomes])
+
+    def synchronize(self):
+        """
+        Applique au dépôt les réservations faites par d'autres processus.
+
+        Sans effet si le backend n'est pas partagé. Chaque compteur est relu
+        sous le verrou de son club ou de sa compétition, pour ne pas écraser
+        une réservation locale en cours avec une valeur périmée.
+
+        Returns:
+            int: Nombre de clubs et compétitions relus
+        """
+        if self.backend is None or not self.backend.shared:
+            return 0
+        club_names, competition_names, pairs = self.backend.changes()
+        if club_names is None:
+            # Trop de retard sur le flux des modifications : tout relire
+            club_names = [club.name for club in self.store.clubs]
+            competition_names = [competition.name for competition in self.store.competitions]
+            self.ledger.restore(self.backend.load_bookings())
+            pairs = ()
+        for club_name, competition_name in pairs:
+            with self._lock_for(self._club_locks, club_name), \
+                    self._lock_for(self._competition_locks, competition_name):
+                self.ledger.set_total(club_name, competition_name,
+                                      self.backend.booked_places(club_name, competition_name))
+        for name in club_names:
+            club = self.store.get_club_by_name(name)
+            if club is not None:
+                with self._lock_for(self._club_locks, name):
+                    self.backend.refresh(self.store, club, None)
+        for name in competition_names:
+            competition = self.store.get_competition_by_name(name)
+            if competition is not None:
+                with self._lock_for(self._competition_locks, name):
+                    self.backend.refresh(self.store, None, competition)
+        return len(club_names) + len(competition_names)
+
+    def _refresh(self, club, competition):
+        self.backend.refresh(self.store, club, competition)
+        self.ledger.set_total(club.name, competition.name,
+                              self.backend.booked_places(club.name, competition.name))
+
+    def _journal(self, club, bookings):
+        # Après l'application au dépôt et au registre, toujours sous les
+        # verrous : un snapshot pris après la journalisation inclut la réservation
+        if self.backend is not None:
+            self.backend.journal_bookings(club, bookings)
+
+    def _commit(self, club, competition, places, points_cost):
+        if self.backend is None:
+            return club.points - points_cost, competition.number_of_places - places
+        return self.backend.commit_booking(club, competition, places, points_cost)
+
+    def validate(self, club, competition, places):
+        """
+        Vérifie les règles métier sans rien modifier.
+
+        Returns:
+            int: Coût de la réservation en points
+
+        Raises:
+            BookingError: Si une règle métier refuse la réservation
+        """
+        return self._check(competition, places, club.points, competition.number_of_places)
+
+    def _check(self, competition, places, club_points, available_places, requested=0):
+        points_cost = places * POINTS_PER_PLACE
+
+        # Validation 1 : vérifier que la compétition est dans le futur
+        if competition.date < self.clock():
+            raise BookingError(PAST_COMPETITION, 'Cannot book places for past competitions.')
+
+        # Validation 2 : maximum 12 places par réservation (`requested` : places
+        # des lignes précédentes de la même réservation groupée)
+        if requested + places > MAX_PLACES_PER_BOOKING:
+            raise too_many_places()
+
+        if places <= 0:
+            raise BookingError(INVALID_PLACES, 'Number of places must be positive.')
+
+        # Validation 3 : vérifier que le club a assez de points
+        if points_cost > club_points:
+            raise BookingError(
+                INSUFFICIENT_POINTS,
+                f'Not enough points. You need {points_cost} points but only have {club_points}.')
+
+        # Validation 4 : ne pas vendre plus de places qu'il n'en reste
+        if places > available_places:
+            raise BookingError(NOT_ENOUGH_PLACES, 'Not enough places available.')
+
+        return points_cost
@@ -0,0 +1,140 @@
+"""
+Cache des pages rendues (leaderboard, tableau de bord).
+
+Les clés de cache contiennent des numéros de version des données : une
+réservation incrémente la version des compétitions, celle de l'ensemble des
+clubs et celle du club concerné, ce qui rend obsolètes les seules entrées
+affectées sans invalidation explicite. Les entrées obsolètes finissent par
+être évincées (LRU).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from store import StoreListener
+
+
+class DataVersions(StoreListener):
+    """
+    Numéros de version des données, incrémentés à chaque mutation du dépôt.
+
+    Attributes:
+        clubs (int): Version de l'ensemble des clubs (leaderboard)
+        competitions (int): Version de l'ensemble des compétitions
+    """
+
+    def __init__(self, store):
+        self._lock = threading.Lock()
+        self.clubs = 0
+        self.competitions = 0
+        self._per_club = {}
+        store.add_listener(self)
+
+    def club(self, name):
+        """Version d'un club (points affichés sur son tableau de bord)."""
+        return self._per_club.get(name, 0)
+
+    def _bump_club(self, name):
+        with self._lock:
+            self.clubs += 1
+            self._per_club[name] = self._per_club.get(name, 0) + 1
+
+    def _bump_competitions(self):
+        with self._lock:
+            self.competitions += 1
+
+    def reset(self, store):
+        with self._lock:
+            self.clubs += 1
+            self.competitions += 1
+            # Les versions par club restent croissantes : un club rechargé ne
+            # doit pas retrouver une ancienne clé encore en cache
+            for name in self._per_club:
+                self._per_club[name] += 1
+
+    def club_added(self, club):
+        self._bump_club(club.name)
+
+    def club_removed(self, club):
+        self._bump_club(club.name)
+
+    def club_updated(self, club, previous):
+        self._bump_club(previous.get('name', club.name))
+        self._bump_club(club.name)
+
+    def competition_added(self, competition):
+        self._bump_competitions()
+
+    def competition_removed(self, competition):
+        self._bump_competitions()
+
+    def competition_updated(self, competition, previous):
+        self._bump_competitions()
+
+
+class CachedPage:
+    """Page rendue : corps encodé et ETag calculé une seule fois."""
+
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def _encode(body):
+    return body if isinstance(body, bytes) else body.encode()
+
+
+class RenderCache:
+    """
+    Cache LRU borné de pages rendues.
+
+    Args:
+        max_entries (int): Nombre maximum d'entrées (0 désactive le cache)
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_render(self, key, render):
+        """
+        Retourne la page en cache pour `key`, ou la rend et la met en cache.
+
+        Args:
+            key (tuple): Clé incluant les versions des données affichées
+            render (callable): Produit le corps (str ou bytes) en cas d'absence
+
+        Returns:
+            CachedPage: Page rendue
+        """
+        if self.max_entries <= 0:
+            return CachedPage(_encode(render()))
+        with self._lock:
+            page = self._entries.get(key)
+            if page is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return page
+            self.misses += 1
+        # Rendu hors verrou : deux rendus concurrents de la même clé sont
+        # équivalents, le dernier arrivé remplace simplement l'autre
+        page = CachedPage(_encode(render()))
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return page
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,92 @@
+"""
+Configuration de l'application GUDLFT.
+
+Chaque valeur peut être surchargée par une variable d'environnement préfixée
+par `GUDLFT_`.
+"""
+import os
+
+
+class Config:
+    """Configuration par défaut (chargée via `app.config.from_object`)."""
+
+    SECRET_KEY = os.environ.get('GUDLFT_SECRET_KEY', 'something_special')
+
+    # Backend de stockage : 'json' (défaut) ou 'sqlite' (partagé entre processus)
+    STORAGE_BACKEND = os.environ.get('GUDLFT_STORAGE_BACKEND', 'json')
+    SQLITE_PATH = os.environ.get('GUDLFT_SQLITE_PATH', 'gudlft.db')
+    # Période de relecture des réservations des autres processus quand le
+    # backend est partagé (secondes, 0 désactive)
+    SYNC_INTERVAL = float(os.environ.get('GUDLFT_SYNC_INTERVAL', '0.5'))
+
+    # Fichiers de données (snapshots JSON, source initiale du backend SQLite)
+    CLUBS_FILE = os.environ.get('GUDLFT_CLUBS_FILE', 'clubs.json')
+    COMPETITIONS_FILE = os.environ.get('GUDLFT_COMPETITIONS_FILE', 'competitions.json')
+
+    # Journal des réservations : désactivé tant qu'aucun répertoire n'est fourni
+    WAL_DIR = os.environ.get('GUDLFT_WAL_DIR')
+    # Délai de regroupement des fsync du journal (secondes)
+    WAL_FLUSH_INTERVAL = float(os.environ.get('GUDLFT_WAL_FLUSH_INTERVAL', '0.005'))
+    # Nombre de réservations entre deux compactions dans les snapshots JSON
+    WAL_COMPACT_EVERY = int(os.environ.get('GUDLFT_WAL_COMPACT_EVERY', '1000'))
+
+    # Pagination du leaderboard
+    LEADERBOARD_PER_PAGE = int(os.environ.get('GUDLFT_LEADERBOARD_PER_PAGE', '50'))
+    LEADERBOARD_MAX_PER_PAGE = int(os.environ.get('GUDLFT_LEADERBOARD_MAX_PER_PAGE', '500'))
+
+    # Compétitions à venir par page du tableau de bord
+    WELCOME_PER_PAGE = int(os.environ.get('GUDLFT_WELCOME_PER_PAGE', '20'))
+    # Taille de page maximale de la liste des compétitions de l'API
+    COMPETITIONS_MAX_PER_PAGE = int(os.environ.get('GUDLFT_COMPETITIONS_MAX_PER_PAGE', '500'))
+
+    # Nombre maximum de pages rendues en cache (0 désactive le cache)
+    RENDER_CACHE_SIZE = int(os.environ.get('GUDLFT_RENDER_CACHE_SIZE', '1024'))
+
+    # Réservations idempotentes (voir idempotency.py) : durée de conservation
+    # des réponses (secondes) et nombre maximum de clés gardées
+    IDEMPOTENCY_TTL = float(os.environ.get('GUDLFT_IDEMPOTENCY_TTL', '3600'))
+    IDEMPOTENCY_MAX_KEYS = int(os.environ.get('GUDLFT_IDEMPOTENCY_MAX_KEYS', '10000'))
+
+    # Limitation de débit par IP, email et club (voir ratelimit.py) : jetons
+    # rechargés par seconde (0, le défaut, désactive : les tests de charge
+    # partent d'une seule IP), capacité d'un seau et nombre maximum de seaux
+    # gardés en mémoire
+    RATE_LIMIT_RATE = float(os.environ.get('GUDLFT_RATE_LIMIT_RATE', '0'))
+    RATE_LIMIT_BURST = int(os.environ.get('GUDLFT_RATE_LIMIT_BURST', '20'))
+    RATE_LIMIT_MAX_KEYS = int(os.environ.get('GUDLFT_RATE_LIMIT_MAX_KEYS', '100000'))
+
+    # Taux de faux positifs visé par le filtre de Bloom des emails qui écarte
+    # les connexions avec un email inconnu (voir bloom.py)
+    EMAIL_FILTER_ERROR_RATE = float(os.environ.get('GUDLFT_EMAIL_FILTER_ERROR_RATE', '0.01'))
+
+    # Contrôle d'admission des réservations (voir admission.py) : requêtes
+    # traitées simultanément (0 désactive), tickets en file au maximum et
+    # délai d'abandon d'un ticket non représenté (secondes)
+    ADMISSION_MAX_ACTIVE = int(os.environ.get('GUDLFT_ADMISSION_MAX_ACTIVE', '64'))
+    ADMISSION_MAX_QUEUE = int(os.environ.get('GUDLFT_ADMISSION_MAX_QUEUE', '1000'))
+    ADMISSION_TICKET_TTL = float(os.environ.get('GUDLFT_ADMISSION_TICKET_TTL', '30'))
+
+    # Chargement des données : 'background' (préchauffage dans un thread au
+    # démarrage), 'lazy' (à la première requête) ou 'eager' (dans create_app)
+    DATA_LOADING = os.environ.get('GUDLFT_DATA_LOADING', 'background')
+
+    # Taille du pool de threads qui sert les routes HTML en mode ASGI (asgi.py)
+    ASGI_THREADS = int(os.environ.get('GUDLFT_ASGI_THREADS', '32'))
+
+    # Diffusion en direct (/events) : délai minimal entre deux publications et
+    # période des messages de maintien de connexion (secondes)
+    EVENTS_INTERVAL = float(os.environ.get('GUDLFT_EVENTS_INTERVAL', '0.25'))
+    EVENTS_HEARTBEAT = float(os.environ.get('GUDLFT_EVENTS_HEARTBEAT', '15'))
+
+    # Instrumentation et endpoint /metrics (Prometheus) ; désactivée, rien
+    # n'est installé
+    METRICS_ENABLED = os.environ.get('GUDLFT_METRICS_ENABLED', '0') == '1'
+
+    # Profilage échantillonné (voir profiling.py) : le middleware n'est
+    # installé que si PROFILING_DIR est défini, puis se pilote à chaud par
+    # le fichier de contrôle
+    PROFILING_DIR = os.environ.get('GUDLFT_PROFILING_DIR', '')
+    PROFILING_ENABLED = os.environ.get('GUDLFT_PROFILING_ENABLED', '0') == '1'
+    PROFILING_SAMPLE_RATE = float(os.environ.get('GUDLFT_PROFILING_SAMPLE_RATE', '0.01'))
+    # Durée minimale (secondes) d'une requête profilée pour garder son profil
+    PROFILING_THRESHOLD = float(os.environ.get('GUDLFT_PROFILING_THRESHOLD', '0'))
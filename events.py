@@ -0,0 +1,164 @@
+"""
+Diffusion en temps réel des places restantes et des points (Server-Sent Events).
+
+Le diffuseur est abonné aux mutations du dépôt : chaque réservation, quelle que
+soit sa route (formulaire, API, réservation groupée, autre worker synchronisé),
+met à jour un lot de modifications en attente qui ne garde que la dernière
+valeur de chaque compteur. Un thread publie ce lot au plus une fois par
+intervalle : cent réservations par seconde sur une même compétition ne
+produisent qu'un message par intervalle et par client.
+
+Chaque abonné fusionne à son tour les lots qu'il n'a pas encore consommés :
+un client lent ne fait pas grossir de file, il reçoit simplement l'état le
+plus récent lorsqu'il lit.
+"""
+import json
+import threading
+import time
+
+from store import StoreListener
+
+
+def format_event(batch):
+    """
+    Encode un lot de modifications en événement SSE.
+
+    Args:
+        batch (dict): `{"clubs": {nom: points}, "competitions": {nom: places}}`
+
+    Returns:
+        bytes: Événement `availability` prêt à écrire sur le flux
+    """
+    data = json.dumps(batch, separators=(',', ':'), ensure_ascii=False)
+    return f'event: availability\ndata: {data}\n\n'.encode()
+
+
+# Commentaire SSE envoyé périodiquement pour garder la connexion ouverte
+KEEPALIVE = b': keepalive\n\n'
+
+
+def _empty_batch():
+    return {'clubs': {}, 'competitions': {}}
+
+
+class Subscription:
+    """
+    Abonnement d'un client : modifications fusionnées en attente de lecture.
+
+    Args:
+        wakeup (callable): Appelé (depuis le thread de publication) quand de
+            nouvelles modifications sont disponibles
+    """
+
+    def __init__(self, wakeup):
+        self._wakeup = wakeup
+        self._lock = threading.Lock()
+        self._pending = _empty_batch()
+
+    def push(self, batch):
+        with self._lock:
+            for kind, values in batch.items():
+                self._pending[kind].update(values)
+        self._wakeup()
+
+    def take(self):
+        """
+        Retourne et vide les modifications en attente.
+
+        Returns:
+            dict: Lot fusionné, ou None s'il n'y a rien de nouveau
+        """
+        with self._lock:
+            batch, self._pending = self._pending, _empty_batch()
+        return batch if batch['clubs'] or batch['competitions'] else None
+
+
+class EventBroadcaster(StoreListener):
+    """
+    Regroupe les modifications de points et de places et les publie aux abonnés.
+
+    Args:
+        store (Store): Dépôt observé
+        interval (float): Délai minimal entre deux publications (secondes)
+    """
+
+    def __init__(self, store, interval=0.25):
+        self.interval = interval
+        self.published = 0
+        self._lock = threading.Lock()
+        self._pending = _empty_batch()
+        self._subscribers = set()
+        self._dirty = threading.Event()
+        self._thread = None
+        store.add_listener(self)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def subscribe(self, wakeup):
+        """
+        Enregistre un client.
+
+        Args:
+            wakeup (callable): Voir `Subscription`
+
+        Returns:
+            Subscription: Abonnement à passer à `unsubscribe`
+        """
+        subscription = Subscription(wakeup)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='events-publisher', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Retire un client (connexion fermée)."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def club_updated(self, club, previous):
+        if 'points' in previous:
+            self._record('clubs', club.name, club.points)
+
+    def competition_updated(self, competition, previous):
+        if 'number_of_places' in previous:
+            self._record('competitions', competition.name, competition.number_of_places)
+
+    def _record(self, kind, name, value):
+        with self._lock:
+            if not self._subscribers:
+                return
+            self._pending[kind][name] = value
+        self._dirty.set()
+
+    def flush(self):
+        """
+        Publie immédiatement les modifications en attente.
+
+        Returns:
+            int: Nombre d'abonnés notifiés
+        """
+        with self._lock:
+            self._dirty.clear()
+            batch, self._pending = self._pending, _empty_batch()
+            subscribers = list(self._subscribers)
+        if not (batch['clubs'] or batch['competitions']):
+            return 0
+        for subscription in subscribers:
+            try:
+                subscription.push(batch)
+            except RuntimeError:
+                # Boucle d'événements du client déjà fermée
+                self.unsubscribe(subscription)
+        self.published += 1
+        return len(subscribers)
+
+    def _run(self):
+        while True:
+            self._dirty.wait()
+            # Laisser la rafale s'accumuler avant de publier
+            time.sleep(self.interval)
+            self.flush()
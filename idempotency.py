@@ -0,0 +1,158 @@
+"""
+Requêtes de réservation idempotentes (clé `Idempotency-Key`).
+
+Un client qui renvoie une réservation (réseau mobile instable, double clic)
+joint la même clé à chaque tentative : en-tête `Idempotency-Key` pour l'API,
+champ caché `idempotency_key` pour le formulaire de réservation. La première
+requête est exécutée et sa réponse conservée ; les suivantes reçoivent cette
+réponse sans repasser par la validation ni par la déduction des points et des
+places. Une tentative qui arrive pendant l'exécution de la première attend
+son résultat au lieu de réserver une seconde fois.
+
+Les réponses sont gardées `ttl` secondes, dans la limite de `max_entries`
+(les moins récemment utilisées sont évincées d'abord, en temps constant).
+Les requêtes en cours sont suivies à part et ne sont jamais évincées. Le
+cache est propre à chaque processus et vidé quand le contenu du dépôt est
+remplacé.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from store import StoreListener
+
+# En-tête (API) et champ de formulaire (pages HTML) portant la clé
+HEADER = 'Idempotency-Key'
+FORM_FIELD = 'idempotency_key'
+# Longueur maximale d'une clé (un UUID en fait 36)
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    """La clé a déjà servi pour une requête différente."""
+
+
+class IdempotencyTimeout(Exception):
+    """La requête d'origine est toujours en cours d'exécution."""
+
+
+def fingerprint(*parts):
+    """Empreinte d'une requête (chemin, corps...) associée à sa clé."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b'\0')
+    return digest.digest()
+
+
+class _Entry:
+    __slots__ = ('fingerprint', 'expires', 'result', 'done')
+
+    def __init__(self, request_fingerprint, expires):
+        self.fingerprint = request_fingerprint
+        self.expires = expires
+        self.result = None
+        self.done = threading.Event()
+
+
+class IdempotencyCache(StoreListener):
+    """
+    Réponses des requêtes récentes, indexées par clé d'idempotence.
+
+    Args:
+        store (Store): Dépôt observé
+        max_entries (int): Nombre maximum de réponses conservées
+        ttl (float): Durée de conservation d'une réponse (secondes)
+        wait_timeout (float): Attente maximale d'une requête d'origine en cours
+        clock (callable): Horloge monotone (injectable pour les tests)
+    """
+
+    def __init__(self, store, max_entries=10000, ttl=3600.0, wait_timeout=10.0,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # Réponses conservées, de la moins à la plus récemment utilisée
+        self._entries = OrderedDict()
+        # Requêtes en cours d'exécution, hors de l'ordre d'éviction
+        self._pending = {}
+        self._lock = threading.Lock()
+        store.add_listener(self)
+
+    def __len__(self):
+        return len(self._entries) + len(self._pending)
+
+    def reset(self, store):
+        # Les réponses conservées décrivent l'ancien contenu du dépôt
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+    def execute(self, key, request_fingerprint, produce):
+        """
+        Exécute `produce` une seule fois par clé et retourne son résultat.
+
+        Args:
+            key (Hashable): Clé d'idempotence (portée incluse, ex. chemin + clé)
+            request_fingerprint (bytes): Empreinte de la requête (voir `fingerprint`)
+            produce (callable): Exécute la requête et retourne la réponse à conserver
+
+        Returns:
+            object: Réponse de la première exécution
+
+        Raises:
+            IdempotencyConflict: Si la clé a servi pour une autre requête
+            IdempotencyTimeout: Si la requête d'origine n'a pas fini à temps
+        """
+        while True:
+            now = self.clock()
+            with self._lock:
+                entry = self._pending.get(key)
+                owner = False
+                if entry is None:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry.expires <= now:
+                        del self._entries[key]
+                        entry = None
+                    if entry is None:
+                        entry = self._pending[key] = _Entry(request_fingerprint, now + self.ttl)
+                        self.misses += 1
+                        owner = True
+                    else:
+                        self._entries.move_to_end(key)
+            if entry.fingerprint != request_fingerprint:
+                raise IdempotencyConflict(key)
+            if owner:
+                return self._produce(key, entry, produce)
+            if not entry.done.wait(self.wait_timeout):
+                raise IdempotencyTimeout(key)
+            if entry.result is not None:
+                with self._lock:
+                    self.hits += 1
+                return entry.result
+            # La requête d'origine a échoué sans réponse : nouvelle tentative
+
+    def _produce(self, key, entry, produce):
+        try:
+            entry.result = produce()
+        except BaseException:
+            # Rien à rejouer : la clé redevient libre pour une nouvelle tentative
+            with self._lock:
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+            raise
+        finally:
+            entry.done.set()
+        with self._lock:
+            # Absente si le cache a été vidé entre-temps (rechargement du dépôt)
+            if self._pending.get(key) is entry:
+                del self._pending[key]
+                self._entries[key] = entry
+                # Au plus une éviction par réponse ajoutée
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry.result
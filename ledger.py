@@ -0,0 +1,170 @@
+"""
+Registre des réservations et totaux par club et par compétition.
+
+Chaque réservation confirmée est ajoutée au registre (ajout seul) et met à
+jour trois totaux de places : par couple (club, compétition), par club et par
+compétition. Savoir combien de places un club a prises pour une compétition,
+ou le taux de remplissage d'une compétition, coûte une lecture de
+dictionnaire, sans parcourir l'historique.
+
+Les totaux survivent aux redémarrages via le backend (journal JSON ou table
+`bookings` de SQLite, voir backends.py). En mémoire, seules les
+`max_entries` dernières entrées du processus courant sont conservées : le
+registre ne grossit pas avec le nombre de réservations. L'historique complet
+n'est durable qu'avec le backend SQLite (table `bookings`, en ajout seul).
+"""
+import threading
+from collections import deque
+from datetime import datetime
+
+from store import StoreListener
+
+
+class LedgerEntry:
+    """
+    Réservation confirmée.
+
+    Attributes:
+        sequence (int): Rang dans le registre, à partir de 1
+        club (str): Nom du club
+        competition (str): Nom de la compétition
+        places (int): Places réservées
+        points_cost (int): Points déduits
+        booked_at (datetime): Instant de la réservation
+    """
+
+    __slots__ = ('sequence', 'club', 'competition', 'places', 'points_cost', 'booked_at')
+
+    def __init__(self, sequence, club, competition, places, points_cost, booked_at):
+        self.sequence = sequence
+        self.club = club
+        self.competition = competition
+        self.places = places
+        self.points_cost = points_cost
+        self.booked_at = booked_at
+
+    def __repr__(self):
+        return (f'LedgerEntry(sequence={self.sequence}, club={self.club!r}, '
+                f'competition={self.competition!r}, places={self.places})')
+
+
+class BookingLedger(StoreListener):
+    """
+    Registre en ajout seul et totaux de places réservées.
+
+    Vidé quand le contenu du dépôt est remplacé : les totaux persistés sont
+    alors rechargés par `restore` (voir loading.py).
+
+    Args:
+        store (Store): Dépôt observé
+        max_entries (int): Nombre d'entrées récentes conservées en mémoire
+    """
+
+    def __init__(self, store, max_entries=10000):
+        self._lock = threading.Lock()
+        # Les entrées les plus anciennes sont évincées ; les totaux, eux,
+        # couvrent toutes les réservations
+        self._entries = deque(maxlen=max_entries)
+        self._sequence = 0
+        self._by_pair = {}
+        self._by_club = {}
+        self._by_competition = {}
+        store.add_listener(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def reset(self, store):
+        with self._lock:
+            self._entries.clear()
+            self._sequence = 0
+            self._clear_totals()
+
+    def _clear_totals(self):
+        self._by_pair.clear()
+        self._by_club.clear()
+        self._by_competition.clear()
+
+    def _add(self, club, competition, places):
+        key = (club, competition)
+        self._by_pair[key] = self._by_pair.get(key, 0) + places
+        self._by_club[club] = self._by_club.get(club, 0) + places
+        self._by_competition[competition] = self._by_competition.get(competition, 0) + places
+
+    def record(self, club, competition, places, points_cost, booked_at=None):
+        """
+        Ajoute une réservation confirmée.
+
+        Appelé par le moteur de réservation sous les verrous du club et de la
+        compétition.
+
+        Returns:
+            LedgerEntry: Entrée ajoutée
+        """
+        with self._lock:
+            self._sequence += 1
+            entry = LedgerEntry(self._sequence, club, competition, places, points_cost,
+                                booked_at or datetime.now())
+            self._entries.append(entry)
+            self._add(club, competition, places)
+        return entry
+
+    def restore(self, totals):
+        """
+        Remplace les totaux par des totaux persistés.
+
+        Args:
+            totals (dict): `{(club, compétition): places}`
+        """
+        with self._lock:
+            self._clear_totals()
+            for (club, competition), places in totals.items():
+                self._add(club, competition, places)
+
+    def set_total(self, club, competition, places):
+        """
+        Aligne le total d'un couple sur une valeur relue (réservations d'un
+        autre processus sur un backend partagé).
+        """
+        with self._lock:
+            delta = places - self._by_pair.get((club, competition), 0)
+            if delta:
+                self._add(club, competition, delta)
+
+    def places_booked(self, club, competition):
+        """Places réservées par un club pour une compétition."""
+        return self._by_pair.get((club, competition), 0)
+
+    def club_places(self, club):
+        """Places réservées par un club, toutes compétitions confondues."""
+        return self._by_club.get(club, 0)
+
+    def competition_places(self, competition):
+        """Places réservées pour une compétition, tous clubs confondus."""
+        return self._by_competition.get(competition, 0)
+
+    def fill_rate(self, competition):
+        """
+        Part des places de la compétition prises via le registre.
+
+        La capacité est reconstituée comme places réservées + places restantes.
+
+        Args:
+            competition (Competition): Compétition du dépôt
+
+        Returns:
+            float: Taux entre 0 et 1
+        """
+        booked = self.competition_places(competition.name)
+        capacity = booked + competition.number_of_places
+        return booked / capacity if capacity else 0.0
+
+    def totals(self):
+        """Copie des totaux par couple `{(club, compétition): places}`."""
+        with self._lock:
+            return dict(self._by_pair)
+
+    def entries(self):
+        """Copie des entrées conservées, dans l'ordre des réservations."""
+        with self._lock:
+            return list(self._entries)
@@ -0,0 +1,112 @@
+"""
+Chargement incrémental des fichiers de clubs et de compétitions.
+
+Au lieu d'un `json.load` du fichier entier (qui matérialise d'abord tout le
+document sous forme de dictionnaires), les enregistrements sont lus par blocs
+et décodés un par un, puis convertis immédiatement en modèles : le pic
+mémoire reste proche de la taille finale des données.
+
+Deux formats sont acceptés :
+
+- le format historique `{"clubs": [{...}, {...}]}` ;
+- le JSON délimité par lignes (extension `.ndjson` ou `.jsonl`), un
+  enregistrement par ligne.
+"""
+import json
+import re
+
+# Taille des blocs lus sur disque
+CHUNK_SIZE = 64 * 1024
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+_WHITESPACE = re.compile(r'[\s,]*')
+_decoder = json.JSONDecoder()
+
+
+def _iter_array_records(stream, key):
+    """Décode un à un les éléments du tableau `key` d'un document JSON."""
+    opening = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ''
+    eof = False
+
+    # Localiser le début du tableau
+    while True:
+        match = opening.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        if eof:
+            raise ValueError(f'Key "{key}" not found')
+        chunk = stream.read(CHUNK_SIZE)
+        eof = not chunk
+        # Conserver la fin du tampon : la clé peut être à cheval sur deux blocs
+        buffer = buffer[-len(key) - 256:] + chunk
+
+    position = 0
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            record, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Enregistrement incomplet : lire le bloc suivant
+            if eof:
+                raise
+            chunk = stream.read(CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield record
+        position = end
+
+
+def _iter_ndjson_records(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(path, key):
+    """
+    Itère sur les enregistrements d'un fichier de données, un par un.
+
+    Args:
+        path (str): Fichier JSON (`{"<key>": [...]}`) ou NDJSON
+        key (str): Clé du tableau d'enregistrements (`clubs`, `competitions`)
+
+    Yields:
+        dict: Enregistrement au format JSON
+    """
+    with open(path, encoding='utf-8') as stream:
+        if path.endswith(NDJSON_EXTENSIONS):
+            yield from _iter_ndjson_records(stream)
+        else:
+            yield from _iter_array_records(stream, key)
+
+
+def load_records(path, key, factory, progress=None, progress_every=100000):
+    """
+    Charge les enregistrements d'un fichier en les convertissant au fil de l'eau.
+
+    Args:
+        path (str): Fichier de données
+        key (str): Clé du tableau d'enregistrements
+        factory (callable): Convertit un enregistrement JSON (ex. `Club.from_dict`)
+        progress (callable): Appelé avec `(path, nombre chargé)` tous les
+            `progress_every` enregistrements puis une dernière fois à la fin
+        progress_every (int): Période des notifications de progression
+
+    Returns:
+        list: Enregistrements convertis
+    """
+    records = []
+    for count, record in enumerate(iter_records(path, key), start=1):
+        records.append(factory(record))
+        if progress is not None and count % progress_every == 0:
+            progress(path, count)
+    if progress is not None:
+        progress(path, len(records))
+    return records
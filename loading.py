@@ -0,0 +1,141 @@
+"""
+Chargement différé des données de l'application.
+
+Importer `server` ne charge plus les clubs et les compétitions : le backend
+de stockage est créé et les données chargées soit à la première requête qui
+en a besoin (mode `lazy`), soit dans un thread de préchauffage lancé au
+démarrage (mode `background`), soit immédiatement (mode `eager`). Le temps
+de démarrage d'un worker ne dépend donc plus de la taille des données, et
+`/ready` indique au répartiteur de charge quand elles sont disponibles.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from backends import create_backend
+
+LOADING_MODES = ('lazy', 'background', 'eager')
+
+logger = logging.getLogger(__name__)
+
+
+class DataLoader:
+    """
+    Charge une seule fois les données du backend configuré dans un `Store`.
+
+    Args:
+        store (Store): Dépôt à remplir
+        booking_engine (BookingEngine): Moteur auquel fournir le backend
+    """
+
+    def __init__(self, store, booking_engine):
+        self.store = store
+        self.booking_engine = booking_engine
+        self.config = None
+        self.progress = None
+        self.backend = None
+        self.error = None
+        self.load_seconds = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._sync_thread = None
+
+    def configure(self, config, progress=None):
+        """
+        Enregistre la configuration utilisée au moment du chargement.
+
+        Args:
+            config (dict): Configuration Flask (`app.config`)
+            progress (callable): Suivi du chargement (voir loaders.load_records)
+        """
+        if config['DATA_LOADING'] not in LOADING_MODES:
+            raise ValueError(f"Unknown data loading mode: {config['DATA_LOADING']}")
+        self.config = config
+        self.progress = progress
+
+    @property
+    def ready(self):
+        """True une fois les données chargées."""
+        return self._ready.is_set()
+
+    def get_backend(self):
+        """Retourne le backend de stockage, en le créant au premier appel."""
+        with self._lock:
+            if self.backend is None:
+                self.backend = create_backend(self.config, progress=self.progress)
+                atexit.register(self.backend.close)
+            return self.backend
+
+    def start_background(self):
+        """Lance le chargement dans un thread (sans effet s'il a déjà eu lieu)."""
+        with self._lock:
+            if self.ready or self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._load_quietly, name='data-warmup', daemon=True)
+            self._thread.start()
+
+    def ensure_loaded(self, timeout=None):
+        """
+        Garantit que les données sont chargées, en les chargeant si besoin.
+
+        Si un préchauffage est en cours, attend sa fin au lieu de charger une
+        seconde fois ; s'il a échoué, le chargement est retenté.
+
+        Args:
+            timeout (float): Attente maximale d'un préchauffage en cours
+
+        Raises:
+            RuntimeError: Si le préchauffage n'a pas abouti dans le délai
+        """
+        if self._ready.is_set():
+            return
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                raise RuntimeError('Data loading is still in progress')
+        self._load()
+
+    def _start_sync(self, interval):
+        # Backend partagé entre processus : relire périodiquement les
+        # réservations des autres workers pour que l'affichage reste à jour
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.booking_engine.synchronize()
+                except Exception:
+                    logger.exception('Synchronization with the shared backend failed')
+
+        self._sync_thread = threading.Thread(target=run, name='backend-sync', daemon=True)
+        self._sync_thread.start()
+
+    def _load_quietly(self):
+        try:
+            self._load()
+        except Exception:
+            # L'erreur est conservée dans self.error et exposée par /ready
+            pass
+
+    def _load(self):
+        try:
+            backend = self.get_backend()
+            with self._lock:
+                if self._ready.is_set():
+                    return
+                started = time.perf_counter()
+                self.store.load(backend.load_clubs(), backend.load_competitions())
+                self.booking_engine.ledger.restore(backend.load_bookings())
+                backend.attach(self.store, self.booking_engine.ledger)
+                self.booking_engine.backend = backend
+                self.load_seconds = time.perf_counter() - started
+                self.error = None
+                self._ready.set()
+            if backend.shared and self.config['SYNC_INTERVAL'] > 0:
+                self._start_sync(self.config['SYNC_INTERVAL'])
+        except Exception as error:
+            self.error = error
+            raise
@@ -9,10 +9,72 @@ Usage:
 
     Ou en mode headless :
     locust -f locustfile.py --host=http://127.0.0.1:5000 --users 10 --spawn-rate 2 --run-time 60s --html report_performance.html
+
+Les emails et les noms utilisés sont lus dans les mêmes fichiers que le
+serveur (GUDLFT_CLUBS_FILE, GUDLFT_COMPETITIONS_FILE) : lancer serveur et
+Locust sur un jeu généré (voir benchmarks/dataset.py) suffit pour tester à
+grande échelle. Au plus GUDLFT_LOCUST_MAX_CLUBS clubs (10 000 par défaut)
+sont gardés en mémoire, tirés au hasard dans tout le fichier.
 """
 
-from locust import HttpUser, task, between
+import logging
+import os
 import random
+import sys
+from datetime import datetime
+from urllib.parse import quote
+
+import requests
+from locust import HttpUser, task, between, events
+
+from loaders import iter_records
+from models import DATE_FORMAT
+
+CLUBS_FILE = os.environ.get('GUDLFT_CLUBS_FILE', 'clubs.json')
+COMPETITIONS_FILE = os.environ.get('GUDLFT_COMPETITIONS_FILE', 'competitions.json')
+MAX_CLUBS = int(os.environ.get('GUDLFT_LOCUST_MAX_CLUBS', '10000'))
+
+# Refus métier attendus : la requête a abouti, la réservation non
+EXPECTED_REFUSALS = (b"Not enough points", b"Not enough places", b"cannot book", b"Cannot book")
+
+
+def sample_clubs(path, limit):
+    """
+    Échantillon uniforme d'au plus `limit` clubs (échantillonnage par réservoir).
+
+    Returns:
+        list: Tuples (nom, email)
+    """
+    sample = []
+    for count, record in enumerate(iter_records(path, 'clubs')):
+        club = (record['name'], record['email'])
+        if count < limit:
+            sample.append(club)
+        else:
+            index = random.randint(0, count)
+            if index < limit:
+                sample[index] = club
+    return sample
+
+
+def load_competitions(path):
+    """
+    Noms des compétitions du fichier.
+
+    Returns:
+        tuple: (toutes les compétitions, compétitions à venir)
+    """
+    now = datetime.now()
+    names, upcoming = [], []
+    for record in iter_records(path, 'competitions'):
+        names.append(record['name'])
+        if datetime.strptime(record['date'], DATE_FORMAT) > now:
+            upcoming.append(record['name'])
+    return names, upcoming or names
+
+
+CLUBS = sample_clubs(CLUBS_FILE, MAX_CLUBS)
+COMPETITIONS, UPCOMING_COMPETITIONS = load_competitions(COMPETITIONS_FILE)
 
 
 class GudlftUser(HttpUser):
@@ -24,19 +86,14 @@ class GudlftUser(HttpUser):
     # Temps d'attente entre chaque tâche (entre 1 et 5 secondes)
     wait_time = between(1, 5)
 
-    # Emails des clubs disponibles
-    club_emails = [
-        "john@simplylift.co",
-        "admin@irontemple.com",
-        "kate@shelifts.co.uk"
-    ]
-
     def on_start(self):
         """
         Méthode appelée au démarrage de chaque utilisateur simulé
         """
-        # Choisir un email aléatoire pour cet utilisateur
-        self.email = random.choice(self.club_emails)
+        # Choisir un club aléatoire du jeu de données pour cet utilisateur
+        self.club, self.email = random.choice(CLUBS)
+        # Ticket de la file d'attente des réservations (voir admission.py)
+        self.ticket = ""
 
     @task(5)
     def view_homepage(self):
@@ -75,29 +132,31 @@ class GudlftUser(HttpUser):
             "email": self.email
         })
 
-        # Ensuite réserver des places (entre 1 et 5 places)
-        competitions = ["Spring Festival", "Fall Classic"]
-        clubs = ["Simply Lift", "Iron Temple", "She Lifts"]
-
+        # Ensuite réserver des places (entre 1 et 5) pour une compétition à venir
         places = random.randint(1, 5)
-        competition = random.choice(competitions)
-        club = random.choice(clubs)
+        competition = random.choice(UPCOMING_COMPETITIONS)
+        club = self.club
 
-        # Tenter la réservation
+        # Tenter la réservation (avec le ticket de la file d'attente s'il y en a un)
         with self.client.post(
             "/purchasePlaces",
             data={
                 "club": club,
                 "competition": competition,
-                "places": str(places)
+                "places": str(places),
+                "admission_ticket": self.ticket
             },
             catch_response=True
         ) as response:
+            self.ticket = response.headers.get("X-Admission-Ticket", "")
             # Vérifier si la réservation a réussi ou échoué proprement
-            if response.status_code == 200:
+            if response.status_code == 503 and "Retry-After" in response.headers:
+                # Surcharge : mis en file d'attente (voir admission.py), réponse attendue
+                response.success()
+            elif response.status_code == 200:
                 if b"Great-booking complete" in response.content:
                     response.success()
-                elif b"Not enough points" in response.content or b"cannot book" in response.content:
+                elif any(message in response.content for message in EXPECTED_REFUSALS):
                     # Échec attendu (validation métier), pas une erreur serveur
                     response.success()
                 else:
@@ -111,13 +170,11 @@ class GudlftUser(HttpUser):
         Tâche : accéder à la page de réservation directement
         Poids : 1 (moins fréquent)
         """
-        clubs = ["Simply%20Lift", "Iron%20Temple", "She%20Lifts"]
-        competitions = ["Spring%20Festival", "Fall%20Classic"]
+        club = quote(self.club)
+        competition = quote(random.choice(COMPETITIONS))
 
-        club = random.choice(clubs)
-        competition = random.choice(competitions)
-
-        self.client.get(f"/book/{competition}/{club}")
+        # Nom de requête commun : une seule ligne de statistiques pour la route
+        self.client.get(f"/book/{competition}/{club}", name="/book/[competition]/[club]")
 
     @task(1)
     def logout(self):
@@ -154,11 +211,12 @@ class InvalidEmailUser(HttpUser):
             data={"email": email},
             catch_response=True
         ) as response:
-            # L'email invalide devrait rediriger (302) ou retourner 200 avec message
-            if response.status_code in [200, 302]:
+            # L'email invalide devrait rediriger (302) ou retourner 200 avec message,
+            # ou être refusé (429) si la limitation de débit est activée
+            if response.status_code in [200, 302, 429]:
                 response.success()
             else:
-                response.failure(f"Expected 200 or 302, got {response.status_code}")
+                response.failure(f"Expected 200, 302 or 429, got {response.status_code}")
 
 
 class LeaderboardOnlyUser(HttpUser):
@@ -177,6 +235,157 @@ class LeaderboardOnlyUser(HttpUser):
         self.client.get("/leaderboard")
 
 
+# Scénario d'ouverture des inscriptions : tous les utilisateurs se ruent sur
+# une même compétition. À lancer seul pour que la vérification finale porte
+# uniquement sur ses réservations :
+# locust -f locustfile.py --host=http://127.0.0.1:5000 --headless \
+#        --users 500 --spawn-rate 500 --run-time 30s FlashCrowdUser
+# None si le fichier ne contient aucune compétition : le scénario est alors écarté
+FLASH_COMPETITION = (os.environ.get('GUDLFT_FLASH_COMPETITION')
+                     or next(iter(UPCOMING_COMPETITIONS), None))
+FLASH_MAX_PLACES = int(os.environ.get('GUDLFT_FLASH_MAX_PLACES', '3'))
+FLASH_REQUEST = "flash: POST /api/v1/bookings"
+
+
+class FlashCrowd:
+    """
+    Bilan des réservations du scénario, vérifié en fin de test.
+
+    Les utilisateurs Locust d'un processus sont des greenlets : les compteurs
+    sont mis à jour sans point de bascule, donc sans verrou.
+    """
+
+    def __init__(self):
+        self.initial_places = None
+        self.booked_places = 0
+        self.clubs = set()
+
+
+flash_crowd = FlashCrowd()
+
+
+def read_api(host, path):
+    """Lit un document de l'API JSON (hors statistiques Locust)."""
+    response = requests.get(f"{host}/api/v1/{path}", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+class FlashCrowdUser(HttpUser):
+    """
+    Secrétaire de club réservant dès l'ouverture des inscriptions.
+    Les réservations passent par l'API JSON pour distinguer sans ambiguïté
+    succès (201) et refus métier (422).
+    """
+
+    wait_time = between(0, 0.1)
+
+    def on_start(self):
+        """
+        Méthode appelée au démarrage de chaque utilisateur simulé
+        """
+        self.club, _ = random.choice(CLUBS)
+        self.ticket = ""
+
+    @task
+    def book_flash_competition(self):
+        """
+        Tâche : réserver 1 à FLASH_MAX_PLACES places sur la compétition visée
+        """
+        places = random.randint(1, FLASH_MAX_PLACES)
+        headers = {"X-Admission-Ticket": self.ticket} if self.ticket else {}
+        with self.client.post(
+            "/api/v1/bookings",
+            json={"club": self.club, "competition": FLASH_COMPETITION, "places": places},
+            headers=headers,
+            name=FLASH_REQUEST,
+            catch_response=True
+        ) as response:
+            self.ticket = response.headers.get("X-Admission-Ticket", "")
+            if response.status_code == 503 and "Retry-After" in response.headers:
+                # Mis en file d'attente par le contrôle d'admission : rien de réservé
+                response.success()
+            elif response.status_code == 201:
+                flash_crowd.booked_places += places
+                flash_crowd.clubs.add(self.club)
+                response.success()
+            elif response.status_code == 422:
+                # Refus attendu sous contention (plus de places, plus de points)
+                response.success()
+            else:
+                response.failure(f"Got status code {response.status_code}")
+
+
+def flash_crowd_selected(environment):
+    """Le scénario de ruée fait-il partie du test en cours ?"""
+    return FlashCrowdUser in environment.user_classes
+
+
+@events.init.add_listener
+def check_flash_competition(environment, **kwargs):
+    """
+    Sans compétition visée, écarte le scénario de ruée du mélange par défaut,
+    ou arrête Locust avec un message clair s'il a été demandé explicitement.
+    """
+    if FLASH_COMPETITION is not None or not flash_crowd_selected(environment):
+        return
+    requested = getattr(environment.parsed_options, 'user_classes', None) or ()
+    if FlashCrowdUser.__name__ in requested:
+        logging.error("FlashCrowdUser needs a competition: %s has none, "
+                      "set GUDLFT_FLASH_COMPETITION", COMPETITIONS_FILE)
+        sys.exit(1)
+    environment.user_classes.remove(FlashCrowdUser)
+    environment.user_classes_by_name.pop(FlashCrowdUser.__name__, None)
+
+
+@events.test_start.add_listener
+def record_flash_capacity(environment, **kwargs):
+    """Relève les places de la compétition visée avant la ruée."""
+    if flash_crowd_selected(environment):
+        competition = read_api(environment.host, f"competitions/{quote(FLASH_COMPETITION)}")
+        flash_crowd.initial_places = competition["number_of_places"]
+
+
+@events.test_stop.add_listener
+def check_no_oversell(environment, **kwargs):
+    """
+    Vérifie les invariants après la ruée : places jamais survendues, chaque
+    réservation confirmée décomptée exactement une fois, aucun club en
+    points négatifs. Une violation fait sortir Locust en erreur.
+    """
+    if not flash_crowd_selected(environment) or flash_crowd.initial_places is None:
+        return
+    stats = environment.stats.get(FLASH_REQUEST, "POST")
+    logging.info("Flash crowd on %s: %d requests, p50 %s ms, p95 %s ms, p99 %s ms",
+                 FLASH_COMPETITION, stats.num_requests,
+                 stats.get_response_time_percentile(0.5),
+                 stats.get_response_time_percentile(0.95),
+                 stats.get_response_time_percentile(0.99))
+
+    remaining = read_api(environment.host,
+                         f"competitions/{quote(FLASH_COMPETITION)}")["number_of_places"]
+    violations = []
+    if flash_crowd.booked_places > flash_crowd.initial_places or remaining < 0:
+        violations.append(f"oversold: {flash_crowd.booked_places} places confirmed "
+                          f"for a capacity of {flash_crowd.initial_places}")
+    if flash_crowd.initial_places - remaining != flash_crowd.booked_places:
+        violations.append(f"{flash_crowd.initial_places - remaining} places taken but "
+                          f"{flash_crowd.booked_places} confirmed")
+    for club in sorted(flash_crowd.clubs):
+        points = read_api(environment.host, f"clubs/{quote(club)}")["points"]
+        if points < 0:
+            violations.append(f"{club} has {points} points")
+
+    for violation in violations:
+        logging.error("Flash crowd invariant violated: %s", violation)
+    if violations:
+        environment.process_exit_code = 1
+    else:
+        logging.info("Flash crowd invariants hold: %d/%d places booked by %d clubs",
+                     flash_crowd.booked_places, flash_crowd.initial_places,
+                     len(flash_crowd.clubs))
+
+
 # Configuration pour les tests de charge
 # Pour lancer un test complet en ligne de commande :
 # locust -f locustfile.py --host=http://127.0.0.1:5000 \
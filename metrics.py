@@ -0,0 +1,376 @@
+"""
+Instrumentation des requêtes et endpoint `/metrics` au format Prometheus.
+
+Activée par `METRICS_ENABLED`. Désactivée, rien n'est installé : aucun hook de
+requête, aucun signal, aucune méthode enveloppée, et `/metrics` n'existe pas.
+Les recherches du dépôt et les réservations du moteur, objets partagés par le
+processus, sont chronométrées et comptées par des enveloppes posées sur ces
+instances : l'installation remplace celles d'une installation précédente au
+lieu de s'y empiler, et `uninstrument` les retire.
+Activée, chaque mesure coûte un appel à `perf_counter` et une mise à jour
+sous verrou d'un compteur en mémoire.
+
+Métriques exposées :
+
+- `gudlft_requests_total{endpoint, method, status}`
+- `gudlft_request_duration_seconds{endpoint, method}` (histogramme)
+- `gudlft_template_render_seconds{template}` (histogramme)
+- `gudlft_store_lookup_seconds{lookup}` (histogramme)
+- `gudlft_bookings_total{result}` : `booked` ou motif du refus
+- `gudlft_render_cache_hits_total`, `gudlft_render_cache_misses_total`
+- `gudlft_admission_total{result}` : `admitted`, `queued`, `rejected` ou `expired`
+- `gudlft_admission_active`, `gudlft_admission_queue_length` (jauges)
+- `gudlft_rate_limited_total` : requêtes refusées par la limitation de débit
+- `gudlft_email_filter_rejected_total`, `gudlft_email_filter_false_positives_total`,
+  `gudlft_email_filter_bytes`, `gudlft_email_filter_false_positive_rate` :
+  filtre de Bloom des emails (connexions échouées)
+
+Les valeurs sont propres à chaque processus : avec plusieurs workers
+(voir wsgi.py), chaque worker est interrogé séparément.
+"""
+import bisect
+import threading
+import time
+
+from flask import Response, g, request
+from flask.signals import before_render_template, template_rendered
+
+from booking import BookingError
+
+# Bornes par défaut des histogrammes de durée (secondes)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+# Les recherches dans les index du dépôt se mesurent en microsecondes
+LOOKUP_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3)
+
+# Méthodes enveloppées sur les instances du dépôt et du moteur de réservation
+STORE_LOOKUPS = ('get_club_by_email', 'get_club_by_name', 'get_competition_by_name')
+ENGINE_METHODS = ('book', 'book_many')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def uninstrument(store, booking_engine):
+    """
+    Retire les enveloppes posées par `Metrics.install` (sans effet si absentes).
+
+    Les enveloppes sont des attributs d'instance qui masquent les méthodes de
+    la classe : les supprimer rend les méthodes d'origine.
+    """
+    for target, names in ((store, STORE_LOOKUPS), (booking_engine, ENGINE_METHODS)):
+        for name in names:
+            vars(target).pop(name, None)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{%s}' % ','.join(pairs) if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """
+    Compteur monotone, éventuellement étiqueté.
+
+    Args:
+        name (str): Nom Prometheus
+        documentation (str): Description (`# HELP`)
+        labelnames (tuple): Noms des étiquettes
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        """Incrémente la série correspondant aux valeurs d'étiquettes."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        """Valeur courante d'une série (0 si elle n'existe pas)."""
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}'
+
+
+class Histogram:
+    """
+    Histogramme cumulatif à bornes fixes, éventuellement étiqueté.
+
+    Args:
+        name (str): Nom Prometheus
+        documentation (str): Description (`# HELP`)
+        labelnames (tuple): Noms des étiquettes
+        buckets (tuple): Bornes supérieures croissantes (`+Inf` est ajoutée)
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        """Enregistre une observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [compte par borne..., compte au-delà, somme]
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels):
+        """Nombre d'observations d'une série."""
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield (f'{self.name}_bucket{_labels(self.labelnames, labels, [("le", le)])} '
+                       f'{cumulative}')
+            yield f'{self.name}_sum{_labels(self.labelnames, labels)} {repr(series[-1])}'
+            yield f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+
+
+class CallbackCounter:
+    """Compteur dont la valeur est lue à l'exposition (ex. compteurs du cache)."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, read):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def samples(self):
+        yield f'{self.name} {_number(self.read())}'
+
+
+class CallbackGauge(CallbackCounter):
+    """Jauge dont la valeur est lue à l'exposition (ex. longueur de file)."""
+
+    kind = 'gauge'
+
+
+class CallbackLabeledCounter:
+    """Compteurs étiquetés lus à l'exposition dans un dictionnaire."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelname, read):
+        self.name = name
+        self.documentation = documentation
+        self.labelname = labelname
+        self.read = read
+
+    def samples(self):
+        for label, value in sorted(self.read().items()):
+            yield f'{self.name}{_labels((self.labelname,), (label,))} {_number(value)}'
+
+
+class Registry:
+    """Ensemble de métriques exposées ensemble."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        """Ajoute une métrique et la retourne."""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Produit l'exposition texte Prometheus.
+
+        Returns:
+            str: Toutes les métriques, au format 0.0.4
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class Metrics:
+    """
+    Métriques de l'application et installation de l'instrumentation.
+
+    Args:
+        registry (Registry): Registre (un nouveau par défaut)
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or Registry()
+        register = self.registry.register
+        self.requests = register(Counter(
+            'gudlft_requests_total', 'HTTP requests handled.', ('endpoint', 'method', 'status')))
+        self.request_duration = register(Histogram(
+            'gudlft_request_duration_seconds', 'HTTP request latency.', ('endpoint', 'method')))
+        self.template_render = register(Histogram(
+            'gudlft_template_render_seconds', 'Jinja template render time.', ('template',)))
+        self.store_lookup = register(Histogram(
+            'gudlft_store_lookup_seconds', 'In-memory store lookup time.', ('lookup',),
+            buckets=LOOKUP_BUCKETS))
+        self.bookings = register(Counter(
+            'gudlft_bookings_total', 'Booking attempts by result.', ('result',)))
+
+    def install(self, app, store, booking_engine, render_cache, admission=None,
+                rate_limiter=None, email_filter=None):
+        """
+        Installe l'instrumentation et la route `/metrics` sur une application.
+
+        Args:
+            app (flask.Flask): Application à instrumenter
+            store (Store): Dépôt dont les recherches sont chronométrées
+            booking_engine (BookingEngine): Moteur dont les résultats sont comptés
+            render_cache (RenderCache): Cache dont les compteurs sont exposés
+            admission (AdmissionController): File d'attente dont les compteurs
+                sont exposés (optionnelle)
+            rate_limiter (RateLimiter): Limiteur dont les refus sont comptés
+                (optionnel)
+            email_filter (EmailFilter): Filtre des emails dont la taille et
+                les compteurs sont exposés (optionnel)
+        """
+        self.registry.register(CallbackCounter(
+            'gudlft_render_cache_hits_total', 'Render cache hits.', lambda: render_cache.hits))
+        self.registry.register(CallbackCounter(
+            'gudlft_render_cache_misses_total', 'Render cache misses.',
+            lambda: render_cache.misses))
+        if admission is not None:
+            self._expose_admission(admission)
+        if rate_limiter is not None:
+            self.registry.register(CallbackCounter(
+                'gudlft_rate_limited_total', 'Requests refused by the rate limiter.',
+                lambda: rate_limiter.limited))
+        if email_filter is not None:
+            self._expose_email_filter(email_filter)
+
+        app.before_request(self._start_request)
+        app.after_request(self._end_request)
+        before_render_template.connect(self._start_render, app, weak=False)
+        template_rendered.connect(self._end_render, app, weak=False)
+        # Une seule couche d'enveloppes, même après plusieurs installations
+        uninstrument(store, booking_engine)
+        for lookup in STORE_LOOKUPS:
+            setattr(store, lookup, self._timed_lookup(getattr(store, lookup), lookup))
+        self._count_bookings(booking_engine)
+        app.add_url_rule('/metrics', 'metrics', self.expose)
+
+    def _expose_admission(self, admission):
+        results = ('admitted', 'queued', 'rejected', 'expired')
+        self.registry.register(CallbackLabeledCounter(
+            'gudlft_admission_total', 'Booking admission decisions.', 'result',
+            lambda: {result: getattr(admission, result) for result in results}))
+        self.registry.register(CallbackGauge(
+            'gudlft_admission_active', 'Booking requests being processed.',
+            lambda: admission.active))
+        self.registry.register(CallbackGauge(
+            'gudlft_admission_queue_length', 'Tickets waiting in the booking queue.',
+            lambda: len(admission)))
+
+    def _expose_email_filter(self, email_filter):
+        register = self.registry.register
+        register(CallbackCounter(
+            'gudlft_email_filter_rejected_total', 'Logins rejected by the email filter.',
+            lambda: email_filter.rejected))
+        register(CallbackCounter(
+            'gudlft_email_filter_false_positives_total',
+            'Emails passed by the filter but unknown to the store.',
+            lambda: email_filter.false_positives))
+        register(CallbackGauge(
+            'gudlft_email_filter_bytes', 'Email filter bit array size.',
+            lambda: email_filter.stats()['memory_bytes']))
+        register(CallbackGauge(
+            'gudlft_email_filter_false_positive_rate', 'Estimated email filter error rate.',
+            lambda: email_filter.stats()['false_positive_rate']))
+
+    def expose(self):
+        """Route `/metrics`."""
+        return Response(self.registry.render(), content_type=CONTENT_TYPE)
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+
+    def _end_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'unmatched'
+            self.request_duration.observe(time.perf_counter() - started, endpoint, request.method)
+            self.requests.inc(endpoint, request.method, str(response.status_code))
+        return response
+
+    def _start_render(self, sender, template, context, **extra):
+        g.setdefault('metrics_renders', []).append(time.perf_counter())
+
+    def _end_render(self, sender, template, context, **extra):
+        renders = g.get('metrics_renders')
+        if renders:
+            self.template_render.observe(time.perf_counter() - renders.pop(),
+                                         template.name or 'string')
+
+    def _timed_lookup(self, lookup, name):
+        observe = self.store_lookup.observe
+
+        def timed(key):
+            started = time.perf_counter()
+            try:
+                return lookup(key)
+            finally:
+                observe(time.perf_counter() - started, name)
+        return timed
+
+    def _count_bookings(self, booking_engine):
+        book, book_many, count = booking_engine.book, booking_engine.book_many, self.bookings.inc
+
+        def counted_book(club, competition, places):
+            try:
+                points_cost = book(club, competition, places)
+            except BookingError as error:
+                count(error.reason)
+                raise
+            count('booked')
+            return points_cost
+
+        def counted_book_many(club, requests, atomic=True):
+            outcomes = book_many(club, requests, atomic=atomic)
+            # En mode partiel, chaque ligne passe par book() et est déjà comptée
+            if atomic:
+                for outcome in outcomes:
+                    count('booked' if outcome.ok else outcome.error.reason)
+            return outcomes
+
+        booking_engine.book = counted_book
+        booking_engine.book_many = counted_book_many
@@ -0,0 +1,77 @@
+"""
+Modèles typés des clubs et des compétitions.
+
+Les fichiers JSON stockent points et places sous forme de chaînes et les dates
+au format texte ; ces valeurs sont converties une seule fois au chargement
+(entiers, datetime) au lieu d'être re-parsées à chaque requête. Les classes
+utilisent `__slots__` pour réduire l'empreinte mémoire des grands registres.
+"""
+from datetime import datetime
+
+# Format des dates dans competitions.json
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class Club:
+    """
+    Club sportif.
+
+    Attributes:
+        name (str): Nom du club
+        email (str): Email du secrétaire
+        points (int): Points disponibles
+    """
+
+    __slots__ = ('name', 'email', 'points')
+
+    def __init__(self, name, email, points):
+        self.name = name
+        self.email = email
+        self.points = int(points)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construit un club depuis son format JSON."""
+        return cls(data['name'], data['email'], data['points'])
+
+    def to_dict(self):
+        """Sérialise le club au format de clubs.json."""
+        return {'name': self.name, 'email': self.email, 'points': str(self.points)}
+
+    def __repr__(self):
+        return f'Club(name={self.name!r}, email={self.email!r}, points={self.points})'
+
+
+class Competition:
+    """
+    Compétition ouverte aux réservations.
+
+    Attributes:
+        name (str): Nom de la compétition
+        date (datetime): Date et heure de la compétition
+        number_of_places (int): Places restantes
+    """
+
+    __slots__ = ('name', 'date', 'number_of_places')
+
+    def __init__(self, name, date, number_of_places):
+        self.name = name
+        self.date = date if isinstance(date, datetime) else datetime.strptime(date, DATE_FORMAT)
+        self.number_of_places = int(number_of_places)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construit une compétition depuis son format JSON."""
+        return cls(data['name'], data['date'], data['numberOfPlaces'])
+
+    def to_dict(self):
+        """Sérialise la compétition au format de competitions.json."""
+        return {
+            'name': self.name,
+            'date': self.date.strftime(DATE_FORMAT),
+            'numberOfPlaces': str(self.number_of_places),
+        }
+
+    def __repr__(self):
+        return (f'Competition(name={self.name!r}, date={self.date.strftime(DATE_FORMAT)!r}, '
+                f'number_of_places={self.number_of_places})')
@@ -0,0 +1,323 @@
+"""
+Persistance durable des réservations pour les fichiers JSON.
+
+Chaque réservation est ajoutée à un journal (write-ahead log) sous forme d'une
+ligne JSON contenant les nouvelles valeurs absolues des points du club et des
+places de la compétition ; une réservation groupée tient sur une seule ligne
+(liste `bookings`), si bien qu'elle est rejouée entièrement ou pas du tout. Un
+thread d'écriture regroupe les ajouts et ne fait qu'un fsync par lot (group
+commit), ce qui garde la réservation hors du chemin des E/S disque. Le journal
+est périodiquement compacté dans les fichiers de clubs et de compétitions, au
+format de leur extension (écriture dans un fichier temporaire puis renommage
+atomique), puis rejoué au démarrage.
+
+Le total cumulé de places du club pour la compétition (registre des
+réservations, voir ledger.py) est journalisé de la même façon, et compacté
+dans `bookings.json` du répertoire du journal.
+
+Une réservation n'est journalisée qu'après avoir été appliquée au dépôt et
+au registre (voir JsonBackend.journal_bookings) : tout enregistrement basculé
+dans un segment compacté est donc déjà visible dans le snapshot écrit
+ensuite. Les valeurs étant absolues, rejouer un enregistrement déjà inclus
+dans un snapshot est sans effet : la compaction n'a pas besoin de bloquer les
+réservations.
+"""
+import glob
+import json
+import os
+import threading
+import time
+
+from loaders import NDJSON_EXTENSIONS, load_records
+from models import Club, Competition
+
+
+class WriteAheadLog:
+    """
+    Journal en ajout seul avec fsync groupé.
+
+    Le journal est découpé en segments numérotés (`<prefix>.<n>`) ; la
+    compaction bascule sur un nouveau segment puis supprime les anciens une
+    fois le snapshot écrit.
+    """
+
+    def __init__(self, directory, prefix='bookings.wal', flush_interval=0.005):
+        self.directory = directory
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self._cond = threading.Condition()
+        self._buffer = []
+        self._appended = 0
+        self._durable = 0
+        self._closed = False
+        segments = self.segments()
+        self._segment = self._segment_number(segments[-1]) + 1 if segments else 1
+        self._file = open(self._segment_path(self._segment), 'a', encoding='utf-8')
+        self._flusher = threading.Thread(target=self._run, name='wal-flusher', daemon=True)
+        self._flusher.start()
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f'{self.prefix}.{number}')
+
+    @staticmethod
+    def _segment_number(path):
+        return int(path.rsplit('.', 1)[1])
+
+    def segments(self):
+        """Retourne les chemins des segments existants, du plus ancien au plus récent."""
+        paths = glob.glob(os.path.join(self.directory, f'{self.prefix}.*'))
+        paths = [p for p in paths if p.rsplit('.', 1)[1].isdigit()]
+        return sorted(paths, key=self._segment_number)
+
+    def append(self, record, wait=False):
+        """
+        Ajoute un enregistrement au journal.
+
+        Args:
+            record (dict): Enregistrement sérialisable en JSON
+            wait (bool): Attendre que l'enregistrement soit sur disque (fsync)
+
+        Returns:
+            int: Numéro de séquence de l'enregistrement
+        """
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Write-ahead log is closed')
+            self._buffer.append(line)
+            self._appended += 1
+            sequence = self._appended
+            self._cond.notify_all()
+        if wait:
+            self.wait_durable(sequence)
+        return sequence
+
+    def wait_durable(self, sequence=None, timeout=None):
+        """Attend que tous les enregistrements jusqu'à `sequence` soient sur disque."""
+        with self._cond:
+            if sequence is None:
+                sequence = self._appended
+            return self._cond.wait_for(lambda: self._durable >= sequence, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._buffer or self._closed)
+                if not self._buffer and self._closed:
+                    return
+            # Laisser le lot se remplir avant le fsync (group commit)
+            if self.flush_interval:
+                time.sleep(self.flush_interval)
+            with self._cond:
+                self._write_batch()
+
+    def _write_batch(self):
+        # Appelé avec self._cond acquis
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self._file.write(''.join(batch))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._durable += len(batch)
+        self._cond.notify_all()
+
+    def rotate(self):
+        """
+        Vide le tampon puis bascule sur un nouveau segment.
+
+        Returns:
+            list: Segments antérieurs à la bascule (compactables)
+        """
+        with self._cond:
+            self._write_batch()
+            self._file.close()
+            self._segment += 1
+            self._file = open(self._segment_path(self._segment), 'a', encoding='utf-8')
+            return [p for p in self.segments() if self._segment_number(p) < self._segment]
+
+    def close(self):
+        """Écrit les enregistrements en attente et ferme le journal."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        with self._cond:
+            self._write_batch()
+            self._file.close()
+
+
+def read_records(paths):
+    """
+    Lit les enregistrements des segments donnés, dans l'ordre.
+
+    Une dernière ligne tronquée (crash pendant l'écriture) est ignorée.
+    """
+    for path in paths:
+        with open(path, encoding='utf-8') as segment:
+            for line in segment:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+
+def write_records_atomic(path, key, records):
+    """
+    Écrit des enregistrements dans un fichier temporaire puis le renomme atomiquement.
+
+    Le format suit l'extension, comme à la lecture (voir loaders.iter_records) :
+    un enregistrement par ligne pour `.ndjson` / `.jsonl`, sinon le document
+    `{"<key>": [...]}`.
+
+    Args:
+        path (str): Fichier de données
+        key (str): Clé du tableau d'enregistrements
+        records (list): Enregistrements sérialisables en JSON
+    """
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as tmp:
+        if path.endswith(NDJSON_EXTENSIONS):
+            tmp.writelines(json.dumps(record) + '\n' for record in records)
+        else:
+            json.dump({key: records}, tmp, indent=4)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonPersistence:
+    """
+    Couche de persistance sous `loadClubs()` / `loadCompetitions()`.
+
+    Args:
+        clubs_path (str): Snapshot des clubs (clubs.json)
+        competitions_path (str): Snapshot des compétitions (competitions.json)
+        wal_dir (str): Répertoire du journal
+        flush_interval (float): Délai de regroupement des fsync, en secondes
+        compact_every (int): Nombre de réservations entre deux compactions
+        progress (callable): Suivi du chargement (voir loaders.load_records)
+    """
+
+    def __init__(self, clubs_path, competitions_path, wal_dir,
+                 flush_interval=0.005, compact_every=1000, progress=None):
+        self.clubs_path = clubs_path
+        self.competitions_path = competitions_path
+        self.progress = progress
+        self.compact_every = compact_every
+        self.wal = WriteAheadLog(wal_dir, flush_interval=flush_interval)
+        self.bookings_path = os.path.join(wal_dir, 'bookings.json')
+        self.store = None
+        self.ledger = None
+        self._compaction_lock = threading.Lock()
+        self._replayed = None
+
+    def _replay(self):
+        # Dernières valeurs connues par club et par compétition
+        if self._replayed is None:
+            points, places, booked = {}, {}, {}
+            for record in read_records(self.wal.segments()):
+                points[record['club']] = record['points']
+                for line in record.get('bookings', (record,)):
+                    places[line['competition']] = line['numberOfPlaces']
+                    if 'booked' in line:
+                        booked[record['club'], line['competition']] = line['booked']
+            self._replayed = points, places, booked
+        return self._replayed
+
+    def load_clubs(self):
+        """Charge le snapshot des clubs et y rejoue le journal."""
+        clubs = load_records(self.clubs_path, 'clubs', Club.from_dict, self.progress)
+        points = self._replay()[0]
+        for club in clubs:
+            if club.name in points:
+                club.points = int(points[club.name])
+        return clubs
+
+    def load_competitions(self):
+        """Charge le snapshot des compétitions et y rejoue le journal."""
+        competitions = load_records(
+            self.competitions_path, 'competitions', Competition.from_dict, self.progress)
+        places = self._replay()[1]
+        for competition in competitions:
+            if competition.name in places:
+                competition.number_of_places = int(places[competition.name])
+        return competitions
+
+    def load_bookings(self):
+        """
+        Charge le snapshot des totaux de réservations et y rejoue le journal.
+
+        Returns:
+            dict: `{(club, compétition): places}`
+        """
+        totals = {}
+        if os.path.exists(self.bookings_path):
+            with open(self.bookings_path, encoding='utf-8') as snapshot:
+                for record in json.load(snapshot)['bookings']:
+                    totals[record['club'], record['competition']] = record['places']
+        totals.update(self._replay()[2])
+        return totals
+
+    def attach(self, store, ledger=None):
+        """Associe le dépôt et le registre dont l'état sera compacté dans les snapshots."""
+        self.store = store
+        self.ledger = ledger
+
+    def record_bookings(self, club_name, points, bookings):
+        """
+        Journalise en un seul enregistrement des réservations appliquées.
+
+        Appelé par le moteur de réservation sous les verrous du club et des
+        compétitions, après la mise à jour du dépôt, ce qui garantit l'ordre
+        des enregistrements par clé.
+
+        Args:
+            club_name (str): Club qui a réservé
+            points (int): Points du club après les réservations
+            bookings (list): Tuples `(compétition, places, places restantes,
+                total réservé par le club ou None)`
+        """
+        lines = []
+        for competition_name, places, number_of_places, booked in bookings:
+            line = {'competition': competition_name,
+                    'numberOfPlaces': str(number_of_places), 'places': places}
+            if booked is not None:
+                line['booked'] = booked
+            lines.append(line)
+        record = {'club': club_name, 'points': str(points)}
+        if len(lines) == 1:
+            record.update(lines[0])
+        else:
+            record['bookings'] = lines
+        sequence = self.wal.append(record)
+        if self.store is not None and sequence % self.compact_every == 0:
+            threading.Thread(target=self.compact, name='wal-compaction', daemon=True).start()
+
+    def compact(self):
+        """
+        Écrit l'état courant du dépôt dans les snapshots JSON puis supprime
+        les segments de journal qu'ils rendent inutiles.
+        """
+        if not self._compaction_lock.acquire(blocking=False):
+            return
+        try:
+            obsolete = self.wal.rotate()
+            clubs, competitions = self.store.snapshot()
+            write_records_atomic(self.clubs_path, 'clubs', clubs)
+            write_records_atomic(self.competitions_path, 'competitions', competitions)
+            if self.ledger is not None:
+                write_records_atomic(self.bookings_path, 'bookings', [
+                    {'club': club, 'competition': competition, 'places': places}
+                    for (club, competition), places in self.ledger.totals().items()])
+            for path in obsolete:
+                os.remove(path)
+        finally:
+            self._compaction_lock.release()
+
+    def close(self):
+        """Vide le journal sur disque."""
+        self.wal.close()
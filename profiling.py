@@ -0,0 +1,180 @@
+"""
+Profilage à la demande des requêtes en production (cProfile).
+
+Le middleware enveloppe l'application WSGI quand `PROFILING_DIR` est défini.
+Il profile une fraction des requêtes (`sample_rate`) et ne garde que celles
+qui ont duré au moins `threshold` secondes ; les profils conservés sont
+agrégés par route (`/book/<competition>/<club>`, pas par URL) puis écrits
+dans `PROFILING_DIR` au format pstats, lisible par `python -m pstats` ou
+snakeviz.
+
+Le profilage s'active et se règle sans redémarrage, en écrivant le fichier
+de contrôle (`<PROFILING_DIR>/control.json` par défaut), relu au plus une
+fois par seconde par chaque worker :
+
+    {"enabled": true, "sample_rate": 0.05, "threshold": 0.2}
+
+Désactivé, le coût par requête se limite à un test booléen et à une lecture
+d'horloge. Une seule requête est profilée à la fois par processus : une
+requête tirée pendant qu'une autre est profilée est servie sans profil. Les
+profils sont écrits tous les `dump_every` profils conservés et à la
+désactivation, dans un fichier par route et par processus.
+"""
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+# Période minimale entre deux lectures du fichier de contrôle (secondes)
+CONTROL_CHECK_INTERVAL = 1.0
+
+
+def route_slug(route):
+    """Nom de fichier dérivé d'une route (`/book/<competition>` → `book_competition`)."""
+    return re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+
+
+class ProfilingMiddleware:
+    """
+    Middleware WSGI de profilage échantillonné, agrégé par route.
+
+    Args:
+        app (flask.Flask): Application dont les routes servent à l'agrégation
+        directory (str): Répertoire des profils écrits
+        control_file (str): Fichier de contrôle JSON (voir le module)
+        enabled (bool): État initial
+        sample_rate (float): Fraction des requêtes profilées (0 à 1)
+        threshold (float): Durée minimale d'une requête pour garder son profil
+        dump_every (int): Écrire les profils tous les N profils conservés
+    """
+
+    def __init__(self, app, directory, control_file=None, enabled=False, sample_rate=0.01,
+                 threshold=0.0, dump_every=100):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self.directory = directory
+        self.control_file = control_file or os.path.join(directory, 'control.json')
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.dump_every = dump_every
+        self.profiled = 0
+        self.kept = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Tenu pendant qu'une requête est profilée (jamais attendu)
+        self._profiling = threading.Lock()
+        self._control_mtime = None
+        self._next_check = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def configure(self, enabled=None, sample_rate=None, threshold=None):
+        """
+        Modifie les réglages à chaud (valeurs None inchangées).
+
+        Désactiver le profilage écrit les profils accumulés.
+        """
+        if enabled is not None:
+            was_enabled, self.enabled = self.enabled, bool(enabled)
+            if was_enabled and not self.enabled:
+                self.dump()
+        if sample_rate is not None:
+            self.sample_rate = max(0.0, min(float(sample_rate), 1.0))
+        if threshold is not None:
+            self.threshold = max(0.0, float(threshold))
+
+    def _check_control_file(self, now):
+        self._next_check = now + CONTROL_CHECK_INTERVAL
+        try:
+            mtime = os.stat(self.control_file).st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._control_mtime:
+            return
+        self._control_mtime = mtime
+        try:
+            with open(self.control_file, encoding='utf-8') as control:
+                settings = json.load(control)
+            self.configure(settings.get('enabled'), settings.get('sample_rate'),
+                           settings.get('threshold'))
+        except (OSError, ValueError, TypeError):
+            self.app.logger.warning('Ignoring invalid profiling control file %s',
+                                    self.control_file)
+
+    def __call__(self, environ, start_response):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._check_control_file(now)
+        if not self.enabled or random.random() >= self.sample_rate:
+            return self.wsgi_app(environ, start_response)
+
+        if not self._profiling.acquire(blocking=False):
+            # Une autre requête est profilée (thread ou greenlet concurrent) :
+            # leurs profils se mélangeraient, celle-ci est servie sans profil
+            return self.wsgi_app(environ, start_response)
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Un autre profileur est actif (débogueur...)
+                return self.wsgi_app(environ, start_response)
+            started = time.perf_counter()
+            try:
+                return self.wsgi_app(environ, start_response)
+            finally:
+                profiler.disable()
+                self._record(environ, profiler, time.perf_counter() - started)
+        finally:
+            self._profiling.release()
+
+    def _route(self, environ):
+        try:
+            rule, _ = self.app.url_map.bind_to_environ(environ).match(return_rule=True)
+            return f"{environ['REQUEST_METHOD']} {rule.rule}"
+        except Exception:
+            return f"{environ['REQUEST_METHOD']} unmatched"
+
+    def _record(self, environ, profiler, duration):
+        with self._lock:
+            self.profiled += 1
+        if duration < self.threshold:
+            return
+        route = self._route(environ)
+        with self._lock:
+            stats = self._stats.get(route)
+            if stats is None:
+                self._stats[route] = pstats.Stats(profiler)
+            else:
+                stats.add(profiler)
+            self.kept += 1
+            dump = self.kept % self.dump_every == 0
+        if dump:
+            self.dump()
+
+    def routes(self):
+        """Routes ayant au moins un profil conservé."""
+        with self._lock:
+            return sorted(self._stats)
+
+    def dump(self):
+        """
+        Écrit un fichier pstats par route dans le répertoire des profils.
+
+        Returns:
+            list: Chemins écrits
+        """
+        with self._lock:
+            stats = list(self._stats.items())
+            paths = []
+            for route, route_stats in stats:
+                method, _, rule = route.partition(' ')
+                path = os.path.join(self.directory,
+                                    f'{method.lower()}_{route_slug(rule)}.{os.getpid()}.prof')
+                route_stats.dump_stats(path)
+                paths.append(path)
+        return paths
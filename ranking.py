@@ -0,0 +1,84 @@
+"""
+Classement des clubs par points, maintenu de manière incrémentale.
+
+Le classement est une liste triée (sortedcontainers) d'entrées
+`(-points, rang d'insertion, nom)` mise à jour à chaque modification des
+points d'un club : une lecture du top-k coûte O(log n + k) au lieu d'un tri
+complet O(n log n) à chaque affichage du leaderboard.
+"""
+import itertools
+import threading
+
+from sortedcontainers import SortedList
+
+from store import StoreListener
+
+
+class Leaderboard(StoreListener):
+    """
+    Classement des clubs abonné aux mutations d'un `Store`.
+
+    À points égaux, les clubs gardent l'ordre du dépôt (comme le tri stable
+    utilisé auparavant).
+    """
+
+    def __init__(self, store):
+        self._lock = threading.Lock()
+        self._ranking = SortedList()
+        self._entries = {}
+        self._clubs = {}
+        self._sequence = itertools.count()
+        store.add_listener(self)
+
+    def __len__(self):
+        return len(self._ranking)
+
+    def reset(self, store):
+        with self._lock:
+            self._ranking.clear()
+            self._entries.clear()
+            self._clubs.clear()
+            for club in store.clubs:
+                self._insert(club)
+
+    def club_added(self, club):
+        with self._lock:
+            self._insert(club)
+
+    def club_removed(self, club):
+        with self._lock:
+            self._ranking.remove(self._entries.pop(club.name))
+            del self._clubs[club.name]
+
+    def club_updated(self, club, previous):
+        if 'points' not in previous and 'name' not in previous:
+            return
+        with self._lock:
+            name = previous.get('name', club.name)
+            entry = self._entries.pop(name)
+            del self._clubs[name]
+            self._ranking.remove(entry)
+            self._insert(club, sequence=entry[1])
+
+    def _insert(self, club, sequence=None):
+        if sequence is None:
+            sequence = next(self._sequence)
+        entry = (-club.points, sequence, club.name)
+        self._ranking.add(entry)
+        self._entries[club.name] = entry
+        self._clubs[club.name] = club
+
+    def top(self, limit=None, offset=0):
+        """
+        Retourne une tranche du classement.
+
+        Args:
+            limit (int): Nombre de clubs à retourner (tous si None)
+            offset (int): Nombre de clubs à sauter depuis la tête
+
+        Returns:
+            list: Clubs classés par points décroissants
+        """
+        stop = None if limit is None else offset + limit
+        with self._lock:
+            return [self._clubs[name] for _, _, name in self._ranking.islice(offset, stop)]
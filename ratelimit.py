@@ -0,0 +1,80 @@
+"""
+Limitation de débit des connexions et des réservations (seaux à jetons).
+
+Chaque clé (adresse IP du client, email soumis, nom de club) dispose d'un
+seau de `burst` jetons, rechargé de `rate` jetons par seconde. Une requête
+consomme un jeton dans le seau de chacune de ses clés ; si l'un d'eux est
+vide, elle est refusée (429) avant toute logique de route et aucun seau
+n'est débité. Le coût est constant par requête : une lecture de
+dictionnaire et un calcul de recharge par clé.
+
+Les seaux sont gardés dans un LRU borné à `max_keys` : une clé évincée
+retrouve un seau plein à son retour. L'état est propre à chaque processus.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    """
+    Seaux à jetons indexés par clé, en mémoire bornée.
+
+    Args:
+        rate (float): Jetons rechargés par seconde
+        burst (int): Capacité d'un seau (requêtes acceptées d'affilée)
+        max_keys (int): Nombre maximum de seaux conservés
+        clock (callable): Horloge monotone (injectable pour les tests)
+    """
+
+    def __init__(self, rate=5.0, burst=20, max_keys=100000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self.allowed = 0
+        self.limited = 0
+        # clé -> [jetons, instant de la dernière recharge]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def hit(self, keys):
+        """
+        Débite un jeton pour chaque clé d'une requête.
+
+        Args:
+            keys (iterable): Clés de la requête (ex. `('ip', '10.0.0.1')`) ;
+                les clés None sont ignorées
+
+        Returns:
+            int: 0 si la requête est acceptée, sinon délai en secondes avant
+            qu'elle puisse l'être (`Retry-After`)
+        """
+        with self._lock:
+            now = self.clock()
+            buckets = [self._refill(key, now) for key in keys if key is not None]
+            empty = [bucket for bucket in buckets if bucket[0] < 1]
+            if empty:
+                self.limited += 1
+                missing = max(1 - bucket[0] for bucket in empty)
+                return max(1, math.ceil(missing / self.rate)) if self.rate > 0 else 60
+            for bucket in buckets:
+                bucket[0] -= 1
+            self.allowed += 1
+            return 0
+
+    def _refill(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
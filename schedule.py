@@ -0,0 +1,112 @@
+"""
+Index des compétitions à venir, trié par date.
+
+Le tableau de bord n'affiche que les compétitions futures disposant encore de
+places. Au lieu de parcourir tout l'historique à chaque affichage, les
+compétitions réservables sont gardées dans une liste triée (sortedcontainers)
+d'entrées `(date, rang d'insertion, nom)` : une recherche dichotomique sur
+l'heure courante donne la première compétition à venir, et une page se lit en
+O(log n + k). Le passage du temps ne demande aucune mise à jour : les
+compétitions passées restent simplement avant le point de recherche.
+"""
+import itertools
+import threading
+
+from sortedcontainers import SortedList
+
+from store import StoreListener
+
+
+class CompetitionSchedule(StoreListener):
+    """
+    Compétitions réservables (places restantes) abonnées aux mutations d'un `Store`.
+
+    À date égale, les compétitions gardent l'ordre du dépôt.
+    """
+
+    def __init__(self, store):
+        self._lock = threading.Lock()
+        self._schedule = SortedList()
+        self._entries = {}
+        self._competitions = {}
+        self._sequence = itertools.count()
+        store.add_listener(self)
+
+    def __len__(self):
+        return len(self._schedule)
+
+    def reset(self, store):
+        with self._lock:
+            self._schedule.clear()
+            self._entries.clear()
+            self._competitions.clear()
+            for competition in store.competitions:
+                self._insert(competition)
+
+    def competition_added(self, competition):
+        with self._lock:
+            self._insert(competition)
+
+    def competition_removed(self, competition):
+        with self._lock:
+            self._discard(competition.name)
+
+    def competition_updated(self, competition, previous):
+        if not previous.keys() & {'name', 'date', 'number_of_places'}:
+            return
+        with self._lock:
+            entry = self._discard(previous.get('name', competition.name))
+            self._insert(competition, sequence=entry[1] if entry else None)
+
+    def _insert(self, competition, sequence=None):
+        if sequence is None:
+            sequence = next(self._sequence)
+        if competition.number_of_places <= 0:
+            # Complète : retirée de l'index jusqu'à une éventuelle libération
+            return
+        entry = (competition.date, sequence, competition.name)
+        self._schedule.add(entry)
+        self._entries[competition.name] = entry
+        self._competitions[competition.name] = competition
+
+    def _discard(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._schedule.remove(entry)
+            del self._competitions[name]
+        return entry
+
+    def _start(self, now):
+        # Première entrée dont la date n'est pas passée
+        return self._schedule.bisect_left((now,))
+
+    def count_upcoming(self, now):
+        """
+        Nombre de compétitions à venir disposant encore de places.
+
+        Args:
+            now (datetime): Heure de référence
+
+        Returns:
+            int: Nombre de compétitions réservables
+        """
+        with self._lock:
+            return len(self._schedule) - self._start(now)
+
+    def upcoming(self, now, limit=None, offset=0):
+        """
+        Retourne une page des compétitions à venir, par date croissante.
+
+        Args:
+            now (datetime): Heure de référence
+            limit (int): Nombre de compétitions à retourner (toutes si None)
+            offset (int): Nombre de compétitions à sauter depuis la plus proche
+
+        Returns:
+            list: Compétitions futures disposant encore de places
+        """
+        with self._lock:
+            start = self._start(now) + offset
+            stop = None if limit is None else start + limit
+            return [self._competitions[name]
+                    for _, _, name in self._schedule.islice(start, stop)]
@@ -1,42 +1,161 @@
-import json
+import threading
+import time
+import uuid
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, flash, url_for
+from functools import wraps
+
+from flask import (Flask, Response, current_app, g, render_template, request, redirect, flash,
+                   url_for, make_response, session)
+
+from admission import TICKET_FIELD, TICKET_HEADER
+from api import API_VERSION, api, dumps
+from booking import BookingError
+from config import Config
+from events import KEEPALIVE, format_event
+from idempotency import (FORM_FIELD, HEADER, MAX_KEY_LENGTH, IdempotencyConflict,
+                         IdempotencyTimeout, fingerprint)
+from metrics import Metrics, uninstrument
+from profiling import ProfilingMiddleware
+from state import (admission, booking_engine, email_filter, events, idempotency, loader,
+                   ranking, rate_limiter, render_cache, schedule, store, versions)
+
+
+def __getattr__(name):
+    """
+    Donne accès à `clubs` et `competitions` en chargeant les données au besoin.
+
+    Conserve la compatibilité de `from server import clubs, competitions`.
+    """
+    if name in ('clubs', 'competitions'):
+        loader.ensure_loaded()
+        return getattr(store, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def loadClubs():
     """
-    Charge la liste des clubs depuis le fichier clubs.json.
+    Charge la liste des clubs depuis le backend de stockage configuré
+    (clubs.json par défaut, journal des réservations rejoué s'il est activé).
 
     Returns:
-        list: Liste des dictionnaires contenant les informations des clubs
-              (name, email, points)
+        list: Liste des clubs (models.Club : name, email, points)
     """
-    with open('clubs.json') as c:
-        listOfClubs = json.load(c)['clubs']
-        return listOfClubs
+    return loader.get_backend().load_clubs()
 
 
 def loadCompetitions():
     """
-    Charge la liste des compétitions depuis le fichier competitions.json.
+    Charge la liste des compétitions depuis le backend de stockage configuré
+    (competitions.json par défaut, journal des réservations rejoué s'il est activé).
+
+    Returns:
+        list: Liste des compétitions (models.Competition : name, date,
+              number_of_places)
+    """
+    return loader.get_backend().load_competitions()
+
+
+def render_cached(key, template, context):
+    """
+    Rend un template via le cache de pages et gère les requêtes conditionnelles.
+
+    Args:
+        key (tuple): Clé de cache incluant les versions des données affichées
+        template (str): Nom du template
+        context (callable): Retourne le contexte du template (appelé seulement
+            en cas d'absence dans le cache)
+
+    Returns:
+        flask.Response: Page (200) ou 304 si l'ETag fourni par le client correspond
+    """
+    page = render_cache.get_or_render(key, lambda: render_template(template, **context()))
+    response = make_response(page.body)
+    response.set_etag(page.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+def idempotent(view):
+    """
+    Exécute une vue de réservation une seule fois par clé d'idempotence.
+
+    La clé est lue dans le champ caché `idempotency_key` du formulaire, ou à
+    défaut dans l'en-tête `Idempotency-Key`. La réponse de la première
+    requête est conservée (sans ses cookies) et renvoyée telle quelle aux
+    nouvelles tentatives portant la même clé et le même formulaire. Sans
+    clé, la vue est appelée normalement.
+
+    Args:
+        view (callable): Vue Flask à protéger
+
+    Returns:
+        callable: Vue décorée
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.form.get(FORM_FIELD) or request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return 'Invalid idempotency key.', 400
+        # Le ticket de file d'attente change d'un essai à l'autre
+        form = [item for item in request.form.items(multi=True)
+                if item[0] not in (FORM_FIELD, TICKET_FIELD)]
+
+        def run():
+            response = make_response(view(*args, **kwargs))
+            headers = [(name, value) for name, value in response.headers
+                       if name.lower() != 'set-cookie']
+            return response.get_data(), response.status_code, headers
+
+        try:
+            body, status, headers = idempotency.execute(
+                ('html', request.path, key), fingerprint(request.path, form), run)
+        except IdempotencyConflict:
+            return 'This idempotency key was already used for a different request.', 422
+        except IdempotencyTimeout:
+            return 'The original request is still being processed.', 409
+        return Response(body, status, headers)
+
+    return wrapper
+
+
+def paginate_upcoming(page):
+    """
+    Calcule la page demandée des compétitions à venir du tableau de bord.
+
+    Args:
+        page (int): Numéro de page demandé, à partir de 1
 
     Returns:
-        list: Liste des dictionnaires contenant les informations des compétitions
-              (name, date, numberOfPlaces)
+        tuple: (heure de référence, page bornée, nombre de pages, compétitions
+               réservables au total)
     """
-    with open('competitions.json') as comps:
-        listOfCompetitions = json.load(comps)['competitions']
-        return listOfCompetitions
+    per_page = current_app.config['WELCOME_PER_PAGE']
+    now = datetime.now()
+    total = schedule.count_upcoming(now)
+    pages = max(1, -(-total // per_page))
+    return now, max(1, min(page, pages)), pages, total
+
 
+def welcome_context(club, page=1):
+    """
+    Contexte de welcome.html : seules les compétitions à venir disposant
+    encore de places sont affichées, par date croissante et par page.
 
-app = Flask(__name__)
-app.secret_key = 'something_special'
+    Args:
+        club (Club): Club connecté
+        page (int): Numéro de page, à partir de 1
 
-competitions = loadCompetitions()
-clubs = loadClubs()
+    Returns:
+        dict: Contexte du template
+    """
+    now, page, pages, _ = paginate_upcoming(page)
+    per_page = current_app.config['WELCOME_PER_PAGE']
+    return {'club': club, 'page': page, 'pages': pages,
+            'competitions': schedule.upcoming(now, per_page, (page - 1) * per_page)}
 
 
-@app.route('/')
 def index():
     """
     Page d'accueil de l'application.
@@ -48,7 +167,6 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/showSummary', methods=['POST'])
 def showSummary():
     """
     Authentifie un secrétaire de club via son email.
@@ -56,20 +174,34 @@ def showSummary():
 
     Form Data:
         email (str): Adresse email du secrétaire du club
+        page (int): Page des compétitions à venir (défaut : 1)
 
     Returns:
-        str: Template HTML du tableau de bord si l'email existe,
+        str: Template HTML du tableau de bord si l'email existe (servi depuis
+             le cache de pages tant que les données n'ont pas changé),
              redirection vers l'accueil avec message d'erreur sinon
     """
-    try:
-        club = [club for club in clubs if club['email'] == request.form['email']][0]
-        return render_template('welcome.html', club=club, competitions=competitions)
-    except IndexError:
+    email = request.form['email']
+    club = None
+    # Email certainement inconnu : écarté par le filtre sans consulter le dépôt
+    if email_filter.might_contain(email):
+        club = store.get_club_by_email(email)
+        if club is None:
+            email_filter.record_false_positive()
+    if club is None:
         flash("Sorry, that email was not found.")
         return redirect(url_for('index'))
+    page = request.form.get('page', 1, type=int)
+    if session.get('_flashes'):
+        # Des messages en attente doivent apparaître sur la page : pas de cache
+        return render_template('welcome.html', **welcome_context(club, page))
+    # Le nombre de compétitions à venir change aussi avec le temps qui passe
+    _, page, _, total = paginate_upcoming(page)
+    return render_cached(
+        ('welcome', club.name, versions.club(club.name), versions.competitions, total, page),
+        'welcome.html', lambda: welcome_context(club, page))
 
 
-@app.route('/book/<competition>/<club>')
 def book(competition, club):
     """
     Affiche la page de réservation pour une compétition spécifique.
@@ -82,16 +214,19 @@ def book(competition, club):
         str: Template HTML de la page de réservation si le club et la compétition
              existent, sinon retour au tableau de bord avec message d'erreur
     """
-    foundClub = [c for c in clubs if c['name'] == club][0]
-    foundCompetition = [c for c in competitions if c['name'] == competition][0]
+    foundClub = store.get_club_by_name(club)
+    foundCompetition = store.get_competition_by_name(competition)
     if foundClub and foundCompetition:
-        return render_template('booking.html', club=foundClub, competition=foundCompetition)
-    else:
-        flash("Something went wrong-please try again")
-        return render_template('welcome.html', club=club, competitions=competitions)
+        # Clé d'idempotence du formulaire : un double envoi ne réserve qu'une fois
+        return render_template('booking.html', club=foundClub, competition=foundCompetition,
+                               idempotency_key=uuid.uuid4().hex)
+    flash("Something went wrong-please try again")
+    if foundClub is None:
+        return redirect(url_for('index'))
+    return render_template('welcome.html', **welcome_context(foundClub))
 
 
-@app.route('/purchasePlaces', methods=['POST'])
+@idempotent
 def purchasePlaces():
     """
     Traite une réservation de places pour une compétition.
@@ -100,65 +235,159 @@ def purchasePlaces():
     - La compétition doit être future (pas passée)
     - Maximum 12 places par réservation
     - Le club doit avoir suffisamment de points (1 place = 3 points)
+    - La compétition doit disposer d'assez de places restantes
+
+    La vérification et la déduction sont atomiques (voir booking.BookingEngine).
+    Un renvoi du même formulaire (même `idempotency_key`) reçoit la page
+    d'origine sans réserver à nouveau (voir `idempotent`).
 
     Form Data:
         competition (str): Nom de la compétition
         club (str): Nom du club
         places (int): Nombre de places à réserver
+        idempotency_key (str): Clé d'idempotence (optionnelle)
 
     Returns:
         str: Template HTML du tableau de bord avec message de confirmation
              ou d'erreur selon le résultat de la validation
     """
-    competition = [c for c in competitions if c['name'] == request.form['competition']][0]
-    club = [c for c in clubs if c['name'] == request.form['club']][0]
+    competition = store.get_competition_by_name(request.form['competition'])
+    club = store.get_club_by_name(request.form['club'])
+    if club is None or competition is None:
+        flash("Something went wrong-please try again")
+        return redirect(url_for('index'))
     placesRequired = int(request.form['places'])
 
-    # Calculer le coût en points (1 place = 3 points)
-    points_cost = placesRequired * 3
-    club_points = int(club['points'])
+    try:
+        booking_engine.book(club, competition, placesRequired)
+    except BookingError as error:
+        flash(error.message)
+        return render_template('welcome.html', **welcome_context(club))
 
-    # Validation 1 : vérifier que la compétition est dans le futur
-    competition_date = datetime.strptime(competition['date'], '%Y-%m-%d %H:%M:%S')
-    if competition_date < datetime.now():
-        flash('Cannot book places for past competitions.')
-        return render_template('welcome.html', club=club, competitions=competitions)
+    flash('Great-booking complete!')
+    return render_template('welcome.html', **welcome_context(club))
 
-    # Validation 2 : maximum 12 places par réservation
-    if placesRequired > 12:
-        flash('You cannot book more than 12 places per competition.')
-        return render_template('welcome.html', club=club, competitions=competitions)
 
-    # Validation 3 : vérifier que le club a assez de points
-    if points_cost > club_points:
-        flash(f'Not enough points. You need {points_cost} points but only have {club_points}.')
-        return render_template('welcome.html', club=club, competitions=competitions)
+@idempotent
+def purchasePlacesBulk():
+    """
+    Traite en une requête des réservations pour plusieurs compétitions.
 
-    # Déduire les places de la compétition
-    competition['numberOfPlaces'] = int(competition['numberOfPlaces']) - placesRequired
+    Les lignes sont validées en une passe avec les mêmes règles que
+    `purchasePlaces` puis appliquées ensemble (voir BookingEngine.book_many) ;
+    le tableau de bord n'est rendu qu'une fois, avec un message par ligne.
 
-    # Déduire les points du club
-    club['points'] = str(club_points - points_cost)
+    Form Data:
+        club (str): Nom du club
+        competition (list): Noms des compétitions
+        places (list): Places demandées, dans l'ordre des compétitions
+            (les lignes à 0 ou vides sont ignorées)
+        mode (str): `atomic` (défaut, tout ou rien) ou `partial`
+        idempotency_key (str): Clé d'idempotence (optionnelle)
 
-    flash('Great-booking complete!')
-    return render_template('welcome.html', club=club, competitions=competitions)
+    Returns:
+        str: Template HTML du tableau de bord avec le résultat de chaque ligne
+    """
+    club = store.get_club_by_name(request.form.get('club', ''))
+    if club is None:
+        flash("Something went wrong-please try again")
+        return redirect(url_for('index'))
+
+    names = request.form.getlist('competition')
+    places_list = request.form.getlist('places')
+    if len(names) != len(places_list):
+        flash("Something went wrong-please try again")
+        return render_template('welcome.html', **welcome_context(club))
+
+    bookings = []
+    for name, places in zip(names, places_list):
+        competition = store.get_competition_by_name(name)
+        places = places.strip() or '0'
+        if competition is None or not places.lstrip('-').isdigit():
+            flash("Something went wrong-please try again")
+            return render_template('welcome.html', **welcome_context(club))
+        if int(places) != 0:
+            bookings.append((competition, int(places)))
+
+    atomic = request.form.get('mode', 'atomic') != 'partial'
+    for outcome in booking_engine.book_many(club, bookings, atomic=atomic):
+        message = 'Great-booking complete!' if outcome.ok else outcome.error.message
+        flash(f'{outcome.competition.name}: {message}')
+    return render_template('welcome.html', **welcome_context(club))
 
 
 # TODO: Add route for points display
 
 
-@app.route('/leaderboard')
 def leaderboard():
     """
     Affiche le tableau des points de tous les clubs
     Accessible sans authentification (Phase 2)
+
+    Le classement est maintenu de manière incrémentale (voir ranking.py) :
+    seule la page demandée est extraite, et la page rendue est mise en cache
+    jusqu'à la prochaine modification des points (voir cache.py).
+
+    Query Parameters:
+        top (int): N'afficher que les N premiers clubs (pas de pagination)
+        page (int): Numéro de page, à partir de 1 (défaut : 1)
+        per_page (int): Clubs par page (défaut : LEADERBOARD_PER_PAGE)
+
+    Returns:
+        str: Template HTML du leaderboard
+    """
+    max_per_page = current_app.config['LEADERBOARD_MAX_PER_PAGE']
+    top = request.args.get('top', type=int)
+    if top is not None:
+        limit = max(0, min(top, max_per_page))
+        return render_cached(
+            ('leaderboard', versions.clubs, 'top', limit), 'leaderboard.html',
+            lambda: {'clubs': ranking.top(limit), 'offset': 0, 'page': 1, 'pages': 1})
+
+    per_page = request.args.get('per_page', current_app.config['LEADERBOARD_PER_PAGE'], type=int)
+    per_page = max(1, min(per_page, max_per_page))
+    pages = max(1, -(-len(ranking) // per_page))
+    page = max(1, min(request.args.get('page', 1, type=int), pages))
+    offset = (page - 1) * per_page
+    return render_cached(
+        ('leaderboard', versions.clubs, page, per_page), 'leaderboard.html',
+        lambda: {'clubs': ranking.top(per_page, offset), 'offset': offset,
+                 'page': page, 'pages': pages, 'per_page': per_page})
+
+
+def stream_events():
+    """
+    Flux Server-Sent Events des places restantes et des points.
+
+    Les modifications sont regroupées (voir events.py) : au plus un événement
+    `availability` par intervalle `EVENTS_INTERVAL`, contenant la dernière
+    valeur de chaque compteur modifié.
+
+    Returns:
+        flask.Response: Flux `text/event-stream`
     """
-    # Trier les clubs par points décroissants
-    sorted_clubs = sorted(clubs, key=lambda x: int(x['points']), reverse=True)
-    return render_template('leaderboard.html', clubs=sorted_clubs)
+    heartbeat = current_app.config['EVENTS_HEARTBEAT']
+
+    def stream():
+        wakeup = threading.Event()
+        subscription = events.subscribe(wakeup.set)
+        try:
+            while True:
+                if not wakeup.wait(heartbeat):
+                    yield KEEPALIVE
+                    continue
+                wakeup.clear()
+                batch = subscription.take()
+                if batch is not None:
+                    yield format_event(batch)
+        finally:
+            # Client déconnecté : le serveur ferme le générateur
+            events.unsubscribe(subscription)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
-@app.route('/logout')
 def logout():
     """
     Déconnecte l'utilisateur et redirige vers la page d'accueil.
@@ -169,5 +398,219 @@ def logout():
     return redirect(url_for('index'))
 
 
+def health():
+    """
+    Sonde de vivacité : répond dès que le processus accepte des requêtes.
+
+    Returns:
+        tuple: Corps JSON et statut 200
+    """
+    return {'status': 'ok'}, 200
+
+
+def ready():
+    """
+    Sonde de disponibilité pour le répartiteur de charge.
+
+    Lance le préchauffage s'il n'a pas encore eu lieu (mode `lazy`) sans
+    attendre sa fin.
+
+    Returns:
+        tuple: Corps JSON et statut 200 si les données sont chargées,
+               503 pendant le chargement ou après un échec
+    """
+    if loader.ready:
+        return {'status': 'ready', 'load_seconds': loader.load_seconds}, 200
+    if loader.error is not None:
+        return {'status': 'error', 'error': str(loader.error)}, 503
+    loader.start_background()
+    return {'status': 'loading'}, 503
+
+
+# Routes servies sans attendre le chargement des données
+UNGATED_ENDPOINTS = ('health', 'ready', 'metrics', 'static')
+
+
+def ensure_data_loaded():
+    """Charge les données avant la première requête qui en a besoin."""
+    if request.endpoint not in UNGATED_ENDPOINTS:
+        loader.ensure_loaded()
+
+
+# Vues soumises à la limitation de débit et au contrôle d'admission (routes
+# HTML et API de connexion et de réservation)
+GUARDED_VIEWS = ('showSummary', 'purchasePlaces', 'purchasePlacesBulk', 'create_booking',
+                 'create_bookings')
+
+
+def is_guarded():
+    """La requête est-elle une connexion ou une réservation (voir GUARDED_VIEWS) ?"""
+    return request.method == 'POST' and (
+        (request.endpoint or '').rpartition('.')[2] in GUARDED_VIEWS)
+
+
+def rate_limit_keys():
+    """Clés de limitation de débit de la requête : IP, email et club soumis."""
+    email = request.form.get('email', '').strip().lower()
+    club = request.form.get('club')
+    if not club and request.is_json:
+        data = request.get_json(silent=True)
+        club = data.get('club') if isinstance(data, dict) else None
+    return (('ip', request.remote_addr),
+            ('email', email) if email else None,
+            ('club', club) if isinstance(club, str) and club else None)
+
+
+def limit_rate():
+    """
+    Refuse (429) une requête de connexion ou de réservation trop fréquente,
+    avant la logique de route (voir ratelimit.py).
+
+    Returns:
+        flask.Response: Réponse 429 avec `Retry-After`, ou None si acceptée
+    """
+    if rate_limiter.rate <= 0 or not is_guarded():
+        return None
+    retry_after = rate_limiter.hit(rate_limit_keys())
+    if not retry_after:
+        return None
+    message = 'Too many requests, please retry later.'
+    if request.blueprint:
+        response = make_response(dumps({'error': 'rate_limited', 'message': message}), 429)
+        response.mimetype = 'application/json'
+    else:
+        response = make_response(message, 429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def admission_client():
+    """Club à l'origine de la requête, pour l'équité de la file d'attente."""
+    club = request.form.get('club') or request.form.get('email')
+    if not club and request.is_json:
+        data = request.get_json(silent=True)
+        club = data.get('club') if isinstance(data, dict) else None
+    return club if isinstance(club, str) and club else request.remote_addr
+
+
+def admit_request():
+    """
+    Admet une requête de réservation ou répond aussitôt 503 (voir admission.py).
+
+    Returns:
+        flask.Response: Page d'attente (HTML) ou document JSON (API) avec
+        `Retry-After` si la requête n'est pas admise, None sinon
+    """
+    if not is_guarded():
+        return None
+    ticket = request.form.get(TICKET_FIELD) or request.headers.get(TICKET_HEADER)
+    decision = admission.try_admit(admission_client(), ticket)
+    if decision.admitted:
+        g.admission_started = time.perf_counter()
+        return None
+    if request.blueprint:
+        response = make_response(dumps(decision.to_json()), 503)
+        response.mimetype = 'application/json'
+    else:
+        fields = [item for item in request.form.items(multi=True) if item[0] != TICKET_FIELD]
+        response = make_response(
+            render_template('queue.html', admission=decision, fields=fields), 503)
+    response.headers['Retry-After'] = str(decision.retry_after)
+    if decision.ticket:
+        response.headers[TICKET_HEADER] = decision.ticket
+    return response
+
+
+def release_admission(exception=None):
+    """Libère la place d'une requête admise, à la fin de son traitement."""
+    started = g.pop('admission_started', None)
+    if started is not None:
+        admission.release(time.perf_counter() - started)
+
+
+def create_app(config_object=Config):
+    """
+    Crée et configure l'application Flask.
+
+    Les données ne sont pas chargées ici, sauf en mode `eager` : selon
+    `DATA_LOADING`, elles le sont à la première requête (`lazy`) ou dans un
+    thread lancé immédiatement (`background`). Le dépôt est partagé par les
+    applications d'un même processus.
+
+    Args:
+        config_object (object): Classe ou objet de configuration
+
+    Returns:
+        flask.Flask: Application prête à servir
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_object)
+
+    def log_load_progress(path, count):
+        # Journalise l'avancement du chargement des fichiers de données
+        app.logger.info('Loaded %d records from %s', count, path)
+
+    render_cache.max_entries = app.config['RENDER_CACHE_SIZE']
+    idempotency.ttl = app.config['IDEMPOTENCY_TTL']
+    idempotency.max_entries = app.config['IDEMPOTENCY_MAX_KEYS']
+    admission.max_active = app.config['ADMISSION_MAX_ACTIVE']
+    admission.max_queue = app.config['ADMISSION_MAX_QUEUE']
+    admission.ticket_ttl = app.config['ADMISSION_TICKET_TTL']
+    rate_limiter.rate = app.config['RATE_LIMIT_RATE']
+    rate_limiter.burst = app.config['RATE_LIMIT_BURST']
+    rate_limiter.max_keys = app.config['RATE_LIMIT_MAX_KEYS']
+    # Appliqué à la prochaine reconstruction (chargement des données)
+    email_filter.error_rate = app.config['EMAIL_FILTER_ERROR_RATE']
+    events.interval = app.config['EVENTS_INTERVAL']
+    loader.configure(app.config, progress=log_load_progress)
+
+    app.add_url_rule('/', view_func=index)
+    app.add_url_rule('/showSummary', view_func=showSummary, methods=['POST'])
+    app.add_url_rule('/book/<competition>/<club>', view_func=book)
+    app.add_url_rule('/purchasePlaces', view_func=purchasePlaces, methods=['POST'])
+    app.add_url_rule('/purchasePlacesBulk', view_func=purchasePlacesBulk, methods=['POST'])
+    app.add_url_rule('/leaderboard', view_func=leaderboard)
+    app.add_url_rule('/events', view_func=stream_events)
+    app.add_url_rule('/logout', view_func=logout)
+    app.add_url_rule('/health', view_func=health)
+    app.add_url_rule('/ready', view_func=ready)
+    app.register_blueprint(api, url_prefix=f'/api/{API_VERSION}')
+    # Alias non versionné vers la version courante
+    app.register_blueprint(api, url_prefix='/api', name='api_latest')
+    # Le dépôt et le moteur sont partagés : retirer l'instrumentation d'une
+    # application créée auparavant
+    uninstrument(store, booking_engine)
+    if app.config['METRICS_ENABLED']:
+        # Installé avant le chargement des données : la durée mesurée inclut
+        # l'attente d'un chargement différé
+        metrics = Metrics()
+        metrics.install(app, store, booking_engine, render_cache, admission, rate_limiter,
+                        email_filter)
+        app.extensions['gudlft_metrics'] = metrics
+    if app.config['PROFILING_DIR']:
+        profiler = ProfilingMiddleware(
+            app, app.config['PROFILING_DIR'], enabled=app.config['PROFILING_ENABLED'],
+            sample_rate=app.config['PROFILING_SAMPLE_RATE'],
+            threshold=app.config['PROFILING_THRESHOLD'])
+        app.wsgi_app = profiler
+        app.extensions['gudlft_profiling'] = profiler
+    # Avant le chargement des données : une requête refusée ne coûte rien
+    # (limitation inactive tant que RATE_LIMIT_RATE vaut 0)
+    app.before_request(limit_rate)
+    if app.config['ADMISSION_MAX_ACTIVE'] > 0:
+        app.before_request(admit_request)
+        app.teardown_request(release_admission)
+    app.before_request(ensure_data_loaded)
+
+    if app.config['DATA_LOADING'] == 'eager':
+        loader.ensure_loaded()
+    elif app.config['DATA_LOADING'] == 'background':
+        loader.start_background()
+    return app
+
+
+app = create_app()
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,33 @@
+"""
+État partagé de l'application : dépôt, index dérivés et services.
+
+Le dépôt est créé vide : les données sont chargées par `loader` à la première
+requête ou en arrière-plan (voir loading.py et Config.DATA_LOADING). Les
+routes HTML (server.py) et l'API JSON (api.py) utilisent les mêmes instances.
+"""
+from admission import AdmissionController
+from bloom import EmailFilter
+from booking import BookingEngine
+from cache import DataVersions, RenderCache
+from events import EventBroadcaster
+from idempotency import IdempotencyCache
+from ledger import BookingLedger
+from loading import DataLoader
+from ranking import Leaderboard
+from ratelimit import RateLimiter
+from schedule import CompetitionSchedule
+from store import Store
+
+store = Store()
+ranking = Leaderboard(store)
+schedule = CompetitionSchedule(store)
+versions = DataVersions(store)
+render_cache = RenderCache()
+events = EventBroadcaster(store)
+ledger = BookingLedger(store)
+booking_engine = BookingEngine(store, ledger=ledger)
+loader = DataLoader(store, booking_engine)
+idempotency = IdempotencyCache(store)
+admission = AdmissionController()
+rate_limiter = RateLimiter()
+email_filter = EmailFilter(store)
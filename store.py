@@ -0,0 +1,244 @@
+"""
+Dépôt en mémoire des clubs et des compétitions.
+
+Maintient des index (dictionnaires) par email de club, nom de club et nom de
+compétition afin que les routes n'aient plus à parcourir les listes complètes
+à chaque requête.
+"""
+import threading
+
+from models import Club, Competition
+
+
+def _assign(record, fields):
+    for key, value in fields.items():
+        setattr(record, key, value)
+
+
+class StoreListener:
+    """
+    Index secondaire tenu à jour par le dépôt.
+
+    Les sous-classes surchargent les méthodes qui les concernent ; elles sont
+    appelées après chaque mutation correspondante.
+    """
+
+    def reset(self, store):
+        """Le contenu du dépôt a été entièrement remplacé."""
+
+    def club_added(self, club):
+        """Un club a été ajouté."""
+
+    def club_removed(self, club):
+        """Un club a été retiré."""
+
+    def club_updated(self, club, previous):
+        """Des champs d'un club ont changé (`previous` : anciennes valeurs)."""
+
+    def competition_added(self, competition):
+        """Une compétition a été ajoutée."""
+
+    def competition_removed(self, competition):
+        """Une compétition a été retirée."""
+
+    def competition_updated(self, competition, previous):
+        """Des champs d'une compétition ont changé (`previous` : anciennes valeurs)."""
+
+
+class Store:
+    """
+    Dépôt en mémoire des clubs et des compétitions avec index par clé.
+
+    Les listes `clubs` et `competitions` sont conservées (même objet tout au
+    long de la vie du dépôt) pour l'affichage ; les index sont tenus à jour
+    par chaque méthode de mutation. Les lectures ne prennent aucun verrou ;
+    les mutations structurelles (ajout, suppression, renommage) sont
+    sérialisées par un verrou interne.
+    """
+
+    def __init__(self, clubs=None, competitions=None):
+        self._lock = threading.RLock()
+        self.clubs = []
+        self.competitions = []
+        self._clubs_by_email = {}
+        self._clubs_by_name = {}
+        self._competitions_by_name = {}
+        self._listeners = []
+        self.load(clubs or [], competitions or [])
+
+    def add_listener(self, listener):
+        """
+        Abonne un index secondaire aux mutations du dépôt.
+
+        Args:
+            listener (StoreListener): Index à tenir à jour ; il est
+                immédiatement initialisé avec le contenu courant
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            listener.reset(self)
+
+    def load(self, clubs, competitions):
+        """
+        Remplace le contenu du dépôt et reconstruit tous les index.
+
+        Les listes existantes sont modifiées sur place afin que les références
+        déjà distribuées (ex. `server.clubs`) restent valides.
+
+        Args:
+            clubs (list): Clubs à charger
+            competitions (list): Compétitions à charger
+        """
+        clubs = list(clubs)
+        competitions = list(competitions)
+        with self._lock:
+            self.clubs.clear()
+            self.competitions.clear()
+            self._clubs_by_email.clear()
+            self._clubs_by_name.clear()
+            self._competitions_by_name.clear()
+            for club in clubs:
+                self._index_club(club)
+            for competition in competitions:
+                self._index_competition(competition)
+            for listener in self._listeners:
+                listener.reset(self)
+
+    def add_club(self, club):
+        """
+        Ajoute un club et l'indexe par email et par nom.
+
+        Raises:
+            ValueError: Si un club avec le même email ou le même nom existe déjà
+        """
+        with self._lock:
+            self._index_club(club)
+            for listener in self._listeners:
+                listener.club_added(club)
+
+    def _index_club(self, club):
+        if club.email in self._clubs_by_email or club.name in self._clubs_by_name:
+            raise ValueError(f"Duplicate club: {club.name}")
+        self.clubs.append(club)
+        self._clubs_by_email[club.email] = club
+        self._clubs_by_name[club.name] = club
+
+    def add_competition(self, competition):
+        """
+        Ajoute une compétition et l'indexe par nom.
+
+        Raises:
+            ValueError: Si une compétition avec le même nom existe déjà
+        """
+        with self._lock:
+            self._index_competition(competition)
+            for listener in self._listeners:
+                listener.competition_added(competition)
+
+    def _index_competition(self, competition):
+        if competition.name in self._competitions_by_name:
+            raise ValueError(f"Duplicate competition: {competition.name}")
+        self.competitions.append(competition)
+        self._competitions_by_name[competition.name] = competition
+
+    def remove_club(self, name):
+        """Retire un club (par nom) de la liste et des index."""
+        with self._lock:
+            club = self._clubs_by_name.pop(name)
+            del self._clubs_by_email[club.email]
+            self.clubs.remove(club)
+            for listener in self._listeners:
+                listener.club_removed(club)
+            return club
+
+    def remove_competition(self, name):
+        """Retire une compétition (par nom) de la liste et de l'index."""
+        with self._lock:
+            competition = self._competitions_by_name.pop(name)
+            self.competitions.remove(competition)
+            for listener in self._listeners:
+                listener.competition_removed(competition)
+            return competition
+
+    def update_club(self, club, **fields):
+        """
+        Modifie les champs d'un club en réindexant si l'email ou le nom change.
+
+        Args:
+            club (Club): Club présent dans le dépôt
+            **fields: Attributs à modifier (name, email, points)
+        """
+        previous = {key: getattr(club, key) for key in fields}
+        if 'email' not in fields and 'name' not in fields:
+            _assign(club, fields)
+            self._notify('club_updated', club, previous)
+            return
+        with self._lock:
+            new_email = fields.get('email', club.email)
+            new_name = fields.get('name', club.name)
+            if new_email != club.email and new_email in self._clubs_by_email:
+                raise ValueError(f"Duplicate club email: {new_email}")
+            if new_name != club.name and new_name in self._clubs_by_name:
+                raise ValueError(f"Duplicate club: {new_name}")
+            del self._clubs_by_email[club.email]
+            del self._clubs_by_name[club.name]
+            _assign(club, fields)
+            self._clubs_by_email[club.email] = club
+            self._clubs_by_name[club.name] = club
+            self._notify('club_updated', club, previous)
+
+    def update_competition(self, competition, **fields):
+        """
+        Modifie les champs d'une compétition en réindexant si le nom change.
+
+        Args:
+            competition (Competition): Compétition présente dans le dépôt
+            **fields: Attributs à modifier (name, date, number_of_places)
+        """
+        previous = {key: getattr(competition, key) for key in fields}
+        if 'name' not in fields:
+            _assign(competition, fields)
+            self._notify('competition_updated', competition, previous)
+            return
+        with self._lock:
+            new_name = fields['name']
+            if new_name != competition.name and new_name in self._competitions_by_name:
+                raise ValueError(f"Duplicate competition: {new_name}")
+            del self._competitions_by_name[competition.name]
+            _assign(competition, fields)
+            self._competitions_by_name[competition.name] = competition
+            self._notify('competition_updated', competition, previous)
+
+    def _notify(self, event, record, previous):
+        for listener in self._listeners:
+            getattr(listener, event)(record, previous)
+
+    def get_club_by_email(self, email):
+        """Retourne le club associé à l'email, ou None."""
+        return self._clubs_by_email.get(email)
+
+    def get_club_by_name(self, name):
+        """Retourne le club portant ce nom, ou None."""
+        return self._clubs_by_name.get(name)
+
+    def get_competition_by_name(self, name):
+        """Retourne la compétition portant ce nom, ou None."""
+        return self._competitions_by_name.get(name)
+
+    def snapshot(self):
+        """
+        Capture l'état courant au format JSON des fichiers de données.
+
+        Returns:
+            tuple: (liste de dictionnaires clubs, liste de dictionnaires compétitions)
+        """
+        return (
+            [club.to_dict() for club in list(self.clubs)],
+            [competition.to_dict() for competition in list(self.competitions)],
+        )
+
+    def restore(self, snapshot):
+        """Recharge un état capturé par `snapshot()`."""
+        clubs, competitions = snapshot
+        self.load([Club.from_dict(club) for club in clubs],
+                  [Competition.from_dict(competition) for competition in competitions])
@@ -3,7 +3,7 @@ Tests d'intégration pour les parcours utilisateur complets
 Ces tests vérifient le fonctionnement de bout en bout de l'application
 """
 from datetime import datetime, timedelta
-from server import app, clubs, competitions
+from server import app, clubs, competitions, store
 
 
 class TestUserFlow:
@@ -15,24 +15,20 @@ class TestUserFlow:
         app.config['TESTING'] = True
 
         # Sauvegarder l'état initial
-        self.initial_clubs = [club.copy() for club in clubs]
-        self.initial_competitions = [comp.copy() for comp in competitions]
+        self.snapshot = store.snapshot()
 
         # Configurer des dates futures pour les tests
         for comp in competitions:
-            if comp['name'] == 'Spring Festival':
+            if comp.name == 'Spring Festival':
                 future_date = datetime.now() + timedelta(days=30)
-                comp['date'] = future_date.strftime('%Y-%m-%d %H:%M:%S')
-            elif comp['name'] == 'Fall Classic':
+                store.update_competition(comp, date=future_date)
+            elif comp.name == 'Fall Classic':
                 future_date = datetime.now() + timedelta(days=90)
-                comp['date'] = future_date.strftime('%Y-%m-%d %H:%M:%S')
+                store.update_competition(comp, date=future_date)
 
     def teardown_method(self):
         """Restaurer l'état initial après chaque test"""
-        clubs.clear()
-        clubs.extend(self.initial_clubs)
-        competitions.clear()
-        competitions.extend(self.initial_competitions)
+        store.restore(self.snapshot)
 
     def test_complete_booking_flow_success(self):
         """
@@ -50,12 +46,12 @@ class TestUserFlow:
         assert b'Welcome' in response.data
 
         # Vérifier les points initiaux
-        club = [c for c in clubs if c['email'] == 'john@simplylift.co'][0]
-        initial_points = int(club['points'])
+        club = store.get_club_by_email('john@simplylift.co')
+        initial_points = club.points
 
         # Vérifier les places initiales
-        competition = [c for c in competitions if c['name'] == 'Spring Festival'][0]
-        initial_places = int(competition['numberOfPlaces'])
+        competition = store.get_competition_by_name('Spring Festival')
+        initial_places = competition.number_of_places
 
         # Étape 2 : Réservation de 3 places
         response = self.client.post('/purchasePlaces', data={
@@ -69,10 +65,10 @@ class TestUserFlow:
 
         # Étape 3 : Vérification des déductions
         # Points : 3 places × 3 points = 9 points déduits
-        assert int(club['points']) == initial_points - 9
+        assert club.points == initial_points - 9
 
         # Places : 3 places déduites de la compétition
-        assert int(competition['numberOfPlaces']) == initial_places - 3
+        assert competition.number_of_places == initial_places - 3
 
     def test_complete_booking_flow_with_validations(self):
         """
@@ -87,8 +83,8 @@ class TestUserFlow:
             'email': 'admin@irontemple.com'
         })
 
-        club = [c for c in clubs if c['name'] == 'Iron Temple'][0]
-        initial_points = int(club['points'])  # Iron Temple a 4 points
+        club = store.get_club_by_name('Iron Temple')
+        initial_points = club.points  # Iron Temple a 4 points
 
         # Tentative 1 : Plus de 12 places (doit échouer)
         response = self.client.post('/purchasePlaces', data={
@@ -98,7 +94,7 @@ class TestUserFlow:
         }, follow_redirects=True)
 
         assert b'cannot book more than 12 places' in response.data.lower()
-        assert int(club['points']) == initial_points  # Points inchangés
+        assert club.points == initial_points  # Points inchangés
 
         # Tentative 2 : Points insuffisants (doit échouer)
         # Iron Temple a 4 points, 2 places coûtent 6 points
@@ -109,7 +105,7 @@ class TestUserFlow:
         }, follow_redirects=True)
 
         assert b'not enough points' in response.data.lower()
-        assert int(club['points']) == initial_points  # Points toujours inchangés
+        assert club.points == initial_points  # Points toujours inchangés
 
         # Tentative 3 : Réservation valide (1 place = 3 points, Iron Temple peut)
         response = self.client.post('/purchasePlaces', data={
@@ -119,7 +115,7 @@ class TestUserFlow:
         }, follow_redirects=True)
 
         assert b'Great-booking complete!' in response.data
-        assert int(club['points']) == initial_points - 3  # 1 place déduite
+        assert club.points == initial_points - 3  # 1 place déduite
 
     def test_login_booking_leaderboard_flow(self):
         """
@@ -131,8 +127,8 @@ class TestUserFlow:
             'email': 'john@simplylift.co'
         })
 
-        club = [c for c in clubs if c['name'] == 'Simply Lift'][0]
-        initial_points = int(club['points'])
+        club = store.get_club_by_name('Simply Lift')
+        initial_points = club.points
 
         # Réservation
         self.client.post('/purchasePlaces', data={
@@ -177,8 +173,8 @@ class TestUserFlow:
             'email': 'john@simplylift.co'
         })
 
-        club = [c for c in clubs if c['name'] == 'Simply Lift'][0]
-        initial_points = int(club['points'])
+        club = store.get_club_by_name('Simply Lift')
+        initial_points = club.points
 
         # Première réservation : 2 places
         self.client.post('/purchasePlaces', data={
@@ -187,7 +183,7 @@ class TestUserFlow:
             'places': '2'
         })
 
-        points_after_first = int(club['points'])
+        points_after_first = club.points
         assert points_after_first == initial_points - 6
 
         # Deuxième réservation : 1 place pour Fall Classic
@@ -197,7 +193,7 @@ class TestUserFlow:
             'places': '1'
         })
 
-        points_after_second = int(club['points'])
+        points_after_second = club.points
         assert points_after_second == points_after_first - 3
         assert points_after_second == initial_points - 9  # Total : 6 + 3 = 9 points
 
@@ -214,8 +210,8 @@ class TestUserFlow:
 
         # Vérifier que tous les clubs sont affichés
         for club in clubs:
-            assert club['name'].encode() in response.data
-            assert club['points'].encode() in response.data
+            assert club.name.encode() in response.data
+            assert str(club.points).encode() in response.data
 
     def test_booking_page_access(self):
         """
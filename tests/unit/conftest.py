@@ -0,0 +1,20 @@
+"""
+Fixtures partagées des tests unitaires
+"""
+import pytest
+
+
+class FakeClock:
+    """Horloge manuelle"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Horloge manuelle injectée à la place de `time.monotonic`, à 0 au départ"""
+    return FakeClock()
@@ -0,0 +1,104 @@
+"""
+Tests unitaires pour le contrôle d'admission des réservations (admission.py)
+"""
+import server
+from admission import AdmissionController
+from server import app
+
+
+class TestAdmissionController:
+    """Tests pour la classe AdmissionController"""
+
+    def test_requests_beyond_capacity_are_queued_in_order(self):
+        """Test : au-delà de max_active, les requêtes reçoivent un ticket FIFO"""
+        controller = AdmissionController(max_active=1)
+        assert controller.try_admit('A').admitted
+        first = controller.try_admit('B')
+        second = controller.try_admit('C')
+        assert (first.status, first.position) == ('queued', 0)
+        assert (second.status, second.position) == ('queued', 1)
+        assert first.retry_after >= 1
+
+        controller.release(0.01)
+        # C ne double pas B, même en se présentant le premier
+        assert not controller.try_admit('C', second.ticket).admitted
+        assert controller.try_admit('B', first.ticket).admitted
+        assert controller.stats()['queue'] == 1
+
+    def test_club_holds_a_single_place_in_line(self):
+        """Test : les requêtes répétées d'un club partagent son ticket"""
+        controller = AdmissionController(max_active=1)
+        controller.try_admit('A')
+        ticket = controller.try_admit('B').ticket
+        assert controller.try_admit('B').ticket == ticket
+        assert len(controller) == 1
+
+    def test_full_queue_rejects_without_ticket(self):
+        """Test : au-delà de max_queue, la requête est refusée sans ticket"""
+        controller = AdmissionController(max_active=1, max_queue=1)
+        controller.try_admit('A')
+        controller.try_admit('B')
+        rejected = controller.try_admit('C')
+        assert rejected.status == 'rejected'
+        assert rejected.ticket is None
+        assert controller.stats()['rejected'] == 1
+
+    def test_abandoned_head_ticket_expires(self, clock):
+        """Test : un ticket non représenté ne bloque pas la file"""
+        controller = AdmissionController(max_active=1, ticket_ttl=10, clock=clock)
+        controller.try_admit('A')
+        controller.try_admit('B')
+        waiting = controller.try_admit('C')
+        controller.release()
+
+        clock.now = 11
+        controller.try_admit('C', waiting.ticket)
+        assert controller.stats()['expired'] >= 1
+        assert controller.active == 1
+
+
+class TestAdmissionRoutes:
+    """Tests des réponses 503 des routes de réservation"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.client = app.test_client()
+        app.config['TESTING'] = True
+
+    def test_booking_page_queues_with_retry_after(self, monkeypatch):
+        """Test : une réservation en surcharge reçoit la page d'attente"""
+        controller = AdmissionController(max_active=1)
+        controller.try_admit('Other club')
+        monkeypatch.setattr(server, 'admission', controller)
+
+        response = self.client.post('/purchasePlaces', data={
+            'club': 'Simply Lift', 'competition': 'Spring Festival', 'places': '1'})
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'].isdigit()
+        assert b'number <strong>1</strong> in line' in response.data
+        assert b'name="admission_ticket"' in response.data
+
+    def test_api_queue_response_is_json(self, monkeypatch):
+        """Test : l'API retourne le ticket et la position en JSON"""
+        controller = AdmissionController(max_active=1)
+        controller.try_admit('Other club')
+        monkeypatch.setattr(server, 'admission', controller)
+
+        response = self.client.post('/api/v1/bookings', json={
+            'club': 'Simply Lift', 'competition': 'Spring Festival', 'places': 1})
+
+        body = response.get_json()
+        assert response.status_code == 503
+        assert body['error'] == 'queued'
+        assert response.headers['X-Admission-Ticket'] == body['ticket']
+
+    def test_admitted_request_releases_its_slot(self, monkeypatch):
+        """Test : la place est libérée à la fin de la requête"""
+        controller = AdmissionController(max_active=1)
+        monkeypatch.setattr(server, 'admission', controller)
+
+        self.client.post('/showSummary', data={'email': 'unknown@example.com'})
+
+        assert controller.stats()['admitted'] == 1
+        assert controller.active == 0
@@ -0,0 +1,121 @@
+"""
+Tests unitaires pour l'API JSON (api.py)
+"""
+from datetime import datetime, timedelta
+
+from server import app, store
+
+
+class TestApi:
+    """Tests pour les routes /api/v1"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.client = app.test_client()
+        app.config['TESTING'] = True
+        self.snapshot = store.snapshot()
+        store.update_competition(store.get_competition_by_name('Spring Festival'),
+                                 date=datetime.now() + timedelta(days=30))
+
+    def teardown_method(self):
+        """Restaure les données après chaque test"""
+        store.restore(self.snapshot)
+
+    def test_get_club(self):
+        """Test : un club est exposé sans son email"""
+        response = self.client.get('/api/v1/clubs/Simply Lift')
+        assert response.status_code == 200
+        assert response.get_json() == {'name': 'Simply Lift', 'points': 13}
+
+    def test_unknown_club_returns_404(self):
+        """Test : un club inconnu retourne une erreur JSON"""
+        response = self.client.get('/api/clubs/Unknown')
+        assert response.status_code == 404
+        assert response.get_json()['error'] == 'not_found'
+
+    def test_competitions_lists_upcoming_only(self):
+        """Test : les compétitions passées ne sont pas exposées"""
+        names = [c['name'] for c in self.client.get('/api/v1/competitions').get_json()['competitions']]
+        assert 'Spring Festival' in names
+        assert 'Winter Marathon' not in names
+
+    def test_competitions_page_size_has_its_own_maximum(self):
+        """Test : la taille de page des compétitions ne dépend pas du leaderboard"""
+        store.update_competition(store.get_competition_by_name('Fall Classic'),
+                                 date=datetime.now() + timedelta(days=90))
+        app.config.update(COMPETITIONS_MAX_PER_PAGE=1, LEADERBOARD_MAX_PER_PAGE=500)
+        try:
+            body = self.client.get('/api/v1/competitions?per_page=50').get_json()
+        finally:
+            app.config['COMPETITIONS_MAX_PER_PAGE'] = 500
+        assert len(body['competitions']) == 1
+        assert body['pages'] == body['total'] >= 2
+
+    def test_get_competition_even_when_past(self):
+        """Test : une compétition passée reste lisible individuellement"""
+        response = self.client.get('/api/v1/competitions/Winter Marathon')
+        assert response.status_code == 200
+        assert response.get_json()['number_of_places'] == 20
+        assert self.client.get('/api/v1/competitions/Unknown').status_code == 404
+
+    def test_leaderboard_etag_returns_304(self):
+        """Test : un GET conditionnel avec l'ETag courant retourne 304"""
+        response = self.client.get('/api/v1/leaderboard?per_page=2')
+        body = response.get_json()
+        assert body['clubs'][0]['rank'] == 1
+        assert len(body['clubs']) == 2
+
+        cached = self.client.get('/api/v1/leaderboard?per_page=2',
+                                 headers={'If-None-Match': response.headers['ETag']})
+        assert cached.status_code == 304
+
+    def test_booking_updates_club_and_invalidates_cache(self):
+        """Test : une réservation met à jour le club et son document en cache"""
+        etag = self.client.get('/api/v1/clubs/Simply Lift').headers['ETag']
+        response = self.client.post('/api/v1/bookings', json={
+            'club': 'Simply Lift', 'competition': 'Spring Festival', 'places': 2})
+
+        assert response.status_code == 201
+        assert response.get_json()['club']['points'] == 7
+        refreshed = self.client.get('/api/v1/clubs/Simply Lift',
+                                    headers={'If-None-Match': etag})
+        assert refreshed.status_code == 200
+        assert refreshed.get_json()['points'] == 7
+
+    def test_booking_rule_violation_returns_422(self):
+        """Test : une règle enfreinte retourne son motif"""
+        response = self.client.post('/api/v1/bookings', json={
+            'club': 'Iron Temple', 'competition': 'Spring Festival', 'places': 3})
+        assert response.status_code == 422
+        assert response.get_json()['error'] == 'insufficient_points'
+
+    def test_invalid_booking_payload_returns_400(self):
+        """Test : un corps invalide est refusé"""
+        response = self.client.post('/api/v1/bookings', json={'club': 'Simply Lift'})
+        assert response.status_code == 400
+
+    def test_batch_booking_reports_each_line(self):
+        """Test : la réservation groupée partielle détaille chaque ligne"""
+        response = self.client.post('/api/v1/bookings/batch', json={
+            'club': 'Simply Lift', 'atomic': False, 'bookings': [
+                {'competition': 'Spring Festival', 'places': 1},
+                {'competition': 'Winter Marathon', 'places': 1}]})
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body['booked'] is False
+        assert [r.get('error') for r in body['results']] == [None, 'past_competition']
+        assert body['club']['points'] == 10
+
+    def test_batch_booking_limits_places_per_competition(self):
+        """Test : une compétition répétée ne dépasse pas 12 places au total"""
+        store.update_club(store.get_club_by_name('Simply Lift'), points=60)
+        response = self.client.post('/api/v1/bookings/batch', json={
+            'club': 'Simply Lift', 'bookings': [
+                {'competition': 'Spring Festival', 'places': 7},
+                {'competition': 'Spring Festival', 'places': 7}]})
+
+        body = response.get_json()
+        assert body['booked'] is False
+        assert [r.get('error') for r in body['results']] == ['batch_aborted', 'too_many_places']
+        assert store.get_competition_by_name('Spring Festival').number_of_places == 25
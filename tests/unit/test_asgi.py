@@ -0,0 +1,136 @@
+"""
+Tests unitaires pour le point d'entrée ASGI (asgi.py)
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from asgi import application
+from server import store
+from state import events
+
+
+def call(method, path, body=b'', headers=(), query=b''):
+    """Envoie une requête HTTP à l'application ASGI et retourne (statut, en-têtes, corps)"""
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query,
+             'headers': [(b'host', b'testserver')] + list(headers),
+             'http_version': '1.1', 'scheme': 'http', 'root_path': '',
+             'server': ('testserver', 80), 'client': ('127.0.0.1', 5000)}
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    start, response = sent
+    return start['status'], dict(start['headers']), response['body']
+
+
+class TestAsgiApp:
+    """Tests pour la classe AsgiApp"""
+
+    def setup_method(self):
+        """Sauvegarde les données avant chaque test"""
+        self.snapshot = store.snapshot()
+        store.update_competition(store.get_competition_by_name('Spring Festival'),
+                                 date=datetime.now() + timedelta(days=30))
+
+    def teardown_method(self):
+        """Restaure les données après chaque test"""
+        store.restore(self.snapshot)
+
+    def test_native_json_route_with_etag(self):
+        """Test : route native servie depuis le cache avec réponse 304"""
+        status, headers, body = call('GET', '/api/v1/leaderboard', query=b'per_page=1')
+        assert status == 200
+        assert len(json.loads(body)['clubs']) == 1
+
+        status, _, body = call('GET', '/api/v1/leaderboard', query=b'per_page=1',
+                               headers=[(b'if-none-match', headers[b'etag'])])
+        assert status == 304
+        assert body == b''
+
+    def test_native_booking_shares_the_store(self):
+        """Test : une réservation ASGI met à jour le dépôt commun"""
+        payload = {'club': 'Simply Lift', 'competition': 'Spring Festival', 'places': 1}
+        status, _, body = call('POST', '/api/bookings', body=json.dumps(payload).encode(),
+                               headers=[(b'content-type', b'application/json')])
+        assert status == 201
+        assert store.get_club_by_name('Simply Lift').points == 10
+
+    def test_html_routes_go_through_the_wsgi_bridge(self):
+        """Test : les routes HTML et les formulaires passent par l'application Flask"""
+        status, _, body = call(
+            'POST', '/showSummary', body=b'email=john%40simplylift.co',
+            headers=[(b'content-type', b'application/x-www-form-urlencoded')])
+        assert status == 200
+        assert b'Welcome, john@simplylift.co' in body
+
+    def test_health_probe(self):
+        """Test : la sonde de vivacité répond sans passer par Flask"""
+        status, _, body = call('GET', '/health')
+        assert status == 200
+        assert json.loads(body) == {'status': 'ok'}
+
+    def test_events_stream_pushes_availability(self):
+        """Test : une réservation est poussée aux clients du flux /events"""
+        sent = []
+
+        async def scenario():
+            disconnect = asyncio.Event()
+            requested = []
+
+            async def receive():
+                if not requested:
+                    requested.append(True)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+                if b'availability' in message.get('body', b''):
+                    disconnect.set()
+
+            scope = {'type': 'http', 'method': 'GET', 'path': '/events', 'query_string': b'',
+                     'headers': []}
+            task = asyncio.ensure_future(application(scope, receive, send))
+            await asyncio.sleep(0.05)
+            store.update_club(store.get_club_by_name('Simply Lift'), points=5)
+            events.flush()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(scenario())
+        assert sent[0]['headers'][0] == (b'content-type', b'text/event-stream; charset=utf-8')
+        assert b'"Simply Lift":5' in sent[-1]['body']
+
+    def test_websocket_connections_are_closed(self):
+        """Test : une connexion WebSocket est refusée proprement"""
+        messages = [{'type': 'websocket.connect'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(application({'type': 'websocket', 'path': '/'}, receive, send))
+        assert sent == [{'type': 'websocket.close'}]
+
+    def test_unknown_scope_type_is_refused(self):
+        """Test : un type de scope inconnu lève une erreur explicite"""
+        async def receive():
+            return {}
+
+        async def send(message):
+            pass
+
+        with pytest.raises(RuntimeError, match="'webtransport'"):
+            asyncio.run(application({'type': 'webtransport'}, receive, send))
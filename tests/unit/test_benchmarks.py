@@ -0,0 +1,83 @@
+"""
+Tests unitaires pour la suite de benchmarks (benchmarks/)
+"""
+import random
+from datetime import datetime
+
+import pytest
+
+from benchmarks.compare import compare, load_results, save_results
+from benchmarks.dataset import draw, generate_clubs, generate_competitions, write_records
+from benchmarks.load import parse_stats
+from loaders import load_records
+from models import Club, Competition
+
+LOCUST_HEADER = ('Type,Name,Request Count,Failure Count,Median Response Time,'
+                 'Average Response Time,Min Response Time,Max Response Time,'
+                 'Average Content Size,Requests/s,Failures/s,50%,66%,75%,80%,90%,95%,98%,'
+                 '99%,99.9%,99.99%,100%\n')
+
+
+class TestCompare:
+    """Tests pour la détection des régressions"""
+
+    def test_latency_and_throughput_regressions(self):
+        """Test : latence en hausse et débit en baisse au-delà de la tolérance"""
+        baseline = {'a': {'p50': 10, 'p95': 20}, 'b': {'p50': 5, 'rps': 100}}
+        current = {'a': {'p50': 11, 'p95': 30}, 'b': {'p50': 1, 'rps': 70}}
+        assert compare(current, baseline, tolerance=0.2) == [
+            ('a', 'p95', 20, 30), ('b', 'rps', 100, 70)]
+
+    def test_ignores_measures_missing_on_either_side(self):
+        """Test : une mesure nouvelle ou disparue n'est pas une régression"""
+        assert compare({'new': {'p50': 99}}, {'old': {'p50': 1}}) == []
+
+    def test_results_round_trip(self, tmp_path):
+        """Test : les résultats écrits sont relus avec leur contexte"""
+        path = tmp_path / 'results' / 'micro.json'
+        save_results(str(path), 'micro', {'a': {'p50': 1.5}})
+        assert load_results(str(path)) == {'a': {'p50': 1.5}}
+
+
+class TestLoadStats:
+    """Tests pour la lecture des statistiques Locust"""
+
+    def test_parse_locust_stats(self, tmp_path):
+        """Test : une ligne par route, plus le total agrégé"""
+        stats = tmp_path / 'locust_stats.csv'
+        stats.write_text(
+            LOCUST_HEADER
+            + 'GET,/leaderboard,100,2,4,5.1,1,30,900,50.5,1.0,4,5,6,6,8,12,15,20,29,30,30\n'
+            + ',Aggregated,100,2,4,5.1,1,30,900,50.5,1.0,4,5,6,6,8,12,15,20,29,30,30\n')
+        results = parse_stats(str(stats))
+        assert results['load.GET /leaderboard'] == {
+            'p50': 4.0, 'p95': 12.0, 'p99': 20.0, 'rps': 50.5, 'requests': 100,
+            'failures': 2, 'unit': 'ms'}
+        assert 'load.total' in results
+
+
+class TestDataset:
+    """Tests pour le générateur de jeux de données"""
+
+    @pytest.mark.parametrize('distribution', ['uniform', 'normal', 'skewed'])
+    def test_draw_stays_within_bounds(self, distribution):
+        """Test : chaque distribution produit des valeurs entre 0 et le maximum"""
+        rng = random.Random(1)
+        values = [draw(rng, distribution, 30) for _ in range(1000)]
+        assert 0 <= min(values) and max(values) <= 30
+
+    def test_past_ratio(self):
+        """Test : la fraction de compétitions passées suit `past_ratio`"""
+        now = datetime(2030, 1, 1)
+        records = list(generate_competitions(1000, past_ratio=0.25, now=now))
+        past = sum(Competition.from_dict(record).date < now for record in records)
+        assert 200 < past < 300
+
+    @pytest.mark.parametrize('extension', ['json', 'ndjson'])
+    def test_written_files_load_like_the_originals(self, tmp_path, extension):
+        """Test : les fichiers générés se chargent comme clubs.json"""
+        path = str(tmp_path / f'clubs.{extension}')
+        assert write_records(path, 'clubs', generate_clubs(50, seed=3)) == 50
+        clubs = load_records(path, 'clubs', Club.from_dict)
+        assert len({club.email for club in clubs}) == 50
+        assert clubs[0].name == 'Club 0'
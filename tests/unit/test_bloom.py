@@ -0,0 +1,89 @@
+"""
+Tests unitaires pour le filtre de Bloom des emails (bloom.py)
+"""
+from bloom import BloomFilter, EmailFilter
+from models import Club
+import server
+from server import app, store
+from store import Store
+
+
+def make_club(i):
+    """Club minimal d'indice i"""
+    return Club(f'Club {i}', f'secretary{i}@club.com', 10)
+
+
+class TestBloomFilter:
+    """Tests pour la classe BloomFilter"""
+
+    def test_no_false_negatives_and_low_error_rate(self):
+        """Test : toute valeur ajoutée est reconnue, peu de faux positifs"""
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'member{i}')
+
+        assert all(f'member{i}' in bloom for i in range(1000))
+        false_positives = sum(f'other{i}' in bloom for i in range(10000))
+        assert false_positives < 300
+        assert 0 < bloom.false_positive_rate < 0.02
+        # Environ 9,6 bits par valeur pour 1 %
+        assert bloom.memory_bytes < 1300
+
+
+class TestEmailFilter:
+    """Tests pour la classe EmailFilter"""
+
+    def test_filter_follows_store_changes(self):
+        """Test : le filtre suit les chargements, ajouts et changements d'email"""
+        clubs_store = Store([make_club(1)])
+        emails = EmailFilter(clubs_store)
+        assert emails.might_contain('secretary1@club.com')
+        assert not emails.might_contain('unknown@club.com')
+        assert emails.stats()['rejected'] == 1
+
+        clubs_store.add_club(make_club(2))
+        clubs_store.update_club(clubs_store.get_club_by_name('Club 1'), email='new@club.com')
+        assert emails.might_contain('secretary2@club.com')
+        assert emails.might_contain('new@club.com')
+
+        clubs_store.load([make_club(3)], [])
+        assert emails.might_contain('secretary3@club.com')
+        assert not emails.might_contain('secretary2@club.com')
+
+    def test_filter_grows_beyond_capacity(self):
+        """Test : le filtre est reconstruit plus grand quand il est plein"""
+        clubs_store = Store()
+        emails = EmailFilter(clubs_store)
+        for i in range(3000):
+            clubs_store.add_club(make_club(i))
+
+        stats = emails.stats()
+        assert all(emails.might_contain(f'secretary{i}@club.com') for i in range(3000))
+        assert stats['emails'] == 3000
+        assert stats['false_positive_rate'] < 0.01
+
+    def test_unknown_email_login_is_still_refused(self):
+        """Test : un email écarté par le filtre redirige avec le message d'erreur"""
+        client = app.test_client()
+        app.config['TESTING'] = True
+        response = client.post('/showSummary', data={'email': 'nobody@nowhere.com'},
+                               follow_redirects=True)
+        assert b'Sorry, that email was not found.' in response.data
+        assert store.get_club_by_email('nobody@nowhere.com') is None
+
+    def test_email_variants_are_not_false_positives(self, monkeypatch):
+        """Test : le filtre compare les emails comme le dépôt (casse, espaces)"""
+        club = Club('Club', 'Secretary@Club.com', 10)
+        clubs_store = Store([club])
+        emails = EmailFilter(clubs_store)
+        monkeypatch.setattr(server, 'store', clubs_store)
+        monkeypatch.setattr(server, 'email_filter', emails)
+        client = app.test_client()
+        app.config['TESTING'] = True
+
+        for variant in ('secretary@club.com', ' Secretary@Club.com', 'SECRETARY@CLUB.COM'):
+            client.post('/showSummary', data={'email': variant})
+
+        assert emails.stats()['false_positives'] == 0
+        assert emails.stats()['rejected'] == 3
+        assert emails.might_contain('Secretary@Club.com')
@@ -0,0 +1,154 @@
+"""
+Tests unitaires pour le moteur de réservation atomique (booking.py)
+Inclut un test de charge concurrente vérifiant l'absence de survente
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from booking import (BATCH_ABORTED, BookingEngine, BookingError, INSUFFICIENT_POINTS,
+                     NOT_ENOUGH_PLACES, PAST_COMPETITION, TOO_MANY_PLACES)
+from models import Club, Competition
+from store import Store
+
+FUTURE_DATE = '2099-01-01 10:00:00'
+PAST_DATE = '2000-01-01 10:00:00'
+
+
+def make_engine(clubs, competitions):
+    """Construit un moteur sur un dépôt de test"""
+    return BookingEngine(Store(clubs, competitions))
+
+
+class TestBookingEngine:
+    """Tests pour la classe BookingEngine"""
+
+    def test_book_deducts_points_and_places(self):
+        """Test : une réservation valide déduit points et places"""
+        engine = make_engine(
+            [Club('Club', 'c@club.com', 10)], [Competition('Comp', FUTURE_DATE, 5)])
+        club = engine.store.get_club_by_name('Club')
+        competition = engine.store.get_competition_by_name('Comp')
+
+        assert engine.book(club, competition, 2) == 6
+        assert club.points == 4
+        assert competition.number_of_places == 3
+
+    @pytest.mark.parametrize('date, points, places, available, reason', [
+        (PAST_DATE, 30, 1, 5, PAST_COMPETITION),
+        (FUTURE_DATE, 60, 13, 20, TOO_MANY_PLACES),
+        (FUTURE_DATE, 4, 2, 5, INSUFFICIENT_POINTS),
+        (FUTURE_DATE, 30, 3, 2, NOT_ENOUGH_PLACES),
+    ])
+    def test_rejections_leave_state_unchanged(self, date, points, places, available, reason):
+        """Test : un refus porte le bon motif et ne modifie rien"""
+        engine = make_engine(
+            [Club('Club', 'c@club.com', points)], [Competition('Comp', date, available)])
+        club = engine.store.get_club_by_name('Club')
+        competition = engine.store.get_competition_by_name('Comp')
+
+        with pytest.raises(BookingError) as excinfo:
+            engine.book(club, competition, places)
+
+        assert excinfo.value.reason == reason
+        assert club.points == points
+        assert competition.number_of_places == available
+
+    def test_bookings_are_recorded_in_ledger(self):
+        """Test : chaque réservation est inscrite au registre et cumulée"""
+        engine = make_engine(
+            [Club('Club', 'c@club.com', 60)], [Competition('Comp', FUTURE_DATE, 30)])
+        club = engine.store.get_club_by_name('Club')
+        competition = engine.store.get_competition_by_name('Comp')
+        engine.book(club, competition, 8)
+        engine.book(club, competition, 5)
+
+        assert engine.ledger.places_booked('Club', 'Comp') == 13
+        assert len(engine.ledger) == 2
+
+    def test_concurrent_bookings_never_oversell(self):
+        """
+        Test de charge : des milliers de réservations concurrentes ne doivent
+        jamais survendre la compétition ni rendre un solde négatif
+        """
+        # 20 clubs de 150 points peuvent acheter 1000 places : la compétition
+        # est forcément épuisée et les dernières réservations se disputent
+        capacity = 500
+        clubs = [Club(f'Club {i}', f'club{i}@test.com', 150) for i in range(20)]
+        engine = make_engine(clubs, [Competition('Comp', FUTURE_DATE, capacity)])
+        competition = engine.store.get_competition_by_name('Comp')
+
+        def attempt(i):
+            club = engine.store.clubs[i % len(engine.store.clubs)]
+            try:
+                engine.book(club, competition, 1 + i % 3)
+                return 1 + i % 3
+            except BookingError:
+                return 0
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            booked = sum(executor.map(attempt, range(5000)))
+
+        assert booked == capacity
+        assert competition.number_of_places == 0
+        assert engine.ledger.competition_places('Comp') == booked
+        assert all(club.points >= 0 for club in engine.store.clubs)
+        spent = sum(150 - club.points for club in engine.store.clubs)
+        assert spent == booked * 3
+
+
+class TestBookMany:
+    """Tests pour BookingEngine.book_many (réservations groupées)"""
+
+    def make(self):
+        """Moteur avec un club de 30 points et deux compétitions"""
+        engine = make_engine(
+            [Club('Club', 'c@club.com', 30)],
+            [Competition('A', FUTURE_DATE, 5), Competition('B', PAST_DATE, 5)])
+        store = engine.store
+        return engine, store.get_club_by_name('Club'), store.get_competition_by_name('A'), \
+            store.get_competition_by_name('B')
+
+    def test_atomic_batch_is_all_or_nothing(self):
+        """Test : une ligne refusée annule toutes les autres"""
+        engine, club, a, b = self.make()
+        outcomes = engine.book_many(club, [(a, 2), (b, 1)])
+
+        assert [o.error.reason for o in outcomes] == [BATCH_ABORTED, PAST_COMPETITION]
+        assert club.points == 30
+        assert a.number_of_places == 5
+
+    def test_partial_batch_applies_valid_lines(self):
+        """Test : en mode partiel, seules les lignes valides sont appliquées"""
+        engine, club, a, b = self.make()
+        outcomes = engine.book_many(club, [(a, 2), (b, 1)], atomic=False)
+
+        assert [o.ok for o in outcomes] == [True, False]
+        assert club.points == 24
+        assert a.number_of_places == 3
+
+    def test_lines_are_validated_cumulatively(self):
+        """Test : deux lignes d'une même compétition partagent places et points"""
+        engine, club, a, _ = self.make()
+        outcomes = engine.book_many(club, [(a, 3), (a, 3)])
+        assert outcomes[1].error.reason == NOT_ENOUGH_PLACES
+
+        outcomes = engine.book_many(club, [(a, 3), (a, 2)])
+        assert all(o.ok for o in outcomes)
+        assert [o.points_cost for o in outcomes] == [9, 6]
+        assert club.points == 15
+        assert a.number_of_places == 0
+        assert engine.ledger.places_booked('Club', 'A') == 5
+
+    @pytest.mark.parametrize('atomic', [True, False])
+    def test_place_limit_applies_to_the_whole_batch(self, atomic):
+        """Test : répéter une compétition ne contourne pas le maximum de 12 places"""
+        engine = make_engine(
+            [Club('Club', 'c@club.com', 60)], [Competition('A', FUTURE_DATE, 20)])
+        club = engine.store.get_club_by_name('Club')
+        a = engine.store.get_competition_by_name('A')
+        outcomes = engine.book_many(club, [(a, 7), (a, 7)], atomic=atomic)
+
+        assert outcomes[1].error.reason == TOO_MANY_PLACES
+        assert a.number_of_places == (20 if atomic else 13)
+        assert engine.ledger.places_booked('Club', 'A') == (0 if atomic else 7)
@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour la diffusion en temps réel (events.py)
+"""
+import json
+
+from events import EventBroadcaster, format_event
+from models import Club, Competition
+from server import app
+from store import Store
+
+
+def make_broadcaster():
+    """Dépôt et diffuseur dont le thread de publication ne se déclenche pas"""
+    store = Store([Club('A', 'a@club.com', 30)],
+                  [Competition('Comp', '2099-01-01 10:00:00', 100)])
+    return store, EventBroadcaster(store, interval=3600)
+
+
+class TestEventBroadcaster:
+    """Tests pour la classe EventBroadcaster"""
+
+    def test_burst_is_coalesced_into_one_message(self):
+        """Test : une rafale de réservations produit un seul lot, valeurs finales"""
+        store, broadcaster = make_broadcaster()
+        wakeups = []
+        subscription = broadcaster.subscribe(lambda: wakeups.append(1))
+        competition = store.get_competition_by_name('Comp')
+        for places in range(99, 0, -1):
+            store.update_competition(competition, number_of_places=places)
+        store.update_club(store.get_club_by_name('A'), points=3)
+
+        assert broadcaster.flush() == 1
+        assert len(wakeups) == 1
+        assert subscription.take() == {'clubs': {'A': 3}, 'competitions': {'Comp': 1}}
+        assert subscription.take() is None
+
+    def test_slow_subscriber_keeps_only_latest_values(self):
+        """Test : les lots non lus sont fusionnés au lieu d'être empilés"""
+        store, broadcaster = make_broadcaster()
+        subscription = broadcaster.subscribe(lambda: None)
+        competition = store.get_competition_by_name('Comp')
+        store.update_competition(competition, number_of_places=50)
+        broadcaster.flush()
+        store.update_competition(competition, number_of_places=40)
+        broadcaster.flush()
+
+        assert subscription.take() == {'clubs': {}, 'competitions': {'Comp': 40}}
+
+    def test_no_subscriber_records_nothing(self):
+        """Test : sans abonné, les mutations ne coûtent rien"""
+        store, broadcaster = make_broadcaster()
+        store.update_club(store.get_club_by_name('A'), points=1)
+        assert broadcaster.flush() == 0
+
+    def test_event_format(self):
+        """Test : encodage SSE d'un lot"""
+        body = format_event({'clubs': {'A': 3}, 'competitions': {}})
+        assert body.startswith(b'event: availability\ndata: ')
+        assert json.loads(body.split(b'data: ')[1]) == {'clubs': {'A': 3}, 'competitions': {}}
+
+
+class TestEventsRoute:
+    """Tests pour la route /events"""
+
+    def test_stream_sends_keepalive(self):
+        """Test : le flux est un text/event-stream entretenu par des commentaires"""
+        heartbeat = app.config['EVENTS_HEARTBEAT']
+        app.config['EVENTS_HEARTBEAT'] = 0.01
+        try:
+            response = app.test_client().get('/events', buffered=False)
+            chunk = next(response.response)
+            response.close()
+        finally:
+            app.config['EVENTS_HEARTBEAT'] = heartbeat
+
+        assert response.mimetype == 'text/event-stream'
+        assert chunk == b': keepalive\n\n'
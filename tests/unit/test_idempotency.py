@@ -0,0 +1,146 @@
+"""
+Tests unitaires pour les réservations idempotentes (idempotency.py)
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from idempotency import IdempotencyCache, IdempotencyConflict, fingerprint
+from server import app, store
+from store import Store
+
+
+class TestIdempotencyCache:
+    """Tests pour la classe IdempotencyCache"""
+
+    def test_duplicate_key_replays_first_result(self):
+        """Test : la même clé ne relance pas la production"""
+        cache = IdempotencyCache(Store())
+        calls = []
+
+        def produce():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.execute('k', b'f', produce) == 1
+        assert cache.execute('k', b'f', produce) == 1
+        assert calls == [1]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_same_key_with_other_request_is_a_conflict(self):
+        """Test : une clé réutilisée pour un autre corps est refusée"""
+        cache = IdempotencyCache(Store())
+        cache.execute('k', fingerprint('a'), lambda: 1)
+        with pytest.raises(IdempotencyConflict):
+            cache.execute('k', fingerprint('b'), lambda: 2)
+
+    def test_expired_and_evicted_keys_run_again(self, clock):
+        """Test : le TTL et la taille maximale bornent les clés gardées"""
+        cache = IdempotencyCache(Store(), max_entries=2, ttl=10, clock=clock)
+        cache.execute('a', b'', lambda: 1)
+        cache.execute('b', b'', lambda: 1)
+        cache.execute('c', b'', lambda: 1)
+        assert len(cache) == 2
+        assert cache.execute('a', b'', lambda: 2) == 2
+
+        clock.now = 11
+        assert cache.execute('c', b'', lambda: 3) == 3
+
+    def test_requests_in_flight_are_never_evicted(self):
+        """Test : l'éviction ne touche que les réponses terminées"""
+        cache = IdempotencyCache(Store(), max_entries=1)
+
+        def produce_others():
+            # Exécuté pendant que 'k' est en cours : 'a' puis 'b' se remplacent
+            cache.execute('a', b'', lambda: 'a')
+            cache.execute('b', b'', lambda: 'b')
+            return 'k'
+
+        assert cache.execute('k', b'', produce_others) == 'k'
+        assert len(cache) == 1
+        assert cache.execute('k', b'', lambda: 'again') == 'k'
+        assert cache.execute('a', b'', lambda: 'again') == 'again'
+
+    def test_failed_production_frees_the_key(self):
+        """Test : une exception ne laisse pas de réponse à rejouer"""
+        cache = IdempotencyCache(Store())
+
+        def fail():
+            raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            cache.execute('k', b'', fail)
+        assert cache.execute('k', b'', lambda: 'ok') == 'ok'
+
+    def test_concurrent_retry_waits_for_original(self):
+        """Test : une tentative simultanée attend la réponse d'origine"""
+        cache = IdempotencyCache(Store())
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'done'
+
+        first = threading.Thread(target=cache.execute, args=('k', b'', slow))
+        first.start()
+        started.wait(5)
+        results = []
+        retry = threading.Thread(target=lambda: results.append(cache.execute('k', b'', slow)))
+        retry.start()
+        release.set()
+        first.join(5)
+        retry.join(5)
+        assert results == ['done']
+        assert calls == [1]
+
+
+class TestIdempotentRoutes:
+    """Tests pour les routes de réservation avec clé d'idempotence"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.client = app.test_client()
+        app.config['TESTING'] = True
+        self.snapshot = store.snapshot()
+        store.update_competition(store.get_competition_by_name('Spring Festival'),
+                                 date=datetime.now() + timedelta(days=30))
+
+    def teardown_method(self):
+        """Restaure les données après chaque test"""
+        store.restore(self.snapshot)
+
+    def test_resubmitted_form_books_once(self):
+        """Test : un formulaire renvoyé avec la même clé ne réserve qu'une fois"""
+        form = {'club': 'Simply Lift', 'competition': 'Spring Festival', 'places': '1',
+                'idempotency_key': 'form-retry'}
+        first = self.client.post('/purchasePlaces', data=form)
+        retry = self.client.post('/purchasePlaces', data=form)
+
+        assert retry.status_code == first.status_code == 200
+        assert retry.data == first.data
+        assert store.get_club_by_name('Simply Lift').points == 10
+
+    def test_booking_page_carries_a_key(self):
+        """Test : la page de réservation inclut une clé d'idempotence"""
+        response = self.client.get('/book/Spring Festival/Simply Lift')
+        assert b'name="idempotency_key"' in response.data
+
+    def test_api_retry_returns_original_response(self):
+        """Test : l'API rejoue la réponse d'origine pour la même clé"""
+        body = {'club': 'Simply Lift', 'competition': 'Spring Festival', 'places': 2}
+        headers = {'Idempotency-Key': 'api-retry'}
+        first = self.client.post('/api/v1/bookings', json=body, headers=headers)
+        retry = self.client.post('/api/v1/bookings', json=body, headers=headers)
+
+        assert retry.status_code == first.status_code == 201
+        assert retry.get_json() == first.get_json()
+        assert store.get_club_by_name('Simply Lift').points == 7
+
+        conflict = self.client.post('/api/v1/bookings', json=dict(body, places=1),
+                                    headers=headers)
+        assert conflict.status_code == 422
+        assert conflict.get_json()['error'] == 'idempotency_conflict'
@@ -2,7 +2,7 @@
 Tests unitaires pour la route /leaderboard (tableau d'affichage des clubs)
 Phase 2 du projet
 """
-from server import app, clubs
+from server import app, clubs, store
 
 
 class TestLeaderboard:
@@ -29,19 +29,47 @@ class TestLeaderboard:
 
         # Vérifier que tous les clubs sont affichés
         for club in clubs:
-            assert club['name'].encode() in response.data
-            assert club['points'].encode() in response.data
+            assert club.name.encode() in response.data
+            assert str(club.points).encode() in response.data
 
     def test_leaderboard_shows_updated_points(self):
         """
         Test : le tableau doit afficher les points à jour
         """
         # Modifier temporairement les points d'un club
-        original_points = clubs[0]['points']
-        clubs[0]['points'] = '999'
+        original_points = clubs[0].points
+        store.update_club(clubs[0], points=999)
 
         response = self.client.get('/leaderboard')
         assert b'999' in response.data
 
         # Restaurer
-        clubs[0]['points'] = original_points
+        store.update_club(clubs[0], points=original_points)
+
+    def test_leaderboard_is_sorted_by_points(self):
+        """
+        Test : les clubs sont classés par points décroissants
+        """
+        response = self.client.get('/leaderboard')
+        ordered = sorted(clubs, key=lambda x: x.points, reverse=True)
+        positions = [response.data.index(club.name.encode()) for club in ordered]
+        assert positions == sorted(positions)
+
+    def test_leaderboard_top_n(self):
+        """
+        Test : le paramètre top limite le nombre de clubs affichés
+        """
+        response = self.client.get('/leaderboard?top=1')
+        leader = max(clubs, key=lambda x: x.points)
+        assert response.status_code == 200
+        assert response.data.count(b'class="rank"') == 1
+        assert leader.name.encode() in response.data
+
+    def test_leaderboard_pagination(self):
+        """
+        Test : la pagination numérote les rangs à partir du décalage de la page
+        """
+        response = self.client.get('/leaderboard?page=2&per_page=2')
+        assert response.status_code == 200
+        assert b'#3' in response.data
+        assert b'Page 2 / 2' in response.data
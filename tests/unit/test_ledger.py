@@ -0,0 +1,70 @@
+"""
+Tests unitaires pour le registre des réservations (ledger.py)
+"""
+from ledger import BookingLedger
+from models import Club, Competition
+from store import Store
+
+
+def make_ledger():
+    """Registre abonné à un dépôt de test"""
+    store = Store([Club('A', 'a@club.com', 30), Club('B', 'b@club.com', 30)],
+                  [Competition('Comp', '2099-01-01 10:00:00', 10)])
+    return store, BookingLedger(store)
+
+
+class TestBookingLedger:
+    """Tests pour la classe BookingLedger"""
+
+    def test_record_updates_all_totals(self):
+        """Test : chaque entrée alimente les totaux par couple, club et compétition"""
+        _, ledger = make_ledger()
+        ledger.record('A', 'Comp', 2, 6)
+        ledger.record('A', 'Comp', 3, 9)
+        entry = ledger.record('B', 'Comp', 1, 3)
+
+        assert entry.sequence == 3
+        assert ledger.places_booked('A', 'Comp') == 5
+        assert ledger.club_places('A') == 5
+        assert ledger.competition_places('Comp') == 6
+        assert [e.places for e in ledger.entries()] == [2, 3, 1]
+
+    def test_fill_rate_uses_booked_and_remaining_places(self):
+        """Test : taux de remplissage = réservées / (réservées + restantes)"""
+        store, ledger = make_ledger()
+        competition = store.get_competition_by_name('Comp')
+        assert ledger.fill_rate(competition) == 0.0
+
+        ledger.record('A', 'Comp', 2, 6)
+        store.update_competition(competition, number_of_places=8)
+        assert ledger.fill_rate(competition) == 0.2
+
+    def test_restore_and_set_total(self):
+        """Test : totaux rechargés puis alignés sur une valeur relue"""
+        _, ledger = make_ledger()
+        ledger.restore({('A', 'Comp'): 4, ('B', 'Comp'): 1})
+        ledger.set_total('A', 'Comp', 7)
+
+        assert ledger.places_booked('A', 'Comp') == 7
+        assert ledger.competition_places('Comp') == 8
+        assert ledger.totals() == {('A', 'Comp'): 7, ('B', 'Comp'): 1}
+
+    def test_store_reload_clears_ledger(self):
+        """Test : remplacer le contenu du dépôt vide le registre"""
+        store, ledger = make_ledger()
+        ledger.record('A', 'Comp', 2, 6)
+        store.restore(store.snapshot())
+
+        assert len(ledger) == 0
+        assert ledger.places_booked('A', 'Comp') == 0
+
+    def test_entries_are_bounded_but_totals_are_not(self):
+        """Test : seules les entrées récentes sont gardées, les totaux couvrent tout"""
+        store = Store([Club('A', 'a@club.com', 30)], [])
+        ledger = BookingLedger(store, max_entries=3)
+        for _ in range(10):
+            ledger.record('A', 'Comp', 1, 3)
+
+        assert len(ledger) == 3
+        assert [e.sequence for e in ledger.entries()] == [8, 9, 10]
+        assert ledger.places_booked('A', 'Comp') == 10
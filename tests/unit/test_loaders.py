@@ -0,0 +1,64 @@
+"""
+Tests unitaires pour le chargement incrémental (loaders.py)
+"""
+import json
+
+import pytest
+
+import loaders
+from loaders import iter_records, load_records
+from models import Club
+
+
+def club_records(count):
+    """Génère des enregistrements de clubs au format JSON"""
+    return [{'name': f'Club {i}', 'email': f'club{i}@test.com', 'points': str(i % 30)}
+            for i in range(count)]
+
+
+class TestLoaders:
+    """Tests pour les fonctions iter_records et load_records"""
+
+    def test_array_format_across_chunk_boundaries(self, tmp_path, monkeypatch):
+        """Test : des enregistrements coupés entre deux blocs sont bien décodés"""
+        monkeypatch.setattr(loaders, 'CHUNK_SIZE', 7)
+        path = tmp_path / 'clubs.json'
+        records = club_records(50)
+        path.write_text(json.dumps({'clubs': records}, indent=4))
+
+        assert list(iter_records(str(path), 'clubs')) == records
+
+    def test_other_keys_before_the_array_are_skipped(self, tmp_path):
+        """Test : la clé recherchée peut ne pas être la première du document"""
+        path = tmp_path / 'clubs.json'
+        path.write_text('{"version": 2, "clubs": [{"name": "A"}, {"name": "B"}]}')
+
+        assert [r['name'] for r in iter_records(str(path), 'clubs')] == ['A', 'B']
+
+    def test_ndjson_format(self, tmp_path):
+        """Test : un enregistrement par ligne pour les fichiers .ndjson"""
+        path = tmp_path / 'clubs.ndjson'
+        records = club_records(3)
+        path.write_text('\n'.join(json.dumps(r) for r in records) + '\n\n')
+
+        assert list(iter_records(str(path), 'clubs')) == records
+
+    def test_load_records_converts_and_reports_progress(self, tmp_path):
+        """Test : conversion en modèles et notifications de progression"""
+        path = tmp_path / 'clubs.json'
+        path.write_text(json.dumps({'clubs': club_records(25)}))
+        reports = []
+
+        clubs = load_records(str(path), 'clubs', Club.from_dict,
+                             progress=lambda p, n: reports.append(n), progress_every=10)
+
+        assert len(clubs) == 25 and isinstance(clubs[0], Club)
+        assert reports == [10, 20, 25]
+
+    def test_truncated_file_raises(self, tmp_path):
+        """Test : un fichier tronqué lève une erreur de décodage"""
+        path = tmp_path / 'clubs.json'
+        path.write_text('{"clubs": [{"name": "A"}, {"name": ')
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_records(str(path), 'clubs'))
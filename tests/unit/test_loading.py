@@ -0,0 +1,120 @@
+"""
+Tests unitaires pour le chargement différé des données (loading.py)
+"""
+import threading
+
+import pytest
+
+from booking import BookingEngine
+from loading import DataLoader
+from models import Club, Competition
+from server import app, loader
+from store import Store
+
+
+class FakeBackend:
+    """Backend minimal dont le chargement peut être bloqué ou échouer"""
+
+    shared = False
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+        self.loads = 0
+
+    def load_clubs(self):
+        self.release.wait(5)
+        self.loads += 1
+        if self.fail:
+            raise OSError('clubs.json unreadable')
+        return [Club('Club A', 'a@club.com', 10)]
+
+    def load_competitions(self):
+        return [Competition('Comp', '2099-01-01 10:00:00', 5)]
+
+    def load_bookings(self):
+        return {}
+
+    def attach(self, store, ledger=None):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_loader(backend):
+    """Construit un chargeur dont le backend est déjà créé"""
+    store = Store()
+    loader = DataLoader(store, BookingEngine(store))
+    loader.backend = backend
+    return loader
+
+
+class TestDataLoader:
+    """Tests pour la classe DataLoader"""
+
+    def test_ensure_loaded_loads_once(self):
+        """Test : le premier accès charge le dépôt, les suivants sont gratuits"""
+        backend = FakeBackend()
+        loader = make_loader(backend)
+        assert not loader.ready
+        assert loader.store.clubs == []
+
+        loader.ensure_loaded()
+        loader.ensure_loaded()
+
+        assert loader.ready
+        assert backend.loads == 1
+        assert loader.store.get_club_by_email('a@club.com').points == 10
+        assert loader.booking_engine.backend is backend
+
+    def test_request_waits_for_background_warmup(self):
+        """Test : une requête pendant le préchauffage attend au lieu de recharger"""
+        backend = FakeBackend()
+        backend.release.clear()
+        loader = make_loader(backend)
+        loader.start_background()
+
+        with pytest.raises(RuntimeError):
+            loader.ensure_loaded(timeout=0.01)
+        backend.release.set()
+        loader.ensure_loaded(timeout=5)
+
+        assert loader.ready
+        assert backend.loads == 1
+
+    def test_failed_warmup_is_reported_and_retried(self):
+        """Test : l'échec est conservé puis le chargement retenté à la demande"""
+        backend = FakeBackend(fail=True)
+        loader = make_loader(backend)
+        loader.start_background()
+        loader._thread.join(5)
+
+        assert not loader.ready
+        assert isinstance(loader.error, OSError)
+
+        backend.fail = False
+        loader.ensure_loaded()
+        assert loader.ready
+        assert loader.error is None
+
+    def test_unknown_mode_is_rejected(self):
+        """Test : un mode de chargement inconnu lève une erreur explicite"""
+        loader = make_loader(FakeBackend())
+        with pytest.raises(ValueError):
+            loader.configure({'DATA_LOADING': 'later'})
+
+
+class TestProbes:
+    """Tests pour les routes /health et /ready"""
+
+    def test_health_and_ready(self):
+        """Test : vivacité toujours OK, disponibilité une fois les données chargées"""
+        client = app.test_client()
+        assert client.get('/health').status_code == 200
+
+        loader.ensure_loaded()
+        response = client.get('/ready')
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'ready'
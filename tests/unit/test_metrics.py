@@ -0,0 +1,109 @@
+"""
+Tests unitaires pour l'instrumentation Prometheus (metrics.py)
+"""
+from flask import Flask, render_template_string
+
+import server
+from booking import BookingEngine, BookingError
+from cache import RenderCache
+from config import Config
+from metrics import Counter, Histogram, Metrics, Registry, uninstrument
+from models import Club, Competition
+from server import app as main_app
+from store import Store
+
+
+def make_app():
+    """Application minimale instrumentée, isolée de l'application principale"""
+    store = Store([Club('Club', 'c@club.com', 3)],
+                  [Competition('Comp', '2099-01-01 10:00:00', 5)])
+    engine = BookingEngine(store)
+    app = Flask(__name__)
+    metrics = Metrics()
+    metrics.install(app, store, engine, RenderCache())
+
+    @app.route('/book/<int:places>')
+    def book(places):
+        club = store.get_club_by_email('c@club.com')
+        try:
+            engine.book(club, store.get_competition_by_name('Comp'), places)
+        except BookingError as error:
+            return error.message
+        return render_template_string('{{ points }}', points=club.points)
+
+    return app, metrics
+
+
+class TestRegistry:
+    """Tests pour l'exposition au format Prometheus"""
+
+    def test_counter_and_histogram_exposition(self):
+        """Test : format texte des compteurs et histogrammes cumulatifs"""
+        registry = Registry()
+        counter = registry.register(Counter('hits_total', 'Hits.', ('route',)))
+        histogram = registry.register(Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1)))
+        counter.inc('a "quoted" route')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        text = registry.render()
+        assert '# TYPE hits_total counter' in text
+        assert 'hits_total{route="a \\"quoted\\" route"} 1' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+        assert 'latency_seconds_count 2' in text
+
+
+class TestMetrics:
+    """Tests pour l'instrumentation d'une application"""
+
+    def test_requests_templates_lookups_and_bookings_are_measured(self):
+        """Test : latence par route, rendu, recherches et résultats de réservation"""
+        app, metrics = make_app()
+        client = app.test_client()
+        client.get('/book/1')
+        client.get('/book/1')
+
+        assert metrics.requests.value('book', 'GET', '200') == 2
+        assert metrics.request_duration.count('book', 'GET') == 2
+        assert metrics.template_render.count('string') == 1
+        assert metrics.store_lookup.count('get_club_by_email') == 2
+        assert metrics.bookings.value('booked') == 1
+        assert metrics.bookings.value('insufficient_points') == 1
+
+        response = client.get('/metrics')
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert b'gudlft_bookings_total{result="booked"} 1' in response.data
+
+    def test_disabled_by_default(self):
+        """Test : sans METRICS_ENABLED, /metrics n'existe pas"""
+        assert not main_app.config['METRICS_ENABLED']
+        assert main_app.test_client().get('/metrics').status_code == 404
+
+    def test_installation_does_not_stack_and_is_reversible(self):
+        """Test : réinstaller ne superpose pas les enveloppes, uninstrument les retire"""
+        store = Store([Club('Club', 'c@club.com', 3)], [])
+        engine = BookingEngine(store)
+        first, second = Metrics(), Metrics()
+        first.install(Flask('first'), store, engine, RenderCache())
+        second.install(Flask('second'), store, engine, RenderCache())
+
+        store.get_club_by_email('c@club.com')
+        assert first.store_lookup.count('get_club_by_email') == 0
+        assert second.store_lookup.count('get_club_by_email') == 1
+
+        uninstrument(store, engine)
+        assert 'get_club_by_email' not in vars(store)
+        assert 'book' not in vars(engine)
+
+    def test_app_without_metrics_removes_previous_instrumentation(self):
+        """Test : une application créée sans métriques retire celles d'une précédente"""
+        class MetricsConfig(Config):
+            METRICS_ENABLED = True
+
+        server.create_app(MetricsConfig)
+        assert 'book' in vars(server.booking_engine)
+        server.create_app(Config)
+        assert 'book' not in vars(server.booking_engine)
+        assert 'get_club_by_name' not in vars(server.store)
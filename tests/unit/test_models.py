@@ -0,0 +1,36 @@
+"""
+Tests unitaires pour les modèles typés (models.py)
+"""
+from datetime import datetime
+
+import pytest
+
+from models import Club, Competition
+
+
+class TestModels:
+    """Tests pour les classes Club et Competition"""
+
+    def test_club_round_trip(self):
+        """Test : les points sont convertis en entier puis resérialisés en chaîne"""
+        data = {'name': 'Simply Lift', 'email': 'john@simplylift.co', 'points': '13'}
+        club = Club.from_dict(data)
+
+        assert club.points == 13
+        assert club.to_dict() == data
+
+    def test_competition_round_trip(self):
+        """Test : la date est parsée une seule fois et resérialisée au même format"""
+        data = {'name': 'Spring Festival', 'date': '2026-03-27 10:00:00',
+                'numberOfPlaces': '25'}
+        competition = Competition.from_dict(data)
+
+        assert competition.date == datetime(2026, 3, 27, 10, 0, 0)
+        assert competition.number_of_places == 25
+        assert competition.to_dict() == data
+
+    def test_slots_prevent_arbitrary_attributes(self):
+        """Test : pas de __dict__ par instance"""
+        club = Club('A', 'a@club.com', 1)
+        with pytest.raises(AttributeError):
+            club.unknown = True
@@ -0,0 +1,158 @@
+"""
+Tests unitaires pour la persistance par journal (persistence.py)
+"""
+import json
+
+from backends import JsonBackend
+from booking import BookingEngine
+from persistence import JsonPersistence, WriteAheadLog, read_records
+from store import Store
+
+
+CLUB = {'name': 'Club A', 'email': 'a@club.com', 'points': '30'}
+COMPETITION = {'name': 'Comp', 'date': '2099-01-01 10:00:00', 'numberOfPlaces': '20'}
+
+
+def write_snapshots(tmp_path, extension='.json'):
+    """Écrit des snapshots minimaux (s'ils n'existent pas) et retourne leurs chemins"""
+    clubs_path = tmp_path / f'clubs{extension}'
+    competitions_path = tmp_path / f'competitions{extension}'
+    if clubs_path.exists():
+        return str(clubs_path), str(competitions_path)
+    if extension == '.json':
+        clubs_path.write_text(json.dumps({'clubs': [CLUB]}))
+        competitions_path.write_text(json.dumps({'competitions': [COMPETITION]}))
+    else:
+        clubs_path.write_text(json.dumps(CLUB) + '\n')
+        competitions_path.write_text(json.dumps(COMPETITION) + '\n')
+    return str(clubs_path), str(competitions_path)
+
+
+def open_persistence(tmp_path, extension='.json', **kwargs):
+    """Ouvre la persistance et un moteur de réservation branché dessus"""
+    clubs_path, competitions_path = write_snapshots(tmp_path, extension)
+    persistence = JsonPersistence(clubs_path, competitions_path, str(tmp_path / 'wal'),
+                                  flush_interval=0, **kwargs)
+    backend = JsonBackend(clubs_path, competitions_path, persistence)
+    store = Store(backend.load_clubs(), backend.load_competitions())
+    engine = BookingEngine(store, backend=backend)
+    engine.ledger.restore(backend.load_bookings())
+    backend.attach(store, engine.ledger)
+    return persistence, engine
+
+
+class TestWriteAheadLog:
+    """Tests pour la classe WriteAheadLog"""
+
+    def test_appended_records_become_durable(self, tmp_path):
+        """Test : les enregistrements sont écrits sur disque par lots"""
+        wal = WriteAheadLog(str(tmp_path), flush_interval=0.01)
+        for i in range(100):
+            wal.append({'i': i})
+        assert wal.wait_durable(timeout=5)
+        wal.close()
+
+        assert [r['i'] for r in read_records(wal.segments())] == list(range(100))
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        """Test : une ligne tronquée par un crash n'empêche pas la relecture"""
+        segment = tmp_path / 'bookings.wal.1'
+        segment.write_text('{"i":1}\n{"i":2}\n{"i"')
+
+        assert [r['i'] for r in read_records([str(segment)])] == [1, 2]
+
+
+class TestJsonPersistence:
+    """Tests pour la classe JsonPersistence"""
+
+    def test_bookings_survive_restart(self, tmp_path):
+        """Test : une réservation journalisée est rejouée au redémarrage"""
+        persistence, engine = open_persistence(tmp_path)
+        store = engine.store
+        engine.book(store.get_club_by_name('Club A'), store.get_competition_by_name('Comp'), 2)
+        persistence.wal.wait_durable()
+        # Pas de close() : simule un arrêt brutal après le fsync
+
+        restarted, engine = open_persistence(tmp_path)
+        assert engine.store.get_club_by_name('Club A').points == 24
+        assert engine.store.get_competition_by_name('Comp').number_of_places == 18
+        assert engine.ledger.places_booked('Club A', 'Comp') == 2
+        restarted.close()
+        persistence.close()
+
+    def test_compaction_writes_snapshot_and_drops_segments(self, tmp_path):
+        """Test : la compaction écrit les snapshots et supprime l'ancien journal"""
+        persistence, engine = open_persistence(tmp_path, compact_every=10 ** 6)
+        store = engine.store
+        engine.book(store.get_club_by_name('Club A'), store.get_competition_by_name('Comp'), 3)
+
+        persistence.compact()
+
+        with open(tmp_path / 'clubs.json') as c:
+            assert json.load(c)['clubs'][0]['points'] == '21'
+        with open(tmp_path / 'competitions.json') as comps:
+            assert json.load(comps)['competitions'][0]['numberOfPlaces'] == '17'
+        assert list(read_records(persistence.wal.segments())) == []
+        persistence.close()
+
+        restarted, engine = open_persistence(tmp_path)
+        assert engine.store.get_club_by_name('Club A').points == 21
+        # Le total du registre est repris du snapshot bookings.json
+        assert engine.ledger.places_booked('Club A', 'Comp') == 3
+        restarted.close()
+
+    def test_compaction_during_booking_keeps_it(self, tmp_path, monkeypatch):
+        """Test : une compaction entre la validation et l'application ne perd rien"""
+        persistence, engine = open_persistence(tmp_path, compact_every=10 ** 6)
+        store = engine.store
+        commit_booking = engine.backend.commit_booking
+
+        def commit_then_compact(*args):
+            # Compaction concurrente juste après l'écriture de la réservation
+            result = commit_booking(*args)
+            persistence.compact()
+            return result
+
+        monkeypatch.setattr(engine.backend, 'commit_booking', commit_then_compact)
+        engine.book(store.get_club_by_name('Club A'), store.get_competition_by_name('Comp'), 2)
+        persistence.wal.wait_durable()
+
+        restarted, engine = open_persistence(tmp_path)
+        assert engine.store.get_club_by_name('Club A').points == 24
+        assert engine.ledger.places_booked('Club A', 'Comp') == 2
+        restarted.close()
+        persistence.close()
+
+    def test_ndjson_snapshots_survive_compaction_and_restart(self, tmp_path):
+        """Test : la compaction garde le format NDJSON des fichiers de données"""
+        persistence, engine = open_persistence(tmp_path, '.ndjson', compact_every=10 ** 6)
+        store = engine.store
+        engine.book(store.get_club_by_name('Club A'), store.get_competition_by_name('Comp'), 3)
+
+        persistence.compact()
+        persistence.close()
+
+        lines = (tmp_path / 'clubs.ndjson').read_text().splitlines()
+        assert [json.loads(line)['points'] for line in lines] == ['21']
+        restarted, engine = open_persistence(tmp_path, '.ndjson')
+        assert engine.store.get_club_by_name('Club A').points == 21
+        assert engine.store.get_competition_by_name('Comp').number_of_places == 17
+        restarted.close()
+
+    def test_batch_is_a_single_record(self, tmp_path):
+        """Test : une réservation groupée est journalisée en un seul enregistrement"""
+        persistence, engine = open_persistence(tmp_path)
+        store = engine.store
+        competition = store.get_competition_by_name('Comp')
+        engine.book_many(store.get_club_by_name('Club A'), [(competition, 1), (competition, 2)])
+        persistence.wal.wait_durable()
+
+        records = list(read_records(persistence.wal.segments()))
+        assert len(records) == 1
+        assert [line['places'] for line in records[0]['bookings']] == [1, 2]
+        restarted, engine = open_persistence(tmp_path)
+        assert engine.store.get_club_by_name('Club A').points == 21
+        assert engine.store.get_competition_by_name('Comp').number_of_places == 17
+        assert engine.ledger.places_booked('Club A', 'Comp') == 3
+        restarted.close()
+        persistence.close()
@@ -0,0 +1,98 @@
+"""
+Tests unitaires pour le profilage échantillonné (profiling.py)
+"""
+import json
+import os
+import pstats
+import threading
+
+from flask import Flask
+
+import profiling
+from profiling import ProfilingMiddleware, route_slug
+
+
+def make_app(tmp_path, **settings):
+    """Application minimale enveloppée par le middleware de profilage"""
+    app = Flask(__name__)
+
+    @app.route('/items/<name>')
+    def item(name):
+        return name
+
+    middleware = ProfilingMiddleware(app, str(tmp_path), **settings)
+    app.wsgi_app = middleware
+    return app, middleware
+
+
+class TestProfilingMiddleware:
+    """Tests pour l'échantillonnage, l'agrégation et le pilotage à chaud"""
+
+    def test_disabled_profiles_nothing(self, tmp_path):
+        """Test : désactivé, aucune requête n'est profilée"""
+        app, middleware = make_app(tmp_path, sample_rate=1.0)
+        assert app.test_client().get('/items/a').data == b'a'
+        assert middleware.profiled == 0
+
+    def test_aggregates_per_route_and_dumps(self, tmp_path):
+        """Test : les URL d'une même route partagent un profil, écrit en pstats"""
+        app, middleware = make_app(tmp_path, enabled=True, sample_rate=1.0)
+        client = app.test_client()
+        client.get('/items/a')
+        client.get('/items/b')
+        assert middleware.routes() == ['GET /items/<name>']
+
+        paths = middleware.dump()
+        assert [os.path.basename(path) for path in paths] == [
+            f'get_items_name.{os.getpid()}.prof']
+        assert pstats.Stats(paths[0]).total_calls > 0
+
+    def test_threshold_discards_fast_requests(self, tmp_path):
+        """Test : un profil plus court que le seuil n'est pas conservé"""
+        app, middleware = make_app(tmp_path, enabled=True, sample_rate=1.0, threshold=60)
+        app.test_client().get('/items/a')
+        assert middleware.profiled == 1
+        assert middleware.kept == 0
+
+    def test_one_request_profiled_at_a_time(self, tmp_path):
+        """Test : une requête concurrente d'une requête profilée n'est pas profilée"""
+        app, middleware = make_app(tmp_path, enabled=True, sample_rate=1.0)
+        started, release = threading.Event(), threading.Event()
+
+        @app.route('/slow')
+        def slow():
+            started.set()
+            release.wait(5)
+            return 'slow'
+
+        first = threading.Thread(target=app.test_client().get, args=('/slow',))
+        first.start()
+        started.wait(5)
+        assert app.test_client().get('/items/a').data == b'a'
+        release.set()
+        first.join(5)
+
+        assert middleware.profiled == 1
+        assert middleware.routes() == ['GET /slow']
+
+    def test_control_file_toggles_at_runtime(self, tmp_path, monkeypatch):
+        """Test : le fichier de contrôle active puis désactive (et écrit) les profils"""
+        monkeypatch.setattr(profiling, 'CONTROL_CHECK_INTERVAL', 0)
+        app, middleware = make_app(tmp_path)
+        client = app.test_client()
+        control = tmp_path / 'control.json'
+
+        control.write_text(json.dumps({'enabled': True, 'sample_rate': 1}))
+        client.get('/items/a')
+        assert middleware.enabled and middleware.kept == 1
+
+        control.write_text(json.dumps({'enabled': False}))
+        os.utime(control, (0, 0))
+        client.get('/items/b')
+        assert not middleware.enabled and middleware.kept == 1
+        assert list(tmp_path.glob('*.prof'))
+
+    def test_route_slug(self):
+        """Test : nom de fichier dérivé d'une règle d'URL"""
+        assert route_slug('/book/<competition>/<club>') == 'book_competition_club'
+        assert route_slug('/') == 'root'
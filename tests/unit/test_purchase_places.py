@@ -2,7 +2,7 @@
 Tests unitaires pour la fonction purchasePlaces de server.py
 """
 from datetime import datetime, timedelta
-from server import app, clubs, competitions
+from server import app, competitions, store
 
 
 class TestPurchasePlaces:
@@ -14,28 +14,24 @@ class TestPurchasePlaces:
         app.config['TESTING'] = True
 
         # Sauvegarder l'état initial pour restauration
-        self.initial_clubs = [club.copy() for club in clubs]
-        self.initial_competitions = [comp.copy() for comp in competitions]
+        self.snapshot = store.snapshot()
 
         # S'assurer que Spring Festival et Fall Classic sont dans le futur pour les tests
         for comp in competitions:
-            if comp['name'] == 'Spring Festival':
+            if comp.name == 'Spring Festival':
                 future_date = datetime.now() + timedelta(days=30)
-                comp['date'] = future_date.strftime('%Y-%m-%d %H:%M:%S')
-            elif comp['name'] == 'Fall Classic':
+                store.update_competition(comp, date=future_date)
+            elif comp.name == 'Fall Classic':
                 future_date = datetime.now() + timedelta(days=90)
-                comp['date'] = future_date.strftime('%Y-%m-%d %H:%M:%S')
-            elif comp['name'] == 'Winter Marathon':
+                store.update_competition(comp, date=future_date)
+            elif comp.name == 'Winter Marathon':
                 # Celle-ci reste dans le passé pour tester la validation
                 past_date = datetime.now() - timedelta(days=365)
-                comp['date'] = past_date.strftime('%Y-%m-%d %H:%M:%S')
+                store.update_competition(comp, date=past_date)
 
     def teardown_method(self):
         """Restaurer l'état initial après chaque test"""
-        clubs.clear()
-        clubs.extend(self.initial_clubs)
-        competitions.clear()
-        competitions.extend(self.initial_competitions)
+        store.restore(self.snapshot)
 
     def test_purchase_places_deducts_points_from_club(self):
         """
@@ -45,7 +41,7 @@ class TestPurchasePlaces:
         """
         # État initial
         club_name = "Simply Lift"
-        initial_points = int([c for c in clubs if c['name'] == club_name][0]['points'])
+        initial_points = store.get_club_by_name(club_name).points
 
         # Achat de 2 places (devrait coûter 6 points)
         self.client.post('/purchasePlaces', data={
@@ -55,18 +51,18 @@ class TestPurchasePlaces:
         })
 
         # Vérifier que les points ont été déduits
-        club_after = [c for c in clubs if c['name'] == club_name][0]
+        club_after = store.get_club_by_name(club_name)
         expected_points = initial_points - (2 * 3)  # 2 places × 3 points
 
-        assert int(club_after['points']) == expected_points, \
-            f"Points should be {expected_points} but got {club_after['points']}"
+        assert club_after.points == expected_points, \
+            f"Points should be {expected_points} but got {club_after.points}"
 
     def test_purchase_places_deducts_competition_places(self):
         """
         Test : les places de la compétition doivent être déduites
         """
         competition_name = "Spring Festival"
-        initial_places = int([c for c in competitions if c['name'] == competition_name][0]['numberOfPlaces'])
+        initial_places = store.get_competition_by_name(competition_name).number_of_places
 
         self.client.post('/purchasePlaces', data={
             'club': 'Simply Lift',
@@ -74,10 +70,10 @@ class TestPurchasePlaces:
             'places': '3'
         })
 
-        comp_after = [c for c in competitions if c['name'] == competition_name][0]
+        comp_after = store.get_competition_by_name(competition_name)
         expected_places = initial_places - 3
 
-        assert int(comp_after['numberOfPlaces']) == expected_places
+        assert comp_after.number_of_places == expected_places
 
     def test_purchase_more_than_12_places_should_be_rejected(self):
         """
@@ -126,3 +122,58 @@ class TestPurchasePlaces:
         assert b'past' in response.data.lower() or \
                b'cannot book' in response.data.lower() or \
                b'competition has already' in response.data.lower()
+
+    def test_bulk_purchase_books_several_competitions_at_once(self):
+        """Test : une seule requête réserve plusieurs compétitions"""
+        response = self.client.post('/purchasePlacesBulk', data={
+            'club': 'Simply Lift',
+            'competition': ['Spring Festival', 'Fall Classic'],
+            'places': ['2', '1'],
+        })
+        assert response.status_code == 200
+        assert response.data.count(b'Great-booking complete!') == 2
+        assert store.get_club_by_name('Simply Lift').points == 4
+
+    def test_bulk_purchase_is_atomic_by_default(self):
+        """Test : une ligne refusée annule la réservation groupée"""
+        response = self.client.post('/purchasePlacesBulk', data={
+            'club': 'Simply Lift',
+            'competition': ['Spring Festival', 'Winter Marathon'],
+            'places': ['2', '1'],
+        })
+        assert b'past competitions' in response.data
+        assert store.get_club_by_name('Simply Lift').points == 13
+
+    def test_bulk_purchase_ignores_blank_lines(self):
+        """Test : un champ de places vide compte pour 0"""
+        response = self.client.post('/purchasePlacesBulk', data={
+            'club': 'Simply Lift',
+            'competition': ['Spring Festival', 'Fall Classic'],
+            'places': ['2', ' '],
+        })
+        assert response.data.count(b'Great-booking complete!') == 1
+        assert b'Something went wrong' not in response.data
+        assert store.get_club_by_name('Simply Lift').points == 7
+
+    def test_bulk_purchase_rejects_unpaired_lines(self):
+        """Test : autant de compétitions que de champs de places, sinon rien n'est réservé"""
+        response = self.client.post('/purchasePlacesBulk', data={
+            'club': 'Simply Lift',
+            'competition': ['Spring Festival', 'Fall Classic'],
+            'places': ['2'],
+        })
+        assert response.status_code == 200
+        assert b'Something went wrong' in response.data
+        assert b'Great-booking complete!' not in response.data
+        assert store.get_club_by_name('Simply Lift').points == 13
+
+    def test_bulk_purchase_limits_places_per_competition(self):
+        """Test : une compétition répétée ne dépasse pas 12 places au total"""
+        store.update_club(store.get_club_by_name('Simply Lift'), points=60)
+        response = self.client.post('/purchasePlacesBulk', data={
+            'club': 'Simply Lift',
+            'competition': ['Spring Festival', 'Spring Festival'],
+            'places': ['7', '7'],
+        })
+        assert b'more than 12 places' in response.data
+        assert store.get_club_by_name('Simply Lift').points == 60
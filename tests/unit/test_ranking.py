@@ -0,0 +1,54 @@
+"""
+Tests unitaires pour le classement incrémental des clubs (ranking.py)
+"""
+from models import Club
+from ranking import Leaderboard
+from store import Store
+
+
+def make_leaderboard():
+    """Construit un dépôt et son classement"""
+    store = Store(clubs=[
+        Club('A', 'a@club.com', 5),
+        Club('B', 'b@club.com', 12),
+        Club('C', 'c@club.com', 5),
+    ])
+    return store, Leaderboard(store)
+
+
+def names(clubs):
+    """Noms des clubs dans l'ordre"""
+    return [club.name for club in clubs]
+
+
+class TestLeaderboard:
+    """Tests pour la classe Leaderboard"""
+
+    def test_initial_ranking_keeps_store_order_on_ties(self):
+        """Test : tri décroissant, ordre du dépôt conservé à égalité"""
+        _, ranking = make_leaderboard()
+        assert names(ranking.top()) == ['B', 'A', 'C']
+
+    def test_points_update_moves_club(self):
+        """Test : une déduction de points repositionne le club"""
+        store, ranking = make_leaderboard()
+        store.update_club(store.get_club_by_name('B'), points=1)
+        assert names(ranking.top()) == ['A', 'C', 'B']
+
+    def test_top_and_offset(self):
+        """Test : lecture d'une tranche du classement"""
+        _, ranking = make_leaderboard()
+        assert names(ranking.top(1)) == ['B']
+        assert names(ranking.top(2, offset=1)) == ['A', 'C']
+
+    def test_add_remove_rename_and_reload(self):
+        """Test : le classement suit toutes les mutations du dépôt"""
+        store, ranking = make_leaderboard()
+        store.add_club(Club('D', 'd@club.com', 20))
+        store.remove_club('A')
+        store.update_club(store.get_club_by_name('C'), name='C2')
+        assert names(ranking.top()) == ['D', 'B', 'C2']
+
+        store.load([Club('E', 'e@club.com', 1)], [])
+        assert names(ranking.top()) == ['E']
+        assert len(ranking) == 1
@@ -0,0 +1,70 @@
+"""
+Tests unitaires pour la limitation de débit (ratelimit.py)
+"""
+import json
+
+import asgi
+import server
+from ratelimit import RateLimiter
+from server import app
+from tests.unit.test_asgi import call
+
+
+class TestRateLimiter:
+    """Tests pour la classe RateLimiter"""
+
+    def test_bucket_refills_over_time(self, clock):
+        """Test : au-delà de la capacité, la clé attend la recharge"""
+        limiter = RateLimiter(rate=2, burst=2, clock=clock)
+        assert limiter.hit([('ip', 'a')]) == 0
+        assert limiter.hit([('ip', 'a')]) == 0
+        assert limiter.hit([('ip', 'a')]) == 1
+
+        clock.now = 0.5
+        assert limiter.hit([('ip', 'a')]) == 0
+        assert (limiter.allowed, limiter.limited) == (3, 1)
+
+    def test_refused_request_debits_no_bucket(self, clock):
+        """Test : une requête refusée ne consomme pas les jetons des autres clés"""
+        limiter = RateLimiter(rate=1, burst=1, clock=clock)
+        limiter.hit([('email', 'x@club.com')])
+        assert limiter.hit([('ip', 'a'), ('email', 'x@club.com')]) == 1
+        assert limiter.hit([('ip', 'a'), None]) == 0
+
+    def test_buckets_are_bounded(self, clock):
+        """Test : les clés les moins récentes sont évincées"""
+        limiter = RateLimiter(max_keys=3, clock=clock)
+        for i in range(10):
+            limiter.hit([('ip', str(i))])
+        assert len(limiter) == 3
+
+
+class TestRateLimitedRoutes:
+    """Tests des réponses 429 des routes de connexion et de réservation"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.client = app.test_client()
+        app.config['TESTING'] = True
+
+    def test_repeated_failed_logins_get_429(self, monkeypatch):
+        """Test : les tentatives répétées avec le même email sont refusées"""
+        monkeypatch.setattr(server, 'rate_limiter', RateLimiter(rate=0.1, burst=2))
+        statuses = [self.client.post('/showSummary', data={'email': ' Bad@Example.com'}
+                                     ).status_code for _ in range(3)]
+
+        assert statuses == [302, 302, 429]
+        response = self.client.post('/showSummary', data={'email': 'bad@example.com'})
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+
+    def test_asgi_booking_is_limited_per_club(self, monkeypatch):
+        """Test : les réservations ASGI d'un même club sont limitées"""
+        monkeypatch.setattr(asgi, 'rate_limiter', RateLimiter(rate=0.1, burst=1))
+        body = json.dumps({'club': 'Unknown', 'competition': 'Nope', 'places': 1}).encode()
+
+        assert call('POST', '/api/bookings', body=body)[0] == 404
+        status, headers, payload = call('POST', '/api/bookings', body=body)
+        assert status == 429
+        assert json.loads(payload)['error'] == 'rate_limited'
+        assert b'retry-after' in headers
@@ -0,0 +1,95 @@
+"""
+Tests unitaires pour le cache de pages rendues (cache.py)
+"""
+from cache import DataVersions, RenderCache
+from models import Club
+from server import app, render_cache, store
+from store import Store
+
+
+class TestRenderCache:
+    """Tests pour les classes RenderCache et DataVersions"""
+
+    def test_lru_eviction(self):
+        """Test : l'entrée la moins récemment utilisée est évincée"""
+        cache = RenderCache(max_entries=2)
+        cache.get_or_render('a', lambda: 'A')
+        cache.get_or_render('b', lambda: 'B')
+        cache.get_or_render('a', lambda: 'A')
+        cache.get_or_render('c', lambda: 'C')
+
+        assert len(cache) == 2
+        assert cache.get_or_render('a', lambda: 'new').body == b'A'
+        assert cache.get_or_render('b', lambda: 'new').body == b'new'
+
+    def test_disabled_cache_always_renders(self):
+        """Test : une taille nulle désactive le cache"""
+        cache = RenderCache(max_entries=0)
+        cache.get_or_render('a', lambda: 'A')
+        assert cache.get_or_render('a', lambda: 'B').body == b'B'
+        assert len(cache) == 0
+
+    def test_versions_follow_club_updates(self):
+        """Test : modifier un club incrémente sa version et celle des clubs"""
+        store = Store(clubs=[Club('A', 'a@club.com', 5), Club('B', 'b@club.com', 5)])
+        versions = DataVersions(store)
+        before = (versions.clubs, versions.club('A'), versions.club('B'))
+
+        store.update_club(store.get_club_by_name('A'), points=2)
+
+        assert versions.clubs > before[0]
+        assert versions.club('A') > before[1]
+        assert versions.club('B') == before[2]
+
+
+class TestCachedRoutes:
+    """Tests du cache sur les routes /leaderboard et /showSummary"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.client = app.test_client()
+        app.config['TESTING'] = True
+        self.snapshot = store.snapshot()
+
+    def teardown_method(self):
+        """Restaurer l'état initial après chaque test"""
+        store.restore(self.snapshot)
+
+    def test_leaderboard_served_from_cache(self):
+        """Test : une seconde lecture ne repasse pas par le template"""
+        self.client.get('/leaderboard')
+        hits = render_cache.hits
+
+        response = self.client.get('/leaderboard')
+
+        assert response.status_code == 200
+        assert render_cache.hits == hits + 1
+
+    def test_leaderboard_conditional_get(self):
+        """Test : un ETag inchangé retourne 304 sans corps"""
+        etag = self.client.get('/leaderboard').headers['ETag']
+
+        response = self.client.get('/leaderboard', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_points_change_invalidates_leaderboard(self):
+        """Test : une modification des points change l'ETag et le contenu"""
+        etag = self.client.get('/leaderboard').headers['ETag']
+        store.update_club(store.clubs[0], points=777)
+
+        response = self.client.get('/leaderboard', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert b'777' in response.data
+
+    def test_welcome_page_reflects_new_points(self):
+        """Test : le tableau de bord en cache suit les points du club"""
+        club = store.get_club_by_email('john@simplylift.co')
+        self.client.post('/showSummary', data={'email': club.email})
+        store.update_club(club, points=42)
+
+        response = self.client.post('/showSummary', data={'email': club.email})
+
+        assert b'Points available: 42' in response.data
@@ -0,0 +1,62 @@
+"""
+Tests unitaires pour l'index des compétitions à venir (schedule.py)
+"""
+from datetime import datetime
+
+from models import Competition
+from schedule import CompetitionSchedule
+from store import Store
+
+NOW = datetime(2030, 6, 1, 12, 0)
+
+
+def make_schedule():
+    """Construit un dépôt et son index de compétitions"""
+    store = Store(competitions=[
+        Competition('Past', '2020-01-01 10:00:00', 10),
+        Competition('July', '2030-07-01 10:00:00', 10),
+        Competition('June', '2030-06-15 10:00:00', 10),
+        Competition('Full', '2030-06-20 10:00:00', 0),
+        Competition('August', '2030-08-01 10:00:00', 10),
+    ])
+    return store, CompetitionSchedule(store)
+
+
+def names(competitions):
+    """Noms des compétitions dans l'ordre"""
+    return [competition.name for competition in competitions]
+
+
+class TestCompetitionSchedule:
+    """Tests pour la classe CompetitionSchedule"""
+
+    def test_upcoming_skips_past_and_full_competitions(self):
+        """Test : seules les compétitions futures avec des places, par date"""
+        _, schedule = make_schedule()
+        assert names(schedule.upcoming(NOW)) == ['June', 'July', 'August']
+        assert schedule.count_upcoming(NOW) == 3
+
+    def test_pagination(self):
+        """Test : lecture d'une page de l'index"""
+        _, schedule = make_schedule()
+        assert names(schedule.upcoming(NOW, 2)) == ['June', 'July']
+        assert names(schedule.upcoming(NOW, 2, offset=2)) == ['August']
+
+    def test_time_passing_needs_no_update(self):
+        """Test : une compétition passée sort de l'index sans recalcul"""
+        _, schedule = make_schedule()
+        later = datetime(2030, 7, 15)
+        assert names(schedule.upcoming(later)) == ['August']
+        assert schedule.count_upcoming(later) == 1
+
+    def test_index_follows_store_mutations(self):
+        """Test : complet, libéré, déplacé, renommé, supprimé"""
+        store, schedule = make_schedule()
+        store.update_competition(store.get_competition_by_name('June'), number_of_places=0)
+        store.update_competition(store.get_competition_by_name('Full'), number_of_places=3)
+        store.update_competition(store.get_competition_by_name('August'),
+                                 date=datetime(2030, 6, 2), name='Early August')
+        store.remove_competition('July')
+        store.add_competition(Competition('September', '2030-09-01 10:00:00', 5))
+
+        assert names(schedule.upcoming(NOW)) == ['Early August', 'Full', 'September']
@@ -1,7 +1,9 @@
 """
 Tests unitaires pour la fonction showSummary de server.py
 """
-from server import app
+from datetime import datetime, timedelta
+
+from server import app, store
 
 
 class TestShowSummary:
@@ -33,3 +35,18 @@ class TestShowSummary:
         # Elle doit renvoyer une erreur propre (flash message + redirection)
         assert response.status_code != 500
         assert b'Sorry' in response.data or response.status_code == 302
+
+    def test_show_summary_lists_only_upcoming_competitions(self):
+        """Test : les compétitions passées ne sont plus affichées"""
+        snapshot = store.snapshot()
+        try:
+            for comp in store.competitions:
+                store.update_competition(comp, date=datetime.now() - timedelta(days=1))
+            store.update_competition(store.get_competition_by_name('Fall Classic'),
+                                     date=datetime.now() + timedelta(days=1))
+            response = self.client.post('/showSummary', data={'email': 'john@simplylift.co'})
+        finally:
+            store.restore(snapshot)
+
+        assert b'Fall Classic' in response.data
+        assert b'Spring Festival' not in response.data
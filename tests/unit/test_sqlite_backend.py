@@ -0,0 +1,153 @@
+"""
+Tests unitaires pour le backend SQLite (backends.py)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backends import SqliteBackend, create_backend
+from booking import BookingEngine, BookingError, NOT_ENOUGH_PLACES
+from models import Club, Competition
+from store import Store
+
+
+def seed_clubs():
+    """Clubs importés dans une base vide"""
+    return [Club(f'Club {i}', f'club{i}@test.com', 30) for i in range(10)]
+
+
+def seed_competitions():
+    """Compétitions importées dans une base vide"""
+    return [Competition('Comp', '2099-01-01 10:00:00', 10)]
+
+
+def open_worker(path, competitions=None):
+    """Simule un worker : backend propre et dépôt chargé depuis la base"""
+    backend = SqliteBackend(
+        path, seed_clubs, seed_competitions if competitions is None else lambda: competitions)
+    store = Store(backend.load_clubs(), backend.load_competitions())
+    engine = BookingEngine(store, backend=backend)
+    engine.ledger.restore(backend.load_bookings())
+    return engine
+
+
+class TestSqliteBackend:
+    """Tests pour la classe SqliteBackend"""
+
+    def test_empty_database_is_seeded_once(self, tmp_path):
+        """Test : la base vide est initialisée depuis les données JSON"""
+        path = str(tmp_path / 'gudlft.db')
+        backend = SqliteBackend(path, seed_clubs, seed_competitions)
+        assert len(backend.load_clubs()) == 10
+        backend.close()
+
+        reopened = SqliteBackend(path, seed_clubs, seed_competitions)
+        assert len(reopened.load_clubs()) == 10
+        assert reopened.load_competitions()[0].number_of_places == 10
+        reopened.close()
+
+    def test_short_lived_threads_do_not_leak_connections(self, tmp_path):
+        """Test : les connexions sont rendues au pool borné, pas gardées par thread"""
+        backend = SqliteBackend(str(tmp_path / 'gudlft.db'), seed_clubs, seed_competitions,
+                                pool_size=2)
+        opened = []
+        connect = backend._connect
+        backend._connect = lambda: opened.append(connect()) or opened[-1]
+
+        for _ in range(50):
+            # Un thread par requête, comme une greenlet par requête sous gevent
+            thread = threading.Thread(target=backend.booked_places, args=('Club 0', 'Comp'))
+            thread.start()
+            thread.join()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: backend.load_bookings(), range(200)))
+
+        assert len(opened) <= 8
+        assert len(backend._idle) <= 2
+        backend.close()
+        assert backend._idle == []
+
+    def test_booking_is_persisted(self, tmp_path):
+        """Test : une réservation est visible par un autre worker"""
+        path = str(tmp_path / 'gudlft.db')
+        engine = open_worker(path)
+        store = engine.store
+        engine.book(store.get_club_by_name('Club 0'), store.get_competition_by_name('Comp'), 2)
+
+        other = open_worker(path)
+        assert other.store.get_club_by_name('Club 0').points == 24
+        assert other.store.get_competition_by_name('Comp').number_of_places == 8
+
+    def test_guard_prevents_oversell_between_workers(self, tmp_path):
+        """Test : un worker à l'état périmé ne peut pas survendre"""
+        path = str(tmp_path / 'gudlft.db')
+        first, second = open_worker(path), open_worker(path)
+
+        first.book(first.store.get_club_by_name('Club 0'),
+                   first.store.get_competition_by_name('Comp'), 8)
+
+        # Le second worker croit encore qu'il reste 10 places
+        competition = second.store.get_competition_by_name('Comp')
+        with pytest.raises(BookingError) as excinfo:
+            second.book(second.store.get_club_by_name('Club 1'), competition, 3)
+
+        assert excinfo.value.reason == NOT_ENOUGH_PLACES
+        assert competition.number_of_places == 2
+
+    def test_atomic_batch_rolls_back_on_stale_state(self, tmp_path):
+        """Test : une réservation groupée est annulée entièrement si la base a changé"""
+        path = str(tmp_path / 'gudlft.db')
+        seed = [Competition('Comp', '2099-01-01 10:00:00', 10),
+                Competition('Other', '2099-02-01 10:00:00', 10)]
+        first, second = open_worker(path, seed), open_worker(path, seed)
+
+        second.book(second.store.get_club_by_name('Club 1'),
+                    second.store.get_competition_by_name('Other'), 9)
+        store = first.store
+        outcomes = first.book_many(store.get_club_by_name('Club 0'), [
+            (store.get_competition_by_name('Comp'), 2),
+            (store.get_competition_by_name('Other'), 2)])
+
+        assert not any(outcome.ok for outcome in outcomes)
+        reopened = open_worker(path).store
+        assert reopened.get_club_by_name('Club 0').points == 30
+        assert reopened.get_competition_by_name('Comp').number_of_places == 10
+
+    def test_concurrent_threads_never_oversell(self, tmp_path):
+        """Test : les connexions par thread respectent les conditions de garde"""
+        path = str(tmp_path / 'gudlft.db')
+        workers = [open_worker(path) for _ in range(4)]
+
+        def attempt(i):
+            engine = workers[i % len(workers)]
+            try:
+                engine.book(engine.store.get_club_by_name(f'Club {i % 10}'),
+                            engine.store.get_competition_by_name('Comp'), 1)
+                return 1
+            except BookingError:
+                return 0
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            booked = sum(executor.map(attempt, range(200)))
+
+        assert booked == 10
+        assert open_worker(path).store.get_competition_by_name('Comp').number_of_places == 0
+
+    def test_synchronize_applies_other_workers_bookings(self, tmp_path):
+        """Test : un worker relit via le flux de modifications les réservations d'un autre"""
+        path = str(tmp_path / 'gudlft.db')
+        first, second = open_worker(path), open_worker(path)
+        first.book(first.store.get_club_by_name('Club 0'),
+                   first.store.get_competition_by_name('Comp'), 2)
+
+        assert second.synchronize() == 2
+        assert second.store.get_club_by_name('Club 0').points == 24
+        assert second.store.get_competition_by_name('Comp').number_of_places == 8
+        assert second.ledger.places_booked('Club 0', 'Comp') == 2
+        assert second.synchronize() == 0
+
+    def test_unknown_backend_is_rejected(self):
+        """Test : un nom de backend inconnu lève une erreur explicite"""
+        with pytest.raises(ValueError):
+            create_backend({'STORAGE_BACKEND': 'redis'})
@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour le dépôt en mémoire (store.py)
+"""
+import pytest
+
+from models import Club, Competition
+from store import Store
+
+
+def make_store():
+    """Construit un petit dépôt de test"""
+    return Store(
+        clubs=[
+            Club('Club A', 'a@club.com', 10),
+            Club('Club B', 'b@club.com', 5),
+        ],
+        competitions=[
+            Competition('Comp 1', '2099-01-01 10:00:00', 20),
+        ],
+    )
+
+
+class TestStore:
+    """Tests pour la classe Store"""
+
+    def test_lookup_by_email_and_name(self):
+        """Test : les index retournent les bons enregistrements"""
+        store = make_store()
+        assert store.get_club_by_email('a@club.com').name == 'Club A'
+        assert store.get_club_by_name('Club B').email == 'b@club.com'
+        assert store.get_competition_by_name('Comp 1').number_of_places == 20
+
+    def test_unknown_keys_return_none(self):
+        """Test : une clé inconnue retourne None au lieu de lever IndexError"""
+        store = make_store()
+        assert store.get_club_by_email('unknown@club.com') is None
+        assert store.get_club_by_name('Unknown') is None
+        assert store.get_competition_by_name('Unknown') is None
+
+    def test_update_club_reindexes_renamed_keys(self):
+        """Test : changer l'email d'un club met à jour l'index"""
+        store = make_store()
+        club = store.get_club_by_email('a@club.com')
+        store.update_club(club, email='new@club.com', points=7)
+
+        assert store.get_club_by_email('a@club.com') is None
+        assert store.get_club_by_email('new@club.com') is club
+        assert club.points == 7
+
+    def test_update_club_rejects_duplicate_email(self):
+        """Test : un email déjà utilisé par un autre club est refusé"""
+        store = make_store()
+        club = store.get_club_by_name('Club A')
+        with pytest.raises(ValueError):
+            store.update_club(club, email='b@club.com')
+
+    def test_add_and_remove_keep_list_and_indexes_consistent(self):
+        """Test : ajout et suppression maintiennent liste et index"""
+        store = make_store()
+        store.add_competition(Competition('Comp 2', '2099-02-01 10:00:00', 5))
+        assert len(store.competitions) == 2
+
+        store.remove_club('Club A')
+        assert store.get_club_by_email('a@club.com') is None
+        assert [c.name for c in store.clubs] == ['Club B']
+
+    def test_restore_keeps_list_identity(self):
+        """Test : restaurer un snapshot conserve les mêmes objets liste"""
+        store = make_store()
+        clubs = store.clubs
+        snapshot = store.snapshot()
+        store.update_club(store.get_club_by_name('Club A'), points=0)
+
+        store.restore(snapshot)
+
+        assert store.clubs is clubs
+        assert store.get_club_by_name('Club A').points == 10
@@ -0,0 +1,114 @@
+"""
+Tests unitaires pour le lanceur pré-forké (wsgi.py)
+
+Le maître et les workers tournent dans un processus Python neuf : forker le
+processus de pytest (et ses threads) n'est pas sûr.
+"""
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+import wsgi
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Maître à deux workers minimaux qui répondent leur pid à chaque connexion
+ECHO_ARBITER = textwrap.dedent('''
+    import os, signal, sys
+    import wsgi
+
+    def run_worker(listener, worker_id):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        while True:
+            connection, _ = listener.accept()
+            connection.sendall(str(os.getpid()).encode())
+            connection.close()
+
+    wsgi.run_worker = run_worker
+    wsgi.RESPAWN_DELAY = 0
+    listener = wsgi.create_listener('127.0.0.1', 0)
+    print(listener.getsockname()[1], flush=True)
+    wsgi.Arbiter(listener, 2).run()
+''')
+
+# Un worker gevent réel, qui importe l'application
+GEVENT_WORKER = textwrap.dedent('''
+    import wsgi
+
+    listener = wsgi.create_listener('127.0.0.1', 0)
+    print(listener.getsockname()[1], flush=True)
+    wsgi.run_worker(listener, 0)
+''')
+
+
+def start(script):
+    """Lance un script dans un nouveau processus et retourne (processus, port)"""
+    process = subprocess.Popen([sys.executable, '-c', script], cwd=ROOT,
+                               stdout=subprocess.PIPE, text=True)
+    return process, int(process.stdout.readline())
+
+
+def worker_pids(port, expected, timeout=5.0):
+    """Interroge les workers jusqu'à voir `expected` pids distincts"""
+    pids = set()
+    deadline = time.monotonic() + timeout
+    while len(pids) < expected and time.monotonic() < deadline:
+        with socket.create_connection(('127.0.0.1', port), timeout=1) as connection:
+            reply = connection.recv(16)
+        # Réponse vide : connexion perdue avec un worker qui vient d'être tué
+        if reply:
+            pids.add(int(reply))
+    return pids
+
+
+class TestArbiter:
+    """Tests pour le processus maître"""
+
+    def test_workers_are_respawned_then_stopped(self):
+        """Test : un worker tué est relancé, SIGTERM arrête le maître et les workers"""
+        arbiter, port = start(ECHO_ARBITER)
+        try:
+            pids = worker_pids(port, 2)
+            assert len(pids) == 2
+
+            killed = min(pids)
+            os.kill(killed, signal.SIGKILL)
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                current = worker_pids(port, 2, timeout=0.5)
+                if killed not in current and len(current) == 2:
+                    break
+            else:
+                raise AssertionError('worker was not respawned')
+        finally:
+            arbiter.send_signal(signal.SIGTERM)
+        assert arbiter.wait(timeout=5) == 0
+
+    def test_several_workers_need_sqlite(self, monkeypatch):
+        """Test : plusieurs workers avec le backend JSON sont refusés"""
+        monkeypatch.setenv('GUDLFT_STORAGE_BACKEND', 'json')
+        with pytest.raises(SystemExit):
+            wsgi.main(['--workers', '2', '--bind', '127.0.0.1:0'])
+
+
+class TestRunWorker:
+    """Test de fumée du worker gevent"""
+
+    def test_worker_serves_the_application(self):
+        """Test : un worker gevent répond sur le socket hérité"""
+        pytest.importorskip('gevent')
+        worker, port = start(GEVENT_WORKER)
+        try:
+            client = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            client.request('GET', '/')
+            assert client.getresponse().status == 200
+        finally:
+            worker.kill()
+            worker.wait(timeout=5)
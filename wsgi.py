@@ -0,0 +1,159 @@
+"""
+Lanceur de production : workers gevent pré-forkés sur un socket partagé.
+
+Le processus maître ouvre le socket d'écoute puis crée N workers par `fork` ;
+chacun applique le monkey-patching de gevent, importe l'application et
+accepte les connexions sur le socket hérité (le noyau répartit les
+connexions entre les workers). Un worker qui s'arrête est relancé.
+
+Le maître n'importe pas l'application : les données sont chargées dans chaque
+worker après le `fork` (voir loading.py). Avec plusieurs workers, l'état doit
+être partagé : le backend SQLite est alors imposé ; chaque réservation y est
+une transaction gardée et chaque worker relit périodiquement les réservations
+des autres (voir BookingEngine.synchronize et Config.SYNC_INTERVAL).
+
+Usage:
+    python wsgi.py --workers 4 --bind 0.0.0.0:8000
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger('gudlft.wsgi')
+
+# Délai minimal entre deux relances d'un même worker (secondes)
+RESPAWN_DELAY = 1.0
+
+# Signaux qui arrêtent le maître et ses workers
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+def create_listener(host, port, backlog=2048):
+    """
+    Ouvre le socket d'écoute partagé par les workers.
+
+    Returns:
+        socket.socket: Socket lié et à l'écoute
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    return listener
+
+
+def run_worker(listener, worker_id):
+    """Corps d'un worker : gevent, import de l'application, boucle d'acceptation."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    from gevent import monkey
+    monkey.patch_all()
+    from gevent.pywsgi import WSGIServer
+
+    import server
+
+    server.app.logger.info('Worker %d (pid %d) started', worker_id, os.getpid())
+    WSGIServer(listener, server.app, log=None).serve_forever()
+
+
+class Arbiter:
+    """
+    Processus maître : crée, surveille et arrête les workers.
+
+    Args:
+        listener (socket.socket): Socket d'écoute hérité par les workers
+        workers (int): Nombre de workers
+    """
+
+    def __init__(self, listener, workers):
+        self.listener = listener
+        self.workers = workers
+        self.children = {}
+        self.started = {}
+        self.stopping = False
+
+    def spawn(self, worker_id):
+        """Crée un worker par fork."""
+        last = self.started.get(worker_id)
+        if last is not None and time.monotonic() - last < RESPAWN_DELAY:
+            # Évite une boucle de relance si le worker échoue au démarrage
+            time.sleep(RESPAWN_DELAY)
+        # Signaux d'arrêt bloqués pendant le fork : le maître enregistre le
+        # pid avant de pouvoir exécuter `stop`, et le worker ne peut pas
+        # exécuter le gestionnaire hérité du maître
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                for signum in STOP_SIGNALS:
+                    signal.signal(signum, signal.SIG_DFL)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+                run_worker(self.listener, worker_id)
+            except BaseException:
+                logger.exception('Worker %d crashed', worker_id)
+                status = 1
+            finally:
+                os._exit(status)
+        self.children[pid] = worker_id
+        self.started[worker_id] = time.monotonic()
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+
+    def stop(self, signum, frame):
+        """Arrête les workers (SIGTERM / SIGINT)."""
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        """Crée les workers puis les relance jusqu'à l'arrêt."""
+        for worker_id in range(self.workers):
+            self.spawn(worker_id)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            worker_id = self.children.pop(pid, None)
+            if worker_id is not None and not self.stopping:
+                logger.warning('Worker %d (pid %d) exited with status %d, restarting',
+                               worker_id, pid, os.waitstatus_to_exitcode(status))
+                self.spawn(worker_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='GUDLFT production server')
+    parser.add_argument('--bind', default=os.environ.get('GUDLFT_BIND', '127.0.0.1:8000'),
+                        help='host:port (défaut : 127.0.0.1:8000)')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('GUDLFT_WORKERS', os.cpu_count() or 1)),
+                        help='nombre de workers (défaut : nombre de cœurs)')
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        backend = os.environ.setdefault('GUDLFT_STORAGE_BACKEND', 'sqlite')
+        if backend != 'sqlite':
+            parser.error('several workers need the shared sqlite backend '
+                         '(GUDLFT_STORAGE_BACKEND=sqlite)')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(process)d %(message)s')
+    host, _, port = args.bind.rpartition(':')
+    listener = create_listener(host or '0.0.0.0', int(port))
+    logger.info('Listening on %s with %d workers', args.bind, args.workers)
+    Arbiter(listener, args.workers).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())